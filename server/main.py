@@ -9,6 +9,9 @@ from routes import market_data, strategies, ai_insights, portfolio
 from services.market_service import MarketService
 from services.strategy_service import StrategyService
 from services.database_service import db_service
+from services.fetch_service import upstream
+from services.sweep_service import sweep_executor
+from services.symbol_index import symbol_index
 
 # Load environment variables
 load_dotenv()
@@ -32,6 +35,9 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection on startup"""
+    symbol_index.reload()
+    symbol_index.start_auto_reload()
+    sweep_executor.warm_up()
     try:
         await db_service.connect()
         print("🚀 TradeMate API started successfully!")
@@ -43,6 +49,9 @@ async def startup_event():
 async def shutdown_event():
     """Close database connection on shutdown"""
     await db_service.close()
+    upstream.shutdown()
+    sweep_executor.shutdown()
+    symbol_index.stop_auto_reload()
 
 # Include routers
 app.include_router(market_data.router, prefix="/api/market", tags=["Market Data"])
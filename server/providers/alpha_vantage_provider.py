@@ -0,0 +1,107 @@
+import os
+import requests
+import pandas as pd
+from typing import Dict, List, Optional, Any
+
+from providers.base import MarketDataProvider, BAR_COLUMNS, empty_bars, make_quote, slice_bars
+
+# yfinance interval -> (Alpha Vantage function, interval argument, response key)
+AV_INTERVALS = {
+    "1m": ("TIME_SERIES_INTRADAY", "1min", "Time Series (1min)"),
+    "5m": ("TIME_SERIES_INTRADAY", "5min", "Time Series (5min)"),
+    "15m": ("TIME_SERIES_INTRADAY", "15min", "Time Series (15min)"),
+    "30m": ("TIME_SERIES_INTRADAY", "30min", "Time Series (30min)"),
+    "60m": ("TIME_SERIES_INTRADAY", "60min", "Time Series (60min)"),
+    "1h": ("TIME_SERIES_INTRADAY", "60min", "Time Series (60min)"),
+    "1d": ("TIME_SERIES_DAILY", None, "Time Series (Daily)"),
+    "1wk": ("TIME_SERIES_WEEKLY", None, "Weekly Time Series"),
+    "1mo": ("TIME_SERIES_MONTHLY", None, "Monthly Time Series"),
+}
+
+
+class AlphaVantageProvider(MarketDataProvider):
+    """Alpha Vantage REST API (needs ALPHA_VANTAGE_API_KEY)"""
+
+    name = "alpha_vantage"
+
+    def __init__(self):
+        self.api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
+        self.base_url = "https://www.alphavantage.co/query"
+        self.timeout = float(os.getenv("PROVIDER_TIMEOUT", "10"))
+
+    def is_available(self) -> bool:
+        return bool(self.api_key) and self.api_key != "your_alpha_vantage_api_key_here"
+
+    def supports(self, symbol: str, interval: str = "1d") -> bool:
+        # Crypto pairs in yfinance form (BTC-USD) are left to CoinGecko
+        return interval in AV_INTERVALS and not symbol.upper().endswith("-USD")
+
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get OHLCV bars"""
+        function, av_interval, key = AV_INTERVALS[interval]
+        params = {"function": function, "symbol": symbol.upper(), "outputsize": "full"}
+        if av_interval:
+            params["interval"] = av_interval
+
+        series = self._request(params).get(key)
+        if not series:
+            return empty_bars()
+
+        frame = pd.DataFrame.from_dict(series, orient="index")
+        frame = frame.rename(columns={
+            "1. open": "Open", "2. high": "High", "3. low": "Low",
+            "4. close": "Close", "5. volume": "Volume"
+        })[BAR_COLUMNS].astype(float)
+        frame["Volume"] = frame["Volume"].astype("int64")
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.index)).tz_localize("America/New_York")
+        frame.index.name = "Date"
+        return slice_bars(frame.sort_index(), period or "1y", start, end)
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get the latest quote fields from GLOBAL_QUOTE"""
+        quote = self._request({"function": "GLOBAL_QUOTE", "symbol": symbol.upper()}).get("Global Quote")
+        if not quote or "05. price" not in quote:
+            return None
+
+        return make_quote(
+            name=symbol.upper(),
+            price=float(quote["05. price"]),
+            change=float(quote.get("09. change", 0)),
+            change_percent=float(quote.get("10. change percent", "0%").rstrip("%")),
+            volume=int(quote.get("06. volume", 0))
+        )
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Search symbols with SYMBOL_SEARCH"""
+        matches = self._request({"function": "SYMBOL_SEARCH", "keywords": query}).get("bestMatches", [])
+        return [
+            {
+                "symbol": match.get("1. symbol"),
+                "name": match.get("2. name"),
+                "type": "stock" if match.get("3. type") == "Equity" else match.get("3. type", "").lower()
+            }
+            for match in matches
+        ]
+
+    def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = requests.get(
+            self.base_url,
+            params={**params, "apikey": self.api_key},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        # Rate limits and bad symbols come back as 200 with a message
+        if "Error Message" in payload:
+            raise Exception(payload["Error Message"])
+        if "Note" in payload or "Information" in payload:
+            raise Exception(payload.get("Note") or payload.get("Information"))
+        return payload
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Dict, List, Optional, Any
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Calendar offsets for the yfinance-style period strings
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+# Period strings counted in trading sessions rather than calendar time
+SESSION_PERIODS = {"1d": 1, "5d": 5}
+
+# Fields every provider quote carries (symbol and timestamp are added by MarketService)
+QUOTE_FIELDS = [
+    "name", "price", "change", "change_percent", "volume", "market_cap",
+    "high_52_week", "low_52_week", "pe_ratio", "dividend_yield"
+]
+
+
+class MarketDataProvider(ABC):
+    """Interface for a source of bars, quotes and symbol search.
+
+    get_history follows the yfinance conventions the rest of the server was
+    written against: a DataFrame with Open/High/Low/Close/Volume columns on a
+    DatetimeIndex, selected either by a period string ("1mo", "1y", "max", ...)
+    or by a start/end date pair with an exclusive end.
+    """
+
+    name = "base"
+    # Local providers read from disk and are not worth caching in the bar store
+    is_local = False
+
+    def is_available(self) -> bool:
+        """Whether the provider is configured and can be used"""
+        return True
+
+    def supports(self, symbol: str, interval: str = "1d") -> bool:
+        """Whether the provider can serve this symbol and interval"""
+        return True
+
+    @abstractmethod
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get OHLCV bars"""
+
+    @abstractmethod
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get the latest quote fields, or None if the symbol is unknown"""
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Search symbols by ticker or name"""
+        return []
+
+
+def empty_bars() -> pd.DataFrame:
+    """An empty OHLCV frame"""
+    return pd.DataFrame(columns=BAR_COLUMNS)
+
+
+def make_quote(**fields) -> Dict[str, Any]:
+    """Build a quote dict with every QUOTE_FIELDS key present"""
+    quote = {field: 0 for field in QUOTE_FIELDS}
+    quote.update({key: value for key, value in fields.items() if value is not None})
+    return quote
+
+
+def slice_bars(
+    frame: pd.DataFrame,
+    period: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    now: Optional[pd.Timestamp] = None
+) -> pd.DataFrame:
+    """Cut bars down to a period or start/end window.
+
+    Periods are measured back from ``now`` (the current time by default);
+    "1d"/"5d" select the last one or five trading sessions.
+    """
+    if frame.empty:
+        return frame
+
+    tz = frame.index.tz
+    if start is not None or end is not None:
+        mask = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            mask &= frame.index >= localize(start, tz)
+        if end is not None:
+            mask &= frame.index < localize(end, tz)
+        return frame[mask]
+
+    if period in SESSION_PERIODS:
+        sessions = frame.index.normalize()
+        first_session = sessions.unique()[-SESSION_PERIODS[period]:][0]
+        return frame[sessions >= first_session]
+
+    if period in PERIOD_OFFSETS or period == "ytd":
+        if now is None:
+            now = pd.Timestamp.now(tz=tz)
+        elif tz is not None:
+            now = localize(now, tz)
+        if period == "ytd":
+            boundary = now.normalize().replace(month=1, day=1)
+        else:
+            boundary = now.normalize() - PERIOD_OFFSETS[period]
+        return frame[frame.index >= boundary]
+
+    return frame
+
+
+def period_start(period: Optional[str], now: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """Earliest timestamp a period request can need (None for "max")"""
+    if period in SESSION_PERIODS:
+        # Leave room for weekends and holidays
+        days = SESSION_PERIODS[period]
+        return now.normalize() - timedelta(days=days + 2 * (days // 5 + 1) + 3)
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    if period in PERIOD_OFFSETS:
+        return now.normalize() - PERIOD_OFFSETS[period]
+    return None
+
+
+def localize(value: Any, tz: Any) -> pd.Timestamp:
+    """Parse a timestamp and express it in tz (naive values are taken as tz-local)"""
+    ts = pd.Timestamp(value)
+    if tz is None:
+        return ts.tz_convert(None) if ts.tz is not None else ts
+    if ts.tz is None:
+        return ts.tz_localize(tz)
+    return ts.tz_convert(tz)
@@ -0,0 +1,129 @@
+import os
+import requests
+import pandas as pd
+from typing import Dict, List, Optional, Any
+
+from providers.base import MarketDataProvider, BAR_COLUMNS, PERIOD_OFFSETS, empty_bars, make_quote, slice_bars, localize
+
+# CoinGecko ids for the common yfinance crypto tickers
+COIN_IDS = {
+    "BTC": "bitcoin", "ETH": "ethereum", "ADA": "cardano", "DOT": "polkadot",
+    "LINK": "chainlink", "LTC": "litecoin", "BCH": "bitcoin-cash", "XRP": "ripple",
+    "SOL": "solana", "DOGE": "dogecoin", "BNB": "binancecoin", "AVAX": "avalanche-2",
+}
+
+
+class CoinGeckoProvider(MarketDataProvider):
+    """CoinGecko public API for crypto pairs quoted in USD (BTC-USD style tickers).
+
+    CoinGecko's daily market chart only has one price per day, so bars from
+    this provider carry the daily price in all four OHLC columns.
+    """
+
+    name = "coingecko"
+
+    def __init__(self):
+        self.base_url = os.getenv("COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3")
+        self.timeout = float(os.getenv("PROVIDER_TIMEOUT", "10"))
+        self._ids: Dict[str, str] = dict(COIN_IDS)
+
+    def supports(self, symbol: str, interval: str = "1d") -> bool:
+        return symbol.upper().endswith("-USD") and interval == "1d"
+
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get daily bars from the market chart endpoint"""
+        coin_id = self._coin_id(symbol)
+        if coin_id is None:
+            return empty_bars()
+
+        now = pd.Timestamp.now(tz="UTC")
+        if start is not None:
+            days = (now - localize(start, "UTC")).days + 1
+        elif period == "max":
+            days = "max"
+        elif period == "ytd":
+            days = now.dayofyear
+        else:
+            boundary = now.normalize() - PERIOD_OFFSETS.get(period or "1y", PERIOD_OFFSETS["1y"])
+            days = (now - boundary).days + 1
+
+        chart = self._request(
+            f"/coins/{coin_id}/market_chart",
+            {"vs_currency": "usd", "days": days, "interval": "daily"}
+        )
+        prices = chart.get("prices", [])
+        if not prices:
+            return empty_bars()
+
+        price_series = pd.Series(dict((ts, price) for ts, price in prices), dtype=float)
+        volume_series = pd.Series(dict((ts, vol) for ts, vol in chart.get("total_volumes", [])), dtype=float)
+        index = pd.DatetimeIndex(pd.to_datetime(price_series.index, unit="ms", utc=True)).normalize()
+
+        frame = pd.DataFrame({
+            "Open": price_series.values,
+            "High": price_series.values,
+            "Low": price_series.values,
+            "Close": price_series.values,
+            "Volume": volume_series.reindex(price_series.index).fillna(0).astype("int64").values
+        }, index=index)[BAR_COLUMNS]
+        frame = frame[~frame.index.duplicated(keep="last")]
+        frame.index.name = "Date"
+        return slice_bars(frame, period or "1y", start, end)
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get the latest price, 24h change, volume and market cap"""
+        coin_id = self._coin_id(symbol)
+        if coin_id is None:
+            return None
+
+        data = self._request("/simple/price", {
+            "ids": coin_id,
+            "vs_currencies": "usd",
+            "include_market_cap": "true",
+            "include_24hr_vol": "true",
+            "include_24hr_change": "true"
+        }).get(coin_id)
+        if not data or "usd" not in data:
+            return None
+
+        price = data["usd"]
+        change_percent = data.get("usd_24h_change") or 0
+        return make_quote(
+            name=coin_id.replace("-", " ").title(),
+            price=price,
+            change=price - price / (1 + change_percent / 100),
+            change_percent=change_percent,
+            volume=data.get("usd_24h_vol", 0),
+            market_cap=data.get("usd_market_cap", 0)
+        )
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Search coins by name or symbol"""
+        coins = self._request("/search", {"query": query}).get("coins", [])
+        results = []
+        for coin in coins[:10]:
+            ticker = coin["symbol"].upper()
+            self._ids.setdefault(ticker, coin["id"])
+            results.append({"symbol": f"{ticker}-USD", "name": coin["name"], "type": "crypto"})
+        return results
+
+    def _coin_id(self, symbol: str) -> Optional[str]:
+        ticker = symbol.upper().replace("-USD", "")
+        if ticker not in self._ids:
+            for coin in self._request("/search", {"query": ticker}).get("coins", []):
+                if coin["symbol"].upper() == ticker:
+                    self._ids[ticker] = coin["id"]
+                    break
+        return self._ids.get(ticker)
+
+    def _request(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = requests.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
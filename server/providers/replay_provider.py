@@ -0,0 +1,150 @@
+import os
+import threading
+import pandas as pd
+from typing import Dict, List, Optional, Any, Tuple
+
+from providers.base import MarketDataProvider, BAR_COLUMNS, empty_bars, make_quote, slice_bars
+
+DATE_COLUMNS = ["date", "datetime", "timestamp", "time"]
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serves recorded bars from disk so runs are deterministic and offline.
+
+    Bars live in ``{REPLAY_DATA_DIR}/{interval}/{SYMBOL}.csv`` (or ``.parquet``,
+    which needs pyarrow). Period requests are measured back from the last
+    recorded bar rather than the wall clock, so the same files always give
+    the same answer.
+    """
+
+    name = "replay"
+    is_local = True
+
+    def __init__(self):
+        self.root = os.getenv("REPLAY_DATA_DIR", "")
+        self.tz = os.getenv("REPLAY_TZ", "America/New_York")
+        self._frames: Dict[Tuple[str, str], Tuple[float, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return bool(self.root) and os.path.isdir(self.root)
+
+    def supports(self, symbol: str, interval: str = "1d") -> bool:
+        return self._file_for(symbol, interval) is not None
+
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get recorded OHLCV bars"""
+        frame = self._load(symbol, interval)
+        if frame.empty:
+            return frame
+        return slice_bars(frame, period or "1y", start, end, now=frame.index[-1])
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Build a quote from the last two recorded daily bars"""
+        frame = self._load(symbol, "1d")
+        if frame.empty:
+            return None
+
+        close = frame["Close"]
+        price = float(close.iloc[-1])
+        previous = float(close.iloc[-2]) if len(close) > 1 else price
+        last_year = frame[frame.index >= frame.index[-1] - pd.DateOffset(years=1)]
+        return make_quote(
+            name=symbol.upper(),
+            price=price,
+            change=price - previous,
+            change_percent=(price - previous) / previous * 100 if previous else 0,
+            volume=int(frame["Volume"].iloc[-1]),
+            high_52_week=float(last_year["High"].max()),
+            low_52_week=float(last_year["Low"].min())
+        )
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Match recorded daily symbols by prefix"""
+        path = os.path.join(self.root, "1d")
+        if not os.path.isdir(path):
+            return []
+        query = query.upper()
+        symbols = sorted({os.path.splitext(name)[0] for name in os.listdir(path)})
+        return [
+            {"symbol": symbol, "name": symbol, "type": "crypto" if symbol.endswith("-USD") else "stock"}
+            for symbol in symbols if symbol.startswith(query)
+        ]
+
+    def record(self, symbol: str, interval: str, frame: pd.DataFrame) -> str:
+        """Write bars to a replay CSV file, e.g. to capture a fixture from a live provider"""
+        path = os.path.join(self.root, interval)
+        os.makedirs(path, exist_ok=True)
+        file_path = os.path.join(path, f"{symbol.upper()}.csv")
+        frame[BAR_COLUMNS].to_csv(file_path, index_label="Date")
+        return file_path
+
+    def _file_for(self, symbol: str, interval: str) -> Optional[str]:
+        if not self.root:
+            return None
+        for extension in (".parquet", ".csv"):
+            file_path = os.path.join(self.root, interval, f"{symbol.upper()}{extension}")
+            if os.path.exists(file_path):
+                return file_path
+        return None
+
+    def _load(self, symbol: str, interval: str) -> pd.DataFrame:
+        """Read a recording, reusing the parsed frame until the file changes"""
+        file_path = self._file_for(symbol, interval)
+        if file_path is None:
+            return empty_bars()
+
+        mtime = os.path.getmtime(file_path)
+        key = (symbol.upper(), interval)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+        if file_path.endswith(".parquet"):
+            raw = pd.read_parquet(file_path)
+        else:
+            raw = pd.read_csv(file_path)
+
+        frame = self._normalize(raw)
+        with self._lock:
+            self._frames[key] = (mtime, frame)
+        return frame
+
+    def _normalize(self, raw: pd.DataFrame) -> pd.DataFrame:
+        """Map a recorded table onto the OHLCV layout with a tz-aware index"""
+        columns = {col.lower(): col for col in raw.columns}
+        date_column = next((columns[name] for name in DATE_COLUMNS if name in columns), None)
+        if date_column is not None:
+            raw = raw.set_index(date_column)
+
+        frame = raw.rename(columns={columns[col.lower()]: col for col in BAR_COLUMNS if col.lower() in columns})
+        frame = frame[BAR_COLUMNS]
+
+        index = self._parse_index(frame.index)
+        frame = frame.set_axis(index.rename("Date"))
+        frame = frame.astype({"Open": float, "High": float, "Low": float, "Close": float, "Volume": "int64"})
+        return frame.sort_index()
+
+    def _parse_index(self, values: pd.Index) -> pd.DatetimeIndex:
+        """Parse recorded timestamps; values without an offset are exchange-local"""
+        if not isinstance(values, pd.DatetimeIndex):
+            try:
+                parsed = pd.to_datetime(values)
+            except (ValueError, TypeError):
+                parsed = None
+            if not isinstance(parsed, pd.DatetimeIndex):
+                # Mixed UTC offsets, e.g. a recording that spans a DST change
+                parsed = pd.to_datetime(values, utc=True)
+            values = pd.DatetimeIndex(parsed)
+
+        if values.tz is None:
+            return values.tz_localize(self.tz)
+        return values.tz_convert(self.tz)
@@ -0,0 +1,56 @@
+import yfinance as yf
+import pandas as pd
+from typing import Dict, List, Optional, Any
+
+from providers.base import MarketDataProvider, BAR_COLUMNS, empty_bars, make_quote
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance via the yfinance package"""
+
+    name = "yfinance"
+
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get OHLCV bars"""
+        ticker = yf.Ticker(symbol)
+        if start is not None:
+            hist = ticker.history(start=start, end=end, interval=interval)
+        else:
+            hist = ticker.history(period=period or "1y", interval=interval)
+
+        if hist.empty:
+            return empty_bars()
+        return hist[BAR_COLUMNS]
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get the latest quote fields from ticker.info"""
+        info = yf.Ticker(symbol).info
+        if not info or 'regularMarketPrice' not in info:
+            return None
+
+        return make_quote(
+            name=info.get('longName', symbol.upper()),
+            price=info.get('regularMarketPrice', 0),
+            change=info.get('regularMarketChange', 0),
+            change_percent=info.get('regularMarketChangePercent', 0),
+            volume=info.get('volume', 0),
+            market_cap=info.get('marketCap', 0),
+            high_52_week=info.get('fiftyTwoWeekHigh', 0),
+            low_52_week=info.get('fiftyTwoWeekLow', 0),
+            pe_ratio=info.get('trailingPE', 0),
+            dividend_yield=info.get('dividendYield', 0)
+        )
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Treat the query as a ticker and look it up"""
+        quote = self.get_quote(query)
+        if quote is None:
+            return []
+        return [{"symbol": query.upper(), "name": quote["name"], "type": "stock"}]
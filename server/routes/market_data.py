@@ -1,15 +1,91 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, Header, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Annotated, Optional, List, Union
 import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 import ta
+import asyncio
+import json
 
 from services.market_service import MarketService
-from utils.indicators import calculate_technical_indicators
+from services.quote_cache import quote_cache
+from services.fetch_service import upstream
+from services.provider_service import provider_router
+from services.symbol_index import symbol_index
+from services.quote_stream import QuoteStreamer
+from services.indicator_cache import indicator_cache
+from services.correlation_service import correlation_service
+from services.sweep_service import sweep_executor
+from utils.encoding import JSON, negotiate, encode_response
 
 router = APIRouter()
 market_service = MarketService()
+quote_streamer = QuoteStreamer(market_service.get_quote)
+
+MAX_BATCH_SYMBOLS = 200
+MAX_BATCH_INDICATOR_SYMBOLS = 500
+MAX_CORRELATION_SYMBOLS = 200
+MAX_STREAM_SYMBOLS = 100
+MAX_INDICATOR_WINDOW = 500
+
+class QuotesRequest(BaseModel):
+    symbols: List[str]
+
+class CorrelationRequest(BaseModel):
+    symbols: List[str]
+    benchmark: Optional[str] = None
+    period: str = Field("1y", pattern="^(3mo|6mo|1y|2y|5y)$")
+    window: int = Field(60, ge=2, le=500)
+
+Window = Annotated[int, Field(ge=1, le=MAX_INDICATOR_WINDOW)]
+
+class IndicatorParameters(BaseModel):
+    """Indicator parameter overrides, bounded like the GET /indicators query"""
+    model_config = ConfigDict(extra="forbid")
+
+    sma_window: Optional[Union[Window, List[Window]]] = None
+    ema_window: Optional[Union[Window, List[Window]]] = None
+    rsi_window: Optional[int] = Field(None, ge=2, le=500)
+    macd_fast: Optional[int] = Field(None, ge=1, le=500)
+    macd_slow: Optional[int] = Field(None, ge=1, le=500)
+    macd_signal: Optional[int] = Field(None, ge=1, le=500)
+    bb_window: Optional[int] = Field(None, ge=2, le=500)
+    bb_std: Optional[float] = Field(None, gt=0, le=10)
+    stoch_window: Optional[int] = Field(None, ge=1, le=500)
+    stoch_smooth: Optional[int] = Field(None, ge=1, le=100)
+    volume_sma_window: Optional[int] = Field(None, ge=1, le=500)
+    atr_window: Optional[int] = Field(None, ge=1, le=500)
+    williams_window: Optional[int] = Field(None, ge=1, le=500)
+    cci_window: Optional[int] = Field(None, ge=2, le=500)
+    adx_window: Optional[int] = Field(None, ge=2, le=500)
+    vwap_window: Optional[int] = Field(None, ge=1, le=500)
+    ichimoku_conversion: Optional[int] = Field(None, ge=1, le=500)
+    ichimoku_base: Optional[int] = Field(None, ge=1, le=500)
+    ichimoku_span_b: Optional[int] = Field(None, ge=1, le=500)
+    keltner_window: Optional[int] = Field(None, ge=1, le=500)
+    keltner_atr_window: Optional[int] = Field(None, ge=1, le=500)
+    keltner_multiplier: Optional[float] = Field(None, gt=0, le=10)
+    psar_step: Optional[float] = Field(None, gt=0, le=1)
+    psar_max_step: Optional[float] = Field(None, gt=0, le=1)
+    channel_window: Optional[int] = Field(None, ge=1, le=500)
+    fib_window: Optional[int] = Field(None, ge=1, le=500)
+    volatility_window: Optional[int] = Field(None, ge=2, le=500)
+
+    @field_validator("sma_window", "ema_window")
+    @classmethod
+    def _window_list(cls, windows):
+        # One window or several; either way the engine gets a sorted list
+        if windows is None:
+            return None
+        return sorted(set(windows if isinstance(windows, list) else [windows])) or None
+
+class BatchIndicatorsRequest(BaseModel):
+    symbols: List[str]
+    period: str = Field("1y", pattern="^(1mo|3mo|6mo|1y|2y|5y)$")
+    indicators: Optional[List[str]] = None
+    parameters: IndicatorParameters = IndicatorParameters()
+    tail: Optional[int] = Field(None, ge=1)
 
 @router.get("/search")
 async def search_symbols(query: str = Query(..., min_length=1)):
@@ -29,30 +105,232 @@ async def get_quote(symbol: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/quotes")
+async def get_quotes(symbols: str = Query(..., min_length=1)):
+    """Get quotes for a comma-separated list of symbols"""
+    return await _get_quotes(symbols.split(","))
+
+@router.post("/quotes")
+async def post_quotes(request: QuotesRequest):
+    """Get quotes for a large list of symbols"""
+    return await _get_quotes(request.symbols)
+
+async def _get_quotes(symbols: List[str]):
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SYMBOLS} symbols per request")
+    try:
+        return await market_service.get_quotes(symbols)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.websocket("/stream")
+async def stream_quotes(websocket: WebSocket):
+    """Stream quote updates for subscribed symbols"""
+    await websocket.accept()
+    queue = quote_streamer.new_queue()
+    subscribed = set()
+
+    async def forward():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    sender = asyncio.create_task(forward())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                quote_streamer.send(queue, {"type": "error", "message": "messages must be JSON"})
+                continue
+            action = message.get("action") if isinstance(message, dict) else None
+            symbols = message.get("symbols", []) if isinstance(message, dict) else []
+            if isinstance(symbols, str):
+                symbols = symbols.split(",")
+            symbols = [str(symbol).strip().upper() for symbol in symbols if str(symbol).strip()]
+
+            if action == "subscribe":
+                for symbol in symbols:
+                    if symbol in subscribed:
+                        continue
+                    if len(subscribed) >= MAX_STREAM_SYMBOLS:
+                        quote_streamer.send(queue, {"type": "error", "message": f"At most {MAX_STREAM_SYMBOLS} symbols per connection"})
+                        break
+                    subscribed.add(symbol)
+                    quote_streamer.subscribe(symbol, queue)
+            elif action == "unsubscribe":
+                for symbol in symbols:
+                    if symbol in subscribed:
+                        subscribed.discard(symbol)
+                        quote_streamer.unsubscribe(symbol, queue)
+            else:
+                quote_streamer.send(queue, {"type": "error", "message": "action must be subscribe or unsubscribe"})
+                continue
+
+            quote_streamer.send(queue, {"type": "subscriptions", "symbols": sorted(subscribed)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        try:
+            await sender
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"Error streaming quotes: {e}")
+        for symbol in subscribed:
+            quote_streamer.unsubscribe(symbol, queue)
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get quote cache, upstream fetch and sweep pool counters"""
+    return {
+        "quote_cache": quote_cache.get_stats(),
+        "upstream": upstream.get_stats(),
+        "symbol_index": symbol_index.get_stats(),
+        "quote_stream": quote_streamer.get_stats(),
+        "indicator_cache": indicator_cache.get_stats(),
+        "correlation_cache": correlation_service.get_stats(),
+        "sweep_pool": sweep_executor.get_stats()
+    }
+
+@router.get("/providers")
+async def get_provider_stats():
+    """Get market data provider health in failover order"""
+    return {"providers": provider_router.get_stats()}
+
 @router.get("/historical/{symbol}")
 async def get_historical_data(
     symbol: str,
     period: str = Query("1y", regex="^(1d|5d|1mo|3mo|6mo|1y|2y|5y|10y|ytd|max)$"),
-    interval: str = Query("1d", regex="^(1m|2m|5m|15m|30m|60m|90m|1h|1d|5d|1wk|1mo|3mo)$")
+    interval: str = Query("1d", regex="^(1m|2m|5m|15m|30m|60m|90m|1h|1d|5d|1wk|1mo|3mo)$"),
+    format: str = Query("rows", regex="^(rows|columnar)$"),
+    accept: Optional[str] = Header(None)
 ):
     """Get historical price data for a symbol"""
+    encoding = negotiate(accept)
+    if encoding != JSON:
+        # Binary encodings carry whole columns
+        format = "columnar"
     try:
-        data = await market_service.get_historical_data(symbol, period, interval)
-        return data
+        data = await market_service.get_historical_data(symbol, period, interval, format)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return encode_response(data, encoding)
 
 @router.get("/indicators/{symbol}")
 async def get_technical_indicators(
     symbol: str,
-    period: str = Query("1y", regex="^(1mo|3mo|6mo|1y|2y|5y)$")
+    period: str = Query("1y", regex="^(1mo|3mo|6mo|1y|2y|5y)$"),
+    indicators: Optional[str] = Query(None, description="Comma-separated, e.g. rsi,macd (all when omitted)"),
+    tail: Optional[int] = Query(None, ge=1, description="Only return the last N points"),
+    sma_window: Optional[str] = Query(None, regex=r"^\d+(,\d+)*$"),
+    ema_window: Optional[str] = Query(None, regex=r"^\d+(,\d+)*$"),
+    rsi_window: Optional[int] = Query(None, ge=2, le=500),
+    macd_fast: Optional[int] = Query(None, ge=1, le=500),
+    macd_slow: Optional[int] = Query(None, ge=1, le=500),
+    macd_signal: Optional[int] = Query(None, ge=1, le=500),
+    bb_window: Optional[int] = Query(None, ge=2, le=500),
+    bb_std: Optional[float] = Query(None, gt=0, le=10),
+    stoch_window: Optional[int] = Query(None, ge=1, le=500),
+    stoch_smooth: Optional[int] = Query(None, ge=1, le=100),
+    volume_sma_window: Optional[int] = Query(None, ge=1, le=500),
+    atr_window: Optional[int] = Query(None, ge=1, le=500),
+    williams_window: Optional[int] = Query(None, ge=1, le=500),
+    cci_window: Optional[int] = Query(None, ge=2, le=500),
+    adx_window: Optional[int] = Query(None, ge=2, le=500),
+    vwap_window: Optional[int] = Query(None, ge=1, le=500),
+    ichimoku_conversion: Optional[int] = Query(None, ge=1, le=500),
+    ichimoku_base: Optional[int] = Query(None, ge=1, le=500),
+    ichimoku_span_b: Optional[int] = Query(None, ge=1, le=500),
+    keltner_window: Optional[int] = Query(None, ge=1, le=500),
+    keltner_atr_window: Optional[int] = Query(None, ge=1, le=500),
+    keltner_multiplier: Optional[float] = Query(None, gt=0, le=10),
+    psar_step: Optional[float] = Query(None, gt=0, le=1),
+    psar_max_step: Optional[float] = Query(None, gt=0, le=1),
+    channel_window: Optional[int] = Query(None, ge=1, le=500),
+    fib_window: Optional[int] = Query(None, ge=1, le=500),
+    volatility_window: Optional[int] = Query(None, ge=2, le=500),
+    accept: Optional[str] = Header(None)
 ):
     """Get technical indicators for a symbol"""
+    encoding = negotiate(accept)
+    parameters = {
+        "sma_window": _parse_windows(sma_window),
+        "ema_window": _parse_windows(ema_window),
+        "rsi_window": rsi_window,
+        "macd_fast": macd_fast,
+        "macd_slow": macd_slow,
+        "macd_signal": macd_signal,
+        "bb_window": bb_window,
+        "bb_std": bb_std,
+        "stoch_window": stoch_window,
+        "stoch_smooth": stoch_smooth,
+        "volume_sma_window": volume_sma_window,
+        "atr_window": atr_window,
+        "williams_window": williams_window,
+        "cci_window": cci_window,
+        "adx_window": adx_window,
+        "vwap_window": vwap_window,
+        "ichimoku_conversion": ichimoku_conversion,
+        "ichimoku_base": ichimoku_base,
+        "ichimoku_span_b": ichimoku_span_b,
+        "keltner_window": keltner_window,
+        "keltner_atr_window": keltner_atr_window,
+        "keltner_multiplier": keltner_multiplier,
+        "psar_step": psar_step,
+        "psar_max_step": psar_max_step,
+        "channel_window": channel_window,
+        "fib_window": fib_window,
+        "volatility_window": volatility_window
+    }
+    selected = [name for name in indicators.split(",") if name.strip()] if indicators else None
+    try:
+        data = await market_service.get_technical_indicators(symbol, period, selected, parameters, tail)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return encode_response(data, encoding)
+
+def _parse_windows(windows: Optional[str]) -> Optional[List[int]]:
+    if not windows:
+        return None
+    parsed = sorted({int(window) for window in windows.split(",") if int(window) > 0})
+    if parsed and parsed[-1] > MAX_INDICATOR_WINDOW:
+        raise HTTPException(status_code=400, detail=f"Windows must be at most {MAX_INDICATOR_WINDOW}")
+    return parsed
+
+@router.post("/indicators/batch")
+async def get_batch_indicators(request: BatchIndicatorsRequest, accept: Optional[str] = Header(None)):
+    """Get indicators for a universe of symbols in one vectorized pass"""
+    if len(request.symbols) > MAX_BATCH_INDICATOR_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_INDICATOR_SYMBOLS} symbols per request")
+    encoding = negotiate(accept)
+    try:
+        data = await market_service.get_batch_indicators(
+            request.symbols, request.period, request.indicators, request.parameters.model_dump(), request.tail
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return encode_response(data, encoding)
+
+@router.post("/correlation")
+async def get_correlation(request: CorrelationRequest, accept: Optional[str] = Header(None)):
+    """Get betas, rolling betas and correlation/covariance matrices for a universe"""
+    if len(request.symbols) > MAX_CORRELATION_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CORRELATION_SYMBOLS} symbols per request")
+    encoding = negotiate(accept)
     try:
-        indicators = await market_service.get_technical_indicators(symbol, period)
-        return indicators
+        data = await market_service.get_correlation(
+            request.symbols, request.benchmark, request.period, request.window
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return encode_response(data, encoding)
 
 @router.get("/trending")
 async def get_trending_symbols():
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Header
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
 import pandas as pd
+import json
 from datetime import datetime, timedelta
 
 from services.strategy_service import StrategyService
 from strategies.moving_average import MovingAverageStrategy
 from strategies.rsi_strategy import RSIStrategy
 from strategies.macd_strategy import MACDStrategy
+from utils.encoding import JSON, negotiate, encode_response, json_safe
 
 router = APIRouter()
 strategy_service = StrategyService()
@@ -76,8 +79,9 @@ async def get_available_strategies():
     return {"strategies": strategies}
 
 @router.post("/backtest")
-async def run_backtest(request: BacktestRequest):
+async def run_backtest(request: BacktestRequest, accept: Optional[str] = Header(None)):
     """Run backtest for a trading strategy"""
+    encoding = negotiate(accept)
     try:
         result = await strategy_service.run_backtest(
             symbol=request.symbol,
@@ -86,18 +90,19 @@ async def run_backtest(request: BacktestRequest):
             end_date=request.end_date,
             parameters=request.parameters
         )
-        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return encode_response(result, encoding)
 
 @router.get("/backtest/{backtest_id}")
-async def get_backtest_result(backtest_id: str):
+async def get_backtest_result(backtest_id: str, accept: Optional[str] = Header(None)):
     """Get backtest result by ID"""
+    encoding = negotiate(accept)
     try:
         result = await strategy_service.get_backtest_result(backtest_id)
-        return result
     except Exception as e:
         raise HTTPException(status_code=404, detail="Backtest not found")
+    return encode_response(result, encoding)
 
 @router.get("/performance/{symbol}")
 async def get_strategy_performance(
@@ -116,16 +121,45 @@ async def optimize_strategy(
     symbol: str,
     strategy: str = Query(..., regex="^(moving_average|rsi|macd)$"),
     start_date: str = Query(...),
-    end_date: str = Query(...)
+    end_date: str = Query(...),
+    grid: str = Query("{}"),
+    format: str = Query("rows", regex="^(rows|columnar)$"),
+    accept: Optional[str] = Header(None)
 ):
     """Optimize strategy parameters for a symbol"""
+    encoding = negotiate(accept)
+    if encoding != JSON:
+        # Binary encodings carry whole columns
+        format = "columnar"
     try:
         optimization = await strategy_service.optimize_strategy(
-            symbol, strategy, start_date, end_date
+            symbol, strategy, start_date, end_date, grid, format
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return encode_response(optimization, encoding)
+
+@router.get("/optimize/{symbol}/stream")
+async def stream_optimization(
+    symbol: str,
+    strategy: str = Query(..., regex="^(moving_average|rsi|macd)$"),
+    start_date: str = Query(...),
+    end_date: str = Query(...),
+    grid: str = Query("{}")
+):
+    """Stream optimization results as NDJSON: one line per parameter combination as it finishes, then a summary"""
+    try:
+        events = await strategy_service.stream_optimization(
+            symbol, strategy, start_date, end_date, grid
         )
-        return optimization
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    lines = (json.dumps(json_safe(event)) + "\n" async for event in events)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
 
 @router.get("/risk-analysis/{symbol}")
 async def get_risk_analysis(
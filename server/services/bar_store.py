@@ -0,0 +1,424 @@
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+from providers.base import BAR_COLUMNS, slice_bars, period_start
+from services.provider_service import provider_router
+from services.minute_archive import minute_archive
+from services.indicator_cache import indicator_cache
+from utils.resampling import INTRADAY_SECONDS, resample_sources, resample_bars, bucket_starts, session_origin
+from utils.precision import STORAGE_FLOAT, compact
+
+# Interval persisted in the minute archive rather than as .npy columns
+MINUTE_INTERVAL = "1m"
+
+# How far back yfinance serves each intraday interval
+INTRADAY_MAX_DAYS = {
+    "1m": 7, "2m": 59, "5m": 59, "15m": 59, "30m": 59,
+    "60m": 729, "90m": 59, "1h": 729,
+}
+
+
+class BarStore:
+    """Persistent columnar OHLCV store keyed by symbol and interval.
+
+    Each (symbol, interval) pair lives in its own directory with one ``.npy``
+    file per column plus a ``meta.json`` describing the time range that has
+    been fetched. Reads are served from disk; only the head gap before the
+    stored range and the bars after the last stored timestamp are fetched
+    upstream. An interval that is not stored, or stored only partly, is
+    aggregated from a finer stored interval when that one already covers the
+    request, so it costs no upstream call at all; the same goes for intervals
+    derived from a local provider's recordings. Minute bars are kept in the
+    memory-mapped minute archive instead, with only ``meta.json`` here.
+    """
+
+    def __init__(self):
+        self.root = os.getenv("BAR_STORE_DIR", "./data/bars")
+        self.refresh_seconds = int(os.getenv("BAR_STORE_REFRESH_SECONDS", "300"))
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get OHLCV bars, reading through the local store"""
+        symbol = symbol.upper()
+        frame = self._read_through(symbol, period, interval, start, end)
+        # Tag the bars so indicator results can be cached per symbol and interval
+        frame.attrs.update(symbol=symbol, interval=interval)
+        return frame
+
+    def _read_through(
+        self,
+        symbol: str,
+        period: Optional[str],
+        interval: str,
+        start: Optional[str],
+        end: Optional[str]
+    ) -> pd.DataFrame:
+        if period is None and start is None:
+            period = "1y"
+
+        local = provider_router.local_provider(symbol, interval)
+        if local is not None:
+            # Recorded bars are already on disk; serve them as-is so replays stay deterministic
+            return local.get_history(symbol, period=period, interval=interval, start=start, end=end)
+        recorded = self._derive_recorded(symbol, interval, period, start, end)
+        if recorded is not None:
+            return recorded
+
+        with self._lock_for(symbol, interval):
+            now = pd.Timestamp.now(tz="UTC")
+            frame, meta = self._load(symbol, interval, (period, start, end, now))
+
+            if frame is None or frame.empty or not self._covers(meta, interval, period, start, end, now):
+                derived = self._derive(symbol, interval, period, start, end, now)
+                if derived is not None:
+                    return derived
+                if interval == MINUTE_INTERVAL and meta is not None:
+                    # Gaps are merged into the whole stored history, which is written back as one
+                    frame, meta = self._load(symbol, interval)
+
+            if frame is None or frame.empty:
+                frame = self._fetch(symbol, interval, period=period, start=start, end=end)
+                if frame.empty:
+                    return frame
+                meta = {"tz": self._tz_name(frame.index), "covered_from": None, "covered_to": None}
+                meta["covered_from"] = self._request_start(period, start, meta["tz"], now)
+                meta["covered_to"] = self._request_end(end, meta["tz"], now)
+                self._save(symbol, interval, frame, meta)
+            else:
+                changed = False
+                req_start = self._request_start(period, start, meta["tz"], now)
+                covered_from = meta["covered_from"]
+
+                # Head gap: the request reaches further back than what is stored
+                if covered_from is not None and (req_start is None or req_start < covered_from):
+                    if req_start is None:
+                        head = self._fetch(symbol, interval, period="max")
+                    else:
+                        head = self._fetch(
+                            symbol, interval,
+                            start=self._to_date_arg(req_start, meta["tz"]),
+                            end=self._to_date_arg(covered_from, meta["tz"])
+                        )
+                    frame = self._merge(frame, head)
+                    meta["covered_from"] = req_start
+                    changed = True
+
+                # Tail gap: only fetch bars after the last stored timestamp
+                req_end = self._request_end(end, meta["tz"], now)
+                covered_to = meta["covered_to"]
+                if req_end > covered_to:
+                    stale = end is not None or (now.value - covered_to) / 1e9 >= self._refresh_ttl(interval)
+                    if stale:
+                        tail_from = self._to_utc_ns(frame.index[-1])
+                        if interval in INTRADAY_MAX_DAYS:
+                            limit = now - timedelta(days=INTRADAY_MAX_DAYS[interval])
+                            tail_from = max(tail_from, limit.value)
+                        tail = self._fetch(
+                            symbol, interval,
+                            start=self._to_date_arg(tail_from, meta["tz"]),
+                            end=end
+                        )
+                        frame = self._merge(frame, tail)
+                        meta["covered_to"] = req_end
+                        changed = True
+
+                if changed:
+                    self._save(symbol, interval, frame, meta)
+
+        return slice_bars(frame, period, start, end)
+
+    def clear(self, symbol: str, interval: Optional[str] = None):
+        """Drop stored bars for a symbol (all intervals unless one is given)"""
+        symbol = symbol.upper()
+        intervals = [interval] if interval else self._stored_intervals()
+        for iv in intervals:
+            path = self._path(symbol, iv)
+            if not os.path.isdir(path):
+                continue
+            with self._lock_for(symbol, iv):
+                for name in os.listdir(path):
+                    os.remove(os.path.join(path, name))
+                os.rmdir(path)
+                if iv == MINUTE_INTERVAL:
+                    minute_archive.remove(symbol)
+
+    def _derive(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str],
+        start: Optional[str],
+        end: Optional[str],
+        now: pd.Timestamp
+    ) -> Optional[pd.DataFrame]:
+        """Aggregate bars from a finer stored interval that covers the request, if any"""
+        for source in resample_sources(interval):
+            # Locks are only ever taken coarse before fine, so this cannot deadlock
+            with self._lock_for(symbol, source):
+                frame, meta = self._load(symbol, source)
+            if frame is None or frame.empty:
+                continue
+
+            origin = session_origin(frame.index)
+            # The first requested bar must be complete, so coverage has to reach back to its start
+            if not self._covers(meta, interval, period, start, end, now, bucket=(interval, origin)):
+                continue
+
+            bars = resample_bars(frame, interval, origin)
+            if meta["covered_from"] is not None:
+                # Drop a leading bar that starts before the stored range and would be partial
+                bar_starts = bars.index.as_unit("ns")
+                if bar_starts.tz is not None:
+                    bar_starts = bar_starts.tz_convert("UTC")
+                bars = bars[bar_starts.asi8 >= meta["covered_from"]]
+            return slice_bars(bars, period, start, end)
+        return None
+
+    def _derive_recorded(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str],
+        start: Optional[str],
+        end: Optional[str]
+    ) -> Optional[pd.DataFrame]:
+        """Aggregate bars from a finer interval a local provider has recorded, if any"""
+        for source in resample_sources(interval):
+            local = provider_router.local_provider(symbol, source)
+            if local is None:
+                continue
+            frame = local.get_history(symbol, period="max", interval=source)
+            if frame.empty:
+                continue
+
+            bars = resample_bars(frame, interval, session_origin(frame.index))
+            # Drop a leading bar that starts before the recording's first day and would be partial
+            bars = bars[bars.index >= frame.index[0].normalize()]
+            # Periods count back from the last recorded bar, as in the replay itself
+            return slice_bars(bars, period, start, end, now=frame.index[-1])
+        return None
+
+    def _covers(
+        self,
+        meta: Optional[Dict[str, Any]],
+        interval: str,
+        period: Optional[str],
+        start: Optional[str],
+        end: Optional[str],
+        now: pd.Timestamp,
+        bucket: Optional[Tuple[str, int]] = None
+    ) -> bool:
+        """Whether stored bars answer a request without fetching anything upstream"""
+        if meta is None:
+            return False
+
+        req_start = self._request_start(period, start, meta["tz"], now)
+        if req_start is not None and bucket is not None:
+            target, origin = bucket
+            ts = pd.Timestamp(req_start, tz="UTC")
+            index = pd.DatetimeIndex([ts.tz_convert(meta["tz"]) if meta["tz"] else ts.tz_localize(None)])
+            wall_start = pd.Timestamp(int(bucket_starts(index, target, origin)[0]))
+            req_start = self._localize(wall_start, meta["tz"]).tz_convert("UTC").value
+
+        covered_from = meta["covered_from"]
+        if covered_from is not None and (req_start is None or req_start < covered_from):
+            return False
+
+        req_end = self._request_end(end, meta["tz"], now)
+        if req_end <= meta["covered_to"]:
+            return True
+        return end is None and (now.value - meta["covered_to"]) / 1e9 < self._refresh_ttl(interval)
+
+    def _stored_intervals(self):
+        if not os.path.isdir(self.root):
+            return []
+        return [name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name))]
+
+    def _lock_for(self, symbol: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            key = (symbol, interval)
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _path(self, symbol: str, interval: str) -> str:
+        safe_symbol = symbol.replace("/", "_")
+        return os.path.join(self.root, interval, safe_symbol)
+
+    def _fetch(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Fetch bars through the provider chain and keep only the OHLCV columns"""
+        hist = provider_router.get_history(symbol, period=period, interval=interval, start=start, end=end)
+
+        if hist.empty:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        return hist[BAR_COLUMNS]
+
+    def _merge(self, frame: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Merge fetched bars into stored bars, newer values win"""
+        if new.empty:
+            return frame
+        if frame.index.tz is not None and new.index.tz is not None:
+            new = new.tz_convert(frame.index.tz)
+        merged = pd.concat([frame, new[BAR_COLUMNS]])
+        merged = merged[~merged.index.duplicated(keep="last")]
+        return merged.sort_index()
+
+    def _request_start(self, period: Optional[str], start: Optional[str], tz: Optional[str], now: pd.Timestamp) -> Optional[int]:
+        """Earliest timestamp a request needs, as UTC nanoseconds (None for max)"""
+        if start is not None:
+            return self._localize(start, tz).tz_convert("UTC").value
+
+        boundary = period_start(period, now.tz_convert(tz) if tz else now)
+        if boundary is None:
+            return None
+        return boundary.tz_convert("UTC").value
+
+    def _request_end(self, end: Optional[str], tz: Optional[str], now: pd.Timestamp) -> int:
+        """Latest timestamp a request needs, as UTC nanoseconds"""
+        if end is None:
+            return now.value
+        return min(self._localize(end, tz).tz_convert("UTC").value, now.value)
+
+    def _refresh_ttl(self, interval: str) -> int:
+        """Seconds before the tail of a stored series is considered stale"""
+        if interval in INTRADAY_SECONDS:
+            return min(self.refresh_seconds, INTRADAY_SECONDS[interval])
+        return self.refresh_seconds
+
+    def _localize(self, value: Any, tz: Any) -> pd.Timestamp:
+        ts = pd.Timestamp(value)
+        if ts.tz is None:
+            return ts.tz_localize(tz or "UTC")
+        return ts.tz_convert(tz or "UTC")
+
+    def _to_date_arg(self, ns: int, tz: Optional[str]) -> pd.Timestamp:
+        """Turn a stored UTC timestamp into a provider start/end argument in exchange time"""
+        ts = pd.Timestamp(ns, tz="UTC")
+        return ts.tz_convert(tz) if tz else ts.tz_localize(None)
+
+    def _to_utc_ns(self, ts: pd.Timestamp) -> int:
+        if ts.tz is None:
+            return ts.tz_localize("UTC").value
+        return ts.tz_convert("UTC").value
+
+    def _tz_name(self, index: pd.DatetimeIndex) -> Optional[str]:
+        return str(index.tz) if index.tz is not None else None
+
+    def _load(
+        self,
+        symbol: str,
+        interval: str,
+        request: Optional[Tuple[Optional[str], Optional[str], Optional[str], pd.Timestamp]] = None
+    ) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """Load stored bars and metadata, or (None, None) if nothing is stored.
+
+        Given a (period, start, end, now) request, minute bars are read for
+        the request's time range only (possibly none of them).
+        """
+        path = self._path(symbol, interval)
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None, None
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+            if interval == MINUTE_INTERVAL:
+                if request is None:
+                    frame = minute_archive.frame(symbol, meta.get("tz"))
+                    return (frame, meta) if not frame.empty else (None, None)
+                period, start, end, now = request
+                # A superset of the request's bars (the end is inclusive); the caller slices it exactly
+                lo = self._request_start(period, start, meta.get("tz"), now)
+                hi = self._request_end(end, meta.get("tz"), now) + 1
+                return minute_archive.frame(symbol, meta.get("tz"), lo, hi), meta
+
+            timestamps = np.load(os.path.join(path, "timestamp.npy"))
+            # Stores written in either float mode load in the current one
+            columns = {col: compact(np.load(os.path.join(path, f"{col.lower()}.npy"))) for col in BAR_COLUMNS}
+            if any(len(values) != len(timestamps) for values in columns.values()):
+                raise Exception("column length mismatch")
+
+            index = pd.DatetimeIndex(pd.to_datetime(timestamps, unit="ns", utc=True))
+            if meta.get("tz"):
+                index = index.tz_convert(meta["tz"])
+            else:
+                index = index.tz_localize(None)
+            index.name = "Date"
+            return pd.DataFrame(columns, index=index), meta
+        except Exception as e:
+            print(f"Error loading stored bars for {symbol} ({interval}): {e}")
+            return None, None
+
+    def _save(self, symbol: str, interval: str, frame: pd.DataFrame, meta: Dict[str, Any]):
+        """Write bars column by column; meta.json is written last as the commit marker"""
+        path = self._path(symbol, interval)
+        os.makedirs(path, exist_ok=True)
+
+        # New bars change the data fingerprint; drop the symbol's old indicator results now
+        indicator_cache.invalidate(symbol)
+
+        if interval == MINUTE_INTERVAL:
+            try:
+                minute_archive.write(symbol, frame)
+                self._write_meta(path, meta)
+            except Exception as e:
+                print(f"Error saving bars for {symbol} ({interval}): {e}")
+            return
+
+        index = frame.index.as_unit("ns")
+        if index.tz is not None:
+            timestamps = index.tz_convert("UTC").asi8
+        else:
+            timestamps = index.asi8
+
+        arrays = {"timestamp": timestamps}
+        for col in BAR_COLUMNS:
+            if col == "Volume":
+                # A NaN volume would cast to int64 min; store it as no volume
+                arrays["volume"] = frame[col].fillna(0).to_numpy(dtype=np.int64)
+            else:
+                arrays[col.lower()] = frame[col].to_numpy(dtype=STORAGE_FLOAT)
+
+        try:
+            for name, values in arrays.items():
+                tmp_path = os.path.join(path, f"{name}.tmp.npy")
+                np.save(tmp_path, values)
+                os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+
+            self._write_meta(path, meta)
+        except Exception as e:
+            print(f"Error saving bars for {symbol} ({interval}): {e}")
+
+    def _write_meta(self, path: str, meta: Dict[str, Any]):
+        meta["updated_at"] = datetime.now().isoformat()
+        tmp_meta = os.path.join(path, "meta.json.tmp")
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, os.path.join(path, "meta.json"))
+
+
+# Global bar store instance
+bar_store = BarStore()
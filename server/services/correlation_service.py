@@ -0,0 +1,86 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.correlation_engine import CorrelationEngine, simple_returns
+from utils.precision import compact
+
+
+class CorrelationService:
+    """Betas and correlation/covariance matrices for a universe against a benchmark.
+
+    Results are cached per (universe, benchmark, window, date range) with LRU
+    eviction. The key also carries a hash of the aligned prices, so corrected
+    or newly stored bars can never be answered from a stale entry.
+    """
+
+    def __init__(self):
+        self.benchmark = os.getenv("BENCHMARK_SYMBOL", "^GSPC")
+        self.max_entries = int(os.getenv("CORRELATION_CACHE_SIZE", "64"))
+        self._entries: "OrderedDict[Tuple, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(
+        self,
+        dates: pd.DatetimeIndex,
+        prices: np.ndarray,
+        benchmark_prices: np.ndarray,
+        symbols: List[str],
+        benchmark: str,
+        window: int
+    ) -> Dict[str, np.ndarray]:
+        """Compute betas, rolling betas and the correlation and covariance matrices of daily returns"""
+        key = (
+            tuple(symbols), benchmark, window,
+            str(dates[0]) if len(dates) else None, str(dates[-1]) if len(dates) else None,
+            self._fingerprint(prices, benchmark_prices)
+        )
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return result
+            self.misses += 1
+
+        engine = CorrelationEngine(simple_returns(prices), simple_returns(benchmark_prices))
+        result = {
+            "betas": compact(engine.betas()),
+            "rolling_betas": compact(engine.rolling_betas(window)),
+            "correlation": compact(engine.correlation()),
+            "covariance": compact(engine.covariance())
+        }
+        for array in result.values():
+            array.flags.writeable = False
+
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _fingerprint(self, prices: np.ndarray, benchmark_prices: np.ndarray) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(prices, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(benchmark_prices, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+
+# Global correlation service instance
+correlation_service = CorrelationService()
@@ -0,0 +1,65 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable
+
+
+class UpstreamFetcher:
+    """Runs blocking upstream calls (yfinance, HTTP APIs) off the event loop.
+
+    Calls go to a bounded thread pool so a slow symbol only ties up one worker
+    thread. Concurrent calls with the same key are coalesced ("singleflight"):
+    the first caller starts the upstream request and everyone else awaits the
+    same future. Coalesced callers share the result object and must treat it
+    as read-only.
+    """
+
+    def __init__(self):
+        self.max_workers = int(os.getenv("UPSTREAM_MAX_WORKERS", "8"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="upstream"
+        )
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the pool, sharing in-flight calls with the same key"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._finish, key))
+            self.calls += 1
+
+        # Shield so one cancelled caller does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved; awaiting callers still receive it
+            future.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fetch pool counters"""
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced
+        }
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global upstream fetcher instance
+upstream = UpstreamFetcher()
@@ -0,0 +1,153 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.bar_frame import BarFrame, as_bars
+from utils.indicator_engine import IndicatorEngine, IndicatorSpec, INDICATOR_NAMES, DEFAULT_SPECS
+from utils.precision import compact
+
+
+class IndicatorCache:
+    """Memoizes indicator arrays with LRU eviction under a memory budget.
+
+    Entries are keyed by (symbol, interval, indicator, parameters, data
+    fingerprint). The fingerprint is a hash of the bars themselves, so a new or
+    corrected bar can never be served a stale result, and the bar store drops a
+    symbol's entries as soon as it stores new bars for it. Symbol and interval
+    come from the frame's ``attrs``, which the bar store sets. Cached arrays
+    are read-only because they are shared between callers. Results are
+    computed in float64 and stored in the storage dtype (float32 in compact
+    mode, which fits about twice as many series in the same budget).
+    """
+
+    def __init__(self):
+        self.max_bytes = int(float(os.getenv("INDICATOR_CACHE_MAX_MB", "128")) * 1024 * 1024)
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def compute_indicators(self, data: Union[BarFrame, pd.DataFrame], names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Get named engine indicators (default parameters) for a frame"""
+        names = INDICATOR_NAMES if names is None else list(names)
+        unknown = [name for name in names if name not in DEFAULT_SPECS]
+        if unknown:
+            raise ValueError(f"Unknown indicators: {', '.join(unknown)}")
+        return self.compute_specs(data, [DEFAULT_SPECS[name] for name in names])
+
+    def technical_indicators(self, data: Union[BarFrame, pd.DataFrame]) -> Dict[str, List[float]]:
+        """Cached counterpart of utils.indicators.calculate_technical_indicators"""
+        indicators = {}
+        try:
+            for name, values in self.compute_indicators(data).items():
+                indicators[name] = values.tolist()
+        except Exception as e:
+            print(f"Error calculating indicators: {e}")
+        return indicators
+
+    def compute_specs(self, data: Union[BarFrame, pd.DataFrame], specs: Iterable[IndicatorSpec]) -> Dict[str, np.ndarray]:
+        """Get indicator series for a frame, computing only the missing ones"""
+        specs = list(specs)
+        symbol, interval, fingerprint = self._identity(data)
+
+        results = {}
+        missing = []
+        for spec in specs:
+            value = self._get((symbol, interval, spec.method, spec.params, spec.field, fingerprint))
+            if value is None:
+                missing.append(spec)
+            else:
+                results[spec.name] = value
+
+        if missing:
+            # One engine for every miss so shared intermediates are still computed once
+            engine = IndicatorEngine.from_frame(data)
+            for spec in missing:
+                key = (symbol, interval, spec.method, spec.params, spec.field, fingerprint)
+                results[spec.name] = self._put(key, engine.compute_spec(spec))
+
+        return {spec.name: results[spec.name] for spec in specs}
+
+    def indicator(self, data: Union[BarFrame, pd.DataFrame], method: str, **params) -> Any:
+        """Get one parameterized engine indicator (e.g. "sma", window=20) for a frame"""
+        symbol, interval, fingerprint = self._identity(data)
+        key = (symbol, interval, method, tuple(sorted(params.items())), fingerprint)
+        value = self._get(key)
+        if value is not None:
+            return value
+
+        return self._put(key, IndicatorEngine.from_frame(data).indicator(method, **params))
+
+    def invalidate(self, symbol: Optional[str] = None, interval: Optional[str] = None):
+        """Drop all entries, or those of one symbol (and interval)"""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            symbol = symbol.upper()
+            for key in [key for key in self._entries if key[0] == symbol and (interval is None or key[1] == interval)]:
+                _, size = self._entries.pop(key)
+                self._bytes -= size
+
+    def fingerprint(self, data: Union[BarFrame, pd.DataFrame]) -> str:
+        """Hash of a frame's timestamps and OHLCV values (memoized on a BarFrame)"""
+        return as_bars(data).fingerprint()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size, budget and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+            "evictions": self.evictions
+        }
+
+    def _identity(self, data: Union[BarFrame, pd.DataFrame]) -> Tuple[Optional[str], Optional[str], str]:
+        symbol = data.attrs.get("symbol")
+        return (symbol.upper() if symbol else None, data.attrs.get("interval"), self.fingerprint(data))
+
+    def _get(self, key: Tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _put(self, key: Tuple, value: Any) -> Any:
+        value = {name: compact(array) for name, array in value.items()} if isinstance(value, dict) else compact(value)
+        arrays = list(value.values()) if isinstance(value, dict) else [value]
+        for array in arrays:
+            array.flags.writeable = False
+        size = sum(array.nbytes for array in arrays)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+
+# Global indicator cache instance
+indicator_cache = IndicatorCache()
@@ -1,46 +1,42 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import requests
 import os
-from typing import Dict, List, Optional, Any
-import ta
+import asyncio
+from typing import Dict, List, Optional, Tuple, Any
+
+from services.bar_store import bar_store
+from services.fetch_service import upstream
+from services.quote_cache import quote_cache
+from services.provider_service import provider_router
+from services.symbol_index import symbol_index
+from services.indicator_cache import indicator_cache
+from services.correlation_service import correlation_service
+from utils.indicator_engine import indicator_specs
+from utils.indicators import align_bars, calculate_batch_indicators
 
 class MarketService:
     def __init__(self):
-        self.alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY")
-        self.coingecko_base_url = "https://api.coingecko.com/api/v3"
+        self.batch_concurrency = int(os.getenv("QUOTE_BATCH_CONCURRENCY", "8"))
     
     async def search_symbols(self, query: str) -> List[Dict[str, Any]]:
         """Search for stock/crypto symbols"""
         try:
-            # For stocks, use yfinance search
-            if len(query) >= 2:
-                ticker = yf.Ticker(query)
-                info = ticker.info
-                
-                if info and 'regularMarketPrice' in info:
-                    return [{
-                        "symbol": query.upper(),
-                        "name": info.get('longName', query.upper()),
-                        "type": "stock",
-                        "price": info.get('regularMarketPrice', 0),
-                        "change": info.get('regularMarketChangePercent', 0)
-                    }]
-            
-            # For crypto, search common symbols
-            crypto_symbols = ["BTC", "ETH", "ADA", "DOT", "LINK", "LTC", "BCH", "XRP"]
-            if query.upper() in crypto_symbols:
-                return [{
-                    "symbol": f"{query.upper()}-USD",
-                    "name": f"{query.upper()}",
-                    "type": "crypto",
-                    "price": 0,  # Would fetch from API
-                    "change": 0
-                }]
-            
-            return []
+            # Rank matches from the local symbol master; no network involved
+            results = []
+            for match in symbol_index.search(query):
+                # Attach prices only when a quote is already cached
+                data = quote_cache.peek(match["symbol"])
+                results.append({
+                    "symbol": match["symbol"],
+                    "name": match["name"],
+                    "type": match["type"],
+                    "exchange": match["exchange"],
+                    "price": data["price"] if data else None,
+                    "change": data["change_percent"] if data else None
+                })
+            return results
         except Exception as e:
             print(f"Error searching symbols: {e}")
             return []
@@ -48,102 +44,135 @@ class MarketService:
     async def get_quote(self, symbol: str) -> Dict[str, Any]:
         """Get real-time quote for a symbol"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            data = await self._get_quote_data(symbol)
             
-            if not info or 'regularMarketPrice' not in info:
+            if not data:
                 raise Exception("Symbol not found")
             
-            return {
-                "symbol": symbol.upper(),
-                "name": info.get('longName', symbol.upper()),
-                "price": info.get('regularMarketPrice', 0),
-                "change": info.get('regularMarketChange', 0),
-                "change_percent": info.get('regularMarketChangePercent', 0),
-                "volume": info.get('volume', 0),
-                "market_cap": info.get('marketCap', 0),
-                "high_52_week": info.get('fiftyTwoWeekHigh', 0),
-                "low_52_week": info.get('fiftyTwoWeekLow', 0),
-                "pe_ratio": info.get('trailingPE', 0),
-                "dividend_yield": info.get('dividendYield', 0),
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._build_quote(symbol, data)
         except Exception as e:
             raise Exception(f"Error fetching quote: {e}")
     
-    async def get_historical_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> Dict[str, Any]:
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Any]:
+        """Get quotes for many symbols at once, returning per-symbol errors"""
+        unique_symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        
+        async def fetch_one(symbol: str):
+            async with semaphore:
+                try:
+                    return symbol, await self.get_quote(symbol), None
+                except Exception as e:
+                    return symbol, None, str(e)
+        
+        results = await asyncio.gather(*(fetch_one(symbol) for symbol in unique_symbols))
+        
+        return {
+            "quotes": [quote for _, quote, _ in results if quote is not None],
+            "errors": {symbol: error for symbol, _, error in results if error is not None},
+            "requested": len(unique_symbols)
+        }
+    
+    def _build_quote(self, symbol: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the quote payload from provider quote fields"""
+        return {
+            "symbol": symbol.upper(),
+            **data,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def _get_quote_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get provider quote fields through the shared quote cache"""
+        symbol = symbol.upper()
+        return await quote_cache.get(
+            symbol,
+            lambda: upstream.run(("quote", symbol), provider_router.get_quote, symbol)
+        )
+    
+    async def get_historical_data(
+        self,
+        symbol: str,
+        period: str = "1y",
+        interval: str = "1d",
+        format: str = "rows"
+    ) -> Dict[str, Any]:
         """Get historical price data for a symbol"""
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period, interval=interval)
+            hist = await upstream.run(
+                ("history", symbol.upper(), interval, period, None, None),
+                bar_store.get_history, symbol, period=period, interval=interval
+            )
             
             if hist.empty:
-                raise Exception("No historical data available")
+                raise LookupError(f"No historical data available for {symbol.upper()}")
             
-            # Convert to list format for JSON serialization
-            data = []
-            for date, row in hist.iterrows():
-                data.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "open": float(row['Open']),
-                    "high": float(row['High']),
-                    "low": float(row['Low']),
-                    "close": float(row['Close']),
-                    "volume": int(row['Volume'])
-                })
+            # Whole columns as arrays; the route encodes them for the negotiated format
+            dates = hist.index.strftime("%Y-%m-%d").to_numpy(dtype=object)
+            opens = hist['Open'].to_numpy(dtype=float)
+            highs = hist['High'].to_numpy(dtype=float)
+            lows = hist['Low'].to_numpy(dtype=float)
+            closes = hist['Close'].to_numpy(dtype=float)
+            volumes = hist['Volume'].fillna(0).to_numpy(dtype=np.int64)
+            
+            if format == "columnar":
+                data = {
+                    "dates": dates,
+                    "open": opens,
+                    "high": highs,
+                    "low": lows,
+                    "close": closes,
+                    "volume": volumes
+                }
+            else:
+                data = [
+                    {"date": d, "open": o, "high": h, "low": l, "close": c, "volume": v}
+                    for d, o, h, l, c, v in zip(
+                        dates.tolist(), opens.tolist(), highs.tolist(),
+                        lows.tolist(), closes.tolist(), volumes.tolist()
+                    )
+                ]
             
             return {
                 "symbol": symbol.upper(),
                 "period": period,
                 "interval": interval,
+                "format": format,
                 "data": data
             }
+        except LookupError:
+            raise
         except Exception as e:
             raise Exception(f"Error fetching historical data: {e}")
     
-    async def get_technical_indicators(self, symbol: str, period: str = "1y") -> Dict[str, Any]:
+    async def get_technical_indicators(
+        self,
+        symbol: str,
+        period: str = "1y",
+        indicators: Optional[List[str]] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        tail: Optional[int] = None
+    ) -> Dict[str, Any]:
         """Get technical indicators for a symbol"""
+        # Bad selections are the caller's error, so check them before fetching anything
+        specs = indicator_specs(indicators, parameters)
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period)
+            hist = await upstream.run(
+                ("history", symbol.upper(), "1d", period, None, None),
+                bar_store.get_history, symbol, period=period
+            )
             
             if hist.empty:
                 raise Exception("No historical data available")
             
-            # Calculate technical indicators
-            indicators = {}
-            
-            # Moving averages
-            indicators['sma_20'] = ta.trend.sma_indicator(hist['Close'], window=20).tolist()
-            indicators['sma_50'] = ta.trend.sma_indicator(hist['Close'], window=50).tolist()
-            indicators['ema_12'] = ta.trend.ema_indicator(hist['Close'], window=12).tolist()
-            indicators['ema_26'] = ta.trend.ema_indicator(hist['Close'], window=26).tolist()
-            
-            # RSI
-            indicators['rsi'] = ta.momentum.rsi(hist['Close'], window=14).tolist()
-            
-            # MACD
-            macd = ta.trend.MACD(hist['Close'])
-            indicators['macd'] = macd.macd().tolist()
-            indicators['macd_signal'] = macd.macd_signal().tolist()
-            indicators['macd_histogram'] = macd.macd_diff().tolist()
+            # Calculate only the requested indicators, reusing cached results
+            values = indicator_cache.compute_specs(hist, specs)
             
-            # Bollinger Bands
-            bb = ta.volatility.BollingerBands(hist['Close'])
-            indicators['bb_upper'] = bb.bollinger_hband().tolist()
-            indicators['bb_middle'] = bb.bollinger_mavg().tolist()
-            indicators['bb_lower'] = bb.bollinger_lband().tolist()
-            
-            # Stochastic
-            stoch = ta.momentum.StochasticOscillator(hist['High'], hist['Low'], hist['Close'])
-            indicators['stoch_k'] = stoch.stoch().tolist()
-            indicators['stoch_d'] = stoch.stoch_signal().tolist()
-            
-            # Volume indicators
-            indicators['volume_sma'] = ta.volume.volume_sma(hist['Close'], hist['Volume']).tolist()
+            # Return the last `tail` points; indicators still warm up on the full history
+            start = max(len(hist) - tail, 0) if tail else 0
+            indicators = {name: series[start:] for name, series in values.items()}
             
             # Get dates for the indicators
-            dates = [date.strftime("%Y-%m-%d") for date in hist.index]
+            dates = hist.index[start:].strftime("%Y-%m-%d").to_numpy(dtype=object)
             
             return {
                 "symbol": symbol.upper(),
@@ -154,6 +183,114 @@ class MarketService:
         except Exception as e:
             raise Exception(f"Error calculating indicators: {e}")
     
+    async def get_batch_indicators(
+        self,
+        symbols: List[str],
+        period: str = "1y",
+        indicators: Optional[List[str]] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        tail: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get indicators for many symbols in one vectorized pass over a (date x symbol) matrix"""
+        indicator_specs(indicators, parameters)
+        unique_symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        frames, errors = await self._get_histories(unique_symbols, period)
+        
+        try:
+            dates, matrices = align_bars(frames)
+            values = calculate_batch_indicators(
+                matrices["Close"], matrices["High"], matrices["Low"], matrices["Volume"],
+                indicators, parameters
+            ) if frames else {}
+        except Exception as e:
+            raise Exception(f"Error calculating batch indicators: {e}")
+        
+        # Dates a symbol did not trade on come back as NaN for it
+        start = max(len(dates) - tail, 0) if tail else 0
+        return {
+            "period": period,
+            "dates": dates[start:].strftime("%Y-%m-%d").to_numpy(dtype=object),
+            "symbols": list(frames),
+            "indicators": {
+                name: {
+                    symbol: matrix[start:, i]
+                    for i, symbol in enumerate(frames)
+                }
+                for name, matrix in values.items()
+            },
+            "errors": errors,
+            "requested": len(unique_symbols)
+        }
+    
+    async def get_correlation(
+        self,
+        symbols: List[str],
+        benchmark: Optional[str] = None,
+        period: str = "1y",
+        window: int = 60
+    ) -> Dict[str, Any]:
+        """Get betas against a benchmark, rolling betas and correlation/covariance matrices"""
+        benchmark = (benchmark or correlation_service.benchmark).strip().upper()
+        unique_symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        frames, errors = await self._get_histories([benchmark] + unique_symbols, period)
+        
+        if benchmark not in frames:
+            raise Exception(f"Benchmark {benchmark} unavailable: {errors.get(benchmark)}")
+        symbols_ok = [symbol for symbol in unique_symbols if symbol in frames]
+        
+        try:
+            # Returns are measured over the benchmark's trading days
+            universe = {symbol: frames[symbol] for symbol in symbols_ok}
+            universe[benchmark] = frames[benchmark]
+            dates, matrices = align_bars(universe, calendar=benchmark)
+            columns = list(universe)
+            closes = matrices["Close"]
+            prices = closes[:, [columns.index(symbol) for symbol in symbols_ok]]
+            benchmark_prices = closes[:, columns.index(benchmark)]
+            result = correlation_service.analyze(dates, prices, benchmark_prices, symbols_ok, benchmark, window)
+        except Exception as e:
+            raise Exception(f"Error calculating correlation: {e}")
+        
+        return {
+            "benchmark": benchmark,
+            "period": period,
+            "window": window,
+            "symbols": symbols_ok,
+            "dates": dates.strftime("%Y-%m-%d").to_numpy(dtype=object),
+            "betas": dict(zip(symbols_ok, result["betas"].tolist())),
+            "rolling_betas": {symbol: result["rolling_betas"][:, i] for i, symbol in enumerate(symbols_ok)},
+            "correlation": result["correlation"],
+            "covariance": result["covariance"],
+            "errors": errors,
+            "requested": len(unique_symbols)
+        }
+    
+    async def _get_histories(
+        self,
+        symbols: List[str],
+        period: str = "1y"
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """Load daily bars for many symbols concurrently, returning per-symbol errors"""
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        
+        async def fetch_one(symbol: str):
+            async with semaphore:
+                try:
+                    hist = await upstream.run(
+                        ("history", symbol, "1d", period, None, None),
+                        bar_store.get_history, symbol, period=period
+                    )
+                    if hist.empty:
+                        return symbol, None, "No historical data available"
+                    return symbol, hist, None
+                except Exception as e:
+                    return symbol, None, str(e)
+        
+        results = await asyncio.gather(*(fetch_one(symbol) for symbol in dict.fromkeys(symbols)))
+        frames = {symbol: hist for symbol, hist, _ in results if hist is not None}
+        errors = {symbol: error for symbol, _, error in results if error is not None}
+        return frames, errors
+    
     async def get_trending_symbols(self) -> List[Dict[str, Any]]:
         """Get trending stocks/crypto"""
         try:
@@ -0,0 +1,161 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process locking on Windows; the in-process lock still applies
+    fcntl = None
+
+from providers.base import BAR_COLUMNS
+
+# One fixed-width record per minute bar; timestamps are UTC nanoseconds
+BAR_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+])
+
+
+class MinuteArchive:
+    """Append-only, memory-mapped archive of 1-minute bars, one file per symbol.
+
+    Each ``{SYMBOL}.bin`` file is a flat array of BAR_DTYPE records sorted by
+    timestamp, so a time range is found with two binary searches and returned
+    as a zero-copy view of the mapping. Every process reading the archive
+    shares the same OS page cache instead of holding its own copy. Writers
+    take an exclusive file lock and only ever rewrite from the first changed
+    record onwards, which in practice means appending new bars and updating
+    the still-forming last one.
+    """
+
+    def __init__(self):
+        self.root = os.getenv("MINUTE_ARCHIVE_DIR", "./data/minute")
+        self._maps: Dict[str, Tuple[int, np.memmap]] = {}
+        self._lock = threading.Lock()
+
+    def view(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Get records with start <= timestamp < end (UTC ns) as a read-only view"""
+        records = self._map(symbol.upper())
+        timestamps = records["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(records) if end is None else int(np.searchsorted(timestamps, end, side="left"))
+        return records[lo:hi]
+
+    def columns(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Get each field of a time range as its own zero-copy array view"""
+        records = self.view(symbol, start, end)
+        return {name: records[name] for name in BAR_DTYPE.names}
+
+    def frame(self, symbol: str, tz: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None) -> pd.DataFrame:
+        """Get a time range as an OHLCV DataFrame in the given timezone, its columns read-only views of the mapping"""
+        columns = self.columns(symbol, start, end)
+        index = pd.DatetimeIndex(columns["timestamp"].astype("datetime64[ns]")).tz_localize("UTC")
+        index = index.tz_convert(tz) if tz else index.tz_localize(None)
+        index.name = "Date"
+        return pd.DataFrame({
+            col: columns[col.lower()] for col in BAR_COLUMNS
+        }, index=index, copy=False)
+
+    def write(self, symbol: str, frame: pd.DataFrame):
+        """Store a sorted OHLCV frame as the symbol's full history"""
+        symbol = symbol.upper()
+        records = self._to_records(frame)
+        path = self._path(symbol)
+        os.makedirs(self.root, exist_ok=True)
+
+        with self._lock, open(path + ".lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                existing = self._read_current(path)
+                n = min(len(existing), len(records))
+
+                if len(existing) > len(records) or not np.array_equal(existing["timestamp"][:n], records["timestamp"][:n]):
+                    # Bars were inserted before the end; rewrite the whole file
+                    tmp_path = path + ".tmp"
+                    with open(tmp_path, "wb") as f:
+                        f.write(records.tobytes())
+                    os.replace(tmp_path, path)
+                else:
+                    # Same history with new or updated bars at the end
+                    changed = np.flatnonzero(existing[:n] != records[:n])
+                    offset = int(changed[0]) if len(changed) else n
+                    if offset < len(records):
+                        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                            f.seek(offset * BAR_DTYPE.itemsize)
+                            f.write(records[offset:].tobytes())
+                            f.truncate(len(records) * BAR_DTYPE.itemsize)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            self._maps.pop(symbol, None)
+
+    def remove(self, symbol: str):
+        """Delete a symbol's archive"""
+        symbol = symbol.upper()
+        with self._lock:
+            self._maps.pop(symbol, None)
+            for path in (self._path(symbol), self._path(symbol) + ".lock"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _path(self, symbol: str) -> str:
+        safe_symbol = symbol.replace("/", "_")
+        return os.path.join(self.root, f"{safe_symbol}.bin")
+
+    def _map(self, symbol: str) -> np.ndarray:
+        """Memory-map the symbol's file, remapping when it has changed on disk"""
+        path = self._path(symbol)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._maps.get(symbol)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            # A partly written trailing record is ignored until its write completes
+            count = stat.st_size // BAR_DTYPE.itemsize
+            if count == 0:
+                return np.empty(0, dtype=BAR_DTYPE)
+            records = np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+            self._maps[symbol] = (signature, records)
+            return records
+
+    def _read_current(self, path: str) -> np.ndarray:
+        if not os.path.exists(path):
+            return np.empty(0, dtype=BAR_DTYPE)
+        count = os.path.getsize(path) // BAR_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+
+    def _to_records(self, frame: pd.DataFrame) -> np.ndarray:
+        index = frame.index.as_unit("ns")
+        if index.tz is not None:
+            index = index.tz_convert("UTC")
+
+        records = np.empty(len(frame), dtype=BAR_DTYPE)
+        records["timestamp"] = index.asi8
+        for col in BAR_COLUMNS:
+            if col == "Volume":
+                # A NaN volume would cast to int64 min; store it as no volume
+                records["volume"] = frame[col].fillna(0).to_numpy(dtype=np.int64)
+            else:
+                records[col.lower()] = frame[col].to_numpy(dtype=np.float64)
+        return records
+
+
+# Global minute archive instance
+minute_archive = MinuteArchive()
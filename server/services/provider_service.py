@@ -0,0 +1,157 @@
+import os
+import time
+import pandas as pd
+from typing import Dict, List, Optional, Any, Callable
+
+from providers.base import MarketDataProvider, empty_bars
+from providers.yfinance_provider import YFinanceProvider
+from providers.alpha_vantage_provider import AlphaVantageProvider
+from providers.coingecko_provider import CoinGeckoProvider
+from providers.replay_provider import ReplayProvider
+
+PROVIDER_CLASSES = {
+    "replay": ReplayProvider,
+    "yfinance": YFinanceProvider,
+    "coingecko": CoinGeckoProvider,
+    "alpha_vantage": AlphaVantageProvider,
+}
+
+
+class ProviderRouter:
+    """Sends market data calls to providers in failover order.
+
+    Providers are tried in MARKET_DATA_PROVIDERS order, skipping those that
+    are not configured or cannot serve the symbol/interval. A provider that
+    errors, or answers slower than PROVIDER_SLOW_SECONDS, several times in a
+    row is skipped for a cooldown period so traffic routes around it.
+    """
+
+    def __init__(self):
+        order = os.getenv("MARKET_DATA_PROVIDERS", "replay,yfinance,coingecko,alpha_vantage")
+        self.failure_threshold = int(os.getenv("PROVIDER_FAILURE_THRESHOLD", "3"))
+        self.cooldown_seconds = float(os.getenv("PROVIDER_COOLDOWN_SECONDS", "60"))
+        self.slow_seconds = float(os.getenv("PROVIDER_SLOW_SECONDS", "5"))
+
+        self.providers: List[MarketDataProvider] = []
+        for name in order.split(","):
+            name = name.strip()
+            if name in PROVIDER_CLASSES:
+                self.providers.append(PROVIDER_CLASSES[name]())
+            elif name:
+                print(f"Unknown market data provider: {name}")
+
+        self._health = {
+            provider.name: {
+                "calls": 0,
+                "failures": 0,
+                "consecutive_failures": 0,
+                "open_until": 0.0,
+                "avg_latency": None
+            }
+            for provider in self.providers
+        }
+
+    def get_provider(self, name: str) -> Optional[MarketDataProvider]:
+        """Get a configured provider by name"""
+        return next((provider for provider in self.providers if provider.name == name), None)
+
+    def local_provider(self, symbol: str, interval: str = "1d") -> Optional[MarketDataProvider]:
+        """The provider that would serve this request, if it reads from local files"""
+        candidates = self._candidates(symbol, interval, check_support=True)
+        if candidates and candidates[0].is_local:
+            return candidates[0]
+        return None
+
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get OHLCV bars from the first provider that has them"""
+        result = self._call(
+            symbol, interval,
+            lambda provider: provider.get_history(symbol, period=period, interval=interval, start=start, end=end),
+            lambda frame: frame is not None and not frame.empty
+        )
+        return result if result is not None else empty_bars()
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get quote fields from the first provider that knows the symbol"""
+        return self._call(symbol, "1d", lambda provider: provider.get_quote(symbol), lambda quote: quote is not None)
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Search symbols with the first provider that returns matches"""
+        result = self._call(query, "1d", lambda provider: provider.search(query), bool, check_support=False)
+        return result or []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-provider health and latency"""
+        now = time.monotonic()
+        return {
+            provider.name: {
+                **{key: value for key, value in self._health[provider.name].items() if key != "open_until"},
+                "available": provider.is_available(),
+                "circuit_open": self._health[provider.name]["open_until"] > now
+            }
+            for provider in self.providers
+        }
+
+    def _candidates(self, symbol: str, interval: str, check_support: bool) -> List[MarketDataProvider]:
+        usable = [
+            provider for provider in self.providers
+            if provider.is_available() and (not check_support or provider.supports(symbol, interval))
+        ]
+        now = time.monotonic()
+        healthy = [provider for provider in usable if self._health[provider.name]["open_until"] <= now]
+        # If every provider is cooling down, try them anyway rather than fail outright
+        return healthy or usable
+
+    def _call(
+        self,
+        symbol: str,
+        interval: str,
+        func: Callable[[MarketDataProvider], Any],
+        has_data: Callable[[Any], bool],
+        check_support: bool = True
+    ) -> Any:
+        errors = []
+        answered = False
+        for provider in self._candidates(symbol, interval, check_support):
+            started = time.monotonic()
+            try:
+                result = func(provider)
+            except Exception as e:
+                self._record(provider, time.monotonic() - started, failed=True)
+                errors.append(f"{provider.name}: {e}")
+                continue
+
+            self._record(provider, time.monotonic() - started, failed=False)
+            answered = True
+            if has_data(result):
+                return result
+
+        if errors and not answered:
+            raise Exception("; ".join(errors))
+        return None
+
+    def _record(self, provider: MarketDataProvider, latency: float, failed: bool):
+        health = self._health[provider.name]
+        health["calls"] += 1
+        health["avg_latency"] = latency if health["avg_latency"] is None else 0.8 * health["avg_latency"] + 0.2 * latency
+
+        # Slow answers count against the provider the same way errors do
+        if failed or latency > self.slow_seconds:
+            health["failures"] += 1
+            health["consecutive_failures"] += 1
+            if health["consecutive_failures"] >= self.failure_threshold:
+                health["open_until"] = time.monotonic() + self.cooldown_seconds
+                health["consecutive_failures"] = 0
+        else:
+            health["consecutive_failures"] = 0
+
+
+# Global provider router instance
+provider_router = ProviderRouter()
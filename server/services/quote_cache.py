@@ -0,0 +1,128 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+MARKET_TZ = ZoneInfo("America/New_York")
+
+
+class QuoteCache:
+    """In-process TTL cache for quote data with LRU eviction.
+
+    Entries younger than the TTL are served as-is. Entries past the TTL but
+    still inside the stale window are served immediately while a background
+    task refreshes them (stale-while-revalidate). Older entries are treated
+    as misses and loaded inline. A separate TTL applies outside US market
+    hours, when quotes barely move.
+    """
+
+    def __init__(self):
+        self.ttl = float(os.getenv("QUOTE_CACHE_TTL", "15"))
+        self.off_hours_ttl = float(os.getenv("QUOTE_CACHE_OFF_HOURS_TTL", "300"))
+        self.stale_ttl = float(os.getenv("QUOTE_CACHE_STALE_TTL", "60"))
+        self.max_size = int(os.getenv("QUOTE_CACHE_SIZE", "2000"))
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Get a cached value, loading or revalidating it through loader as needed"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            ttl = self.current_ttl()
+
+            if age < ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+
+            if age < ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._schedule_refresh(key, loader)
+                return value
+
+        self.misses += 1
+        value = await loader()
+        self.set(key, value)
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Get a cached value (fresh or stale) without loading or counting it"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        if time.monotonic() - fetched_at >= self.current_ttl() + self.stale_ttl:
+            return None
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a value and evict the least recently used entries over the size limit"""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or the whole cache"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def current_ttl(self) -> float:
+        """TTL for the current time: the market-hours TTL or the off-hours TTL"""
+        now = datetime.now(MARKET_TZ)
+        minutes = now.hour * 60 + now.minute
+        if now.weekday() < 5 and 9 * 60 + 30 <= minutes < 16 * 60:
+            return self.ttl
+        return self.off_hours_ttl
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the active settings"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "off_hours_ttl": self.off_hours_ttl,
+            "stale_ttl": self.stale_ttl,
+            "current_ttl": self.current_ttl(),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0,
+            "evictions": self.evictions,
+            "refreshing": len(self._refreshing),
+            "refresh_errors": self.refresh_errors
+        }
+
+    def _schedule_refresh(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+        self._refreshing[key] = asyncio.create_task(self._refresh(key, loader))
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        try:
+            self.set(key, await loader())
+        except Exception as e:
+            # Keep serving the stale value; the next lookup retries
+            self.refresh_errors += 1
+            print(f"Error refreshing cached quote {key}: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+
+# Global quote cache instance
+quote_cache = QuoteCache()
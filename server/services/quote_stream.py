@@ -0,0 +1,107 @@
+import os
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+
+class QuoteStreamer:
+    """Fans quote updates out to WebSocket subscribers.
+
+    Exactly one polling task runs per subscribed symbol, however many clients
+    follow it, so upstream traffic grows with distinct symbols rather than
+    connections. Each poll is diffed against the previous quote and only the
+    changed fields are pushed. Subscribers receive messages on their own
+    bounded queue; a client that falls behind loses its oldest messages
+    instead of holding up everyone else.
+    """
+
+    def __init__(self, fetch_quote: Callable[[str], Awaitable[Dict[str, Any]]]):
+        self.fetch_quote = fetch_quote
+        self.poll_seconds = float(os.getenv("QUOTE_STREAM_INTERVAL", "5"))
+        self.queue_size = int(os.getenv("QUOTE_STREAM_QUEUE_SIZE", "100"))
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+
+    def new_queue(self) -> asyncio.Queue:
+        """Create a message queue for one connection"""
+        return asyncio.Queue(maxsize=self.queue_size)
+
+    def send(self, queue: asyncio.Queue, message: Dict[str, Any]):
+        """Queue a message for one connection"""
+        if queue.full():
+            # Drop the oldest message for a slow client
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    def subscribe(self, symbol: str, queue: asyncio.Queue):
+        """Add a subscriber, starting the symbol's poller if it is the first one"""
+        symbol = symbol.upper()
+        self._subscribers.setdefault(symbol, set()).add(queue)
+
+        if symbol not in self._pollers:
+            self._pollers[symbol] = asyncio.create_task(self._poll(symbol))
+        elif symbol in self._last:
+            # Late joiners get the full current quote before any diffs
+            self.send(queue, self._message(symbol, self._diff(None, self._last[symbol])))
+
+    def unsubscribe(self, symbol: str, queue: asyncio.Queue):
+        """Remove a subscriber, stopping the poller when nobody is left"""
+        symbol = symbol.upper()
+        subscribers = self._subscribers.get(symbol)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+
+        if not subscribers:
+            del self._subscribers[symbol]
+            self._last.pop(symbol, None)
+            poller = self._pollers.pop(symbol, None)
+            if poller is not None:
+                poller.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get active symbols and subscriber counts"""
+        return {
+            "symbols": len(self._pollers),
+            "subscriptions": sum(len(queues) for queues in self._subscribers.values()),
+            "poll_seconds": self.poll_seconds
+        }
+
+    async def _poll(self, symbol: str):
+        delay = self.poll_seconds
+        while True:
+            try:
+                quote = await self.fetch_quote(symbol)
+                changes = self._diff(self._last.get(symbol), quote)
+                self._last[symbol] = quote
+                if changes:
+                    self._broadcast(symbol, self._message(symbol, changes))
+                delay = self.poll_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._broadcast(symbol, {"type": "error", "symbol": symbol, "message": str(e)})
+                # Back off on a failing symbol without hammering the provider
+                delay = min(delay * 2, self.poll_seconds * 12)
+            await asyncio.sleep(delay)
+
+    def _diff(self, previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+        if previous is None:
+            return {key: value for key, value in current.items() if key != "timestamp"}
+        return {
+            key: value for key, value in current.items()
+            if key != "timestamp" and previous.get(key) != value
+        }
+
+    def _message(self, symbol: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": "quote",
+            "symbol": symbol,
+            "data": data,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _broadcast(self, symbol: str, message: Dict[str, Any]):
+        for queue in list(self._subscribers.get(symbol, ())):
+            self.send(queue, message)
@@ -1,11 +1,19 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 import ta
 import uuid
+import json
 
+from services.bar_store import bar_store
+from services.fetch_service import upstream
+from services.correlation_service import correlation_service
+from services.sweep_service import sweep_executor
+from utils.backtest_engine import summarize_grid
+from utils.bar_frame import BarFrame
+from utils.correlation_engine import CorrelationEngine, simple_returns
+from utils.indicators import align_bars
 from strategies.moving_average import MovingAverageStrategy
 from strategies.rsi_strategy import RSIStrategy
 from strategies.macd_strategy import MACDStrategy
@@ -30,8 +38,7 @@ class StrategyService:
         """Run backtest for a trading strategy"""
         try:
             # Get historical data
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(start=start_date, end=end_date)
+            hist = await self._get_history(symbol, start=start_date, end=end_date)
             
             if hist.empty:
                 raise Exception("No historical data available for the specified period")
@@ -72,7 +79,7 @@ class StrategyService:
                 "parameters": parameters,
                 "performance": performance,
                 "trades": results.get("trades", []),
-                "equity_curve": results.get("equity_curve", [])
+                "equity_curve": np.asarray(results.get("equity_curve", []), dtype=float)
             }
             
         except Exception as e:
@@ -89,8 +96,7 @@ class StrategyService:
         """Compare performance of different strategies for a symbol"""
         try:
             # Get historical data
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period)
+            hist = await self._get_history(symbol, period=period)
             
             if hist.empty:
                 raise Exception("No historical data available")
@@ -120,24 +126,32 @@ class StrategyService:
         symbol: str, 
         strategy: str, 
         start_date: str, 
-        end_date: str
+        end_date: str,
+        grid: str = "{}",
+        format: str = "rows"
     ) -> Dict[str, Any]:
         """Optimize strategy parameters for a symbol"""
+        # A bad grid is the caller's error, so check it before fetching anything
+        combinations = self._parameter_grid(strategy, grid)
         try:
-            if strategy not in self.strategies:
-                raise Exception(f"Strategy '{strategy}' not found")
-            
             # Get historical data
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(start=start_date, end=end_date)
+            hist = await self._get_history(symbol, start=start_date, end=end_date)
             
             if hist.empty:
                 raise Exception("No historical data available")
             
             strategy_instance = self.strategies[strategy]
             
-            # Run optimization
-            optimization = strategy_instance.optimize(hist)
+            # Run optimization on the sweep pool, off the event loop
+            results = [None] * len(combinations)
+            async for index, result in sweep_executor.sweep(hist, strategy_instance, combinations):
+                results[index] = result
+            optimization = summarize_grid(results, strategy_instance.parameter_ranges)
+            if format == "columnar":
+                # One array per parameter and metric instead of a record per combination
+                rows = optimization["all_results"]
+                names = list(strategy_instance.parameter_ranges) + ["sharpe_ratio", "total_return", "num_trades"]
+                optimization["all_results"] = {name: np.array([row[name] for row in rows]) for name in names}
             
             return {
                 "symbol": symbol,
@@ -148,6 +162,62 @@ class StrategyService:
         except Exception as e:
             raise Exception(f"Error optimizing strategy: {e}")
     
+    async def stream_optimization(
+        self, 
+        symbol: str, 
+        strategy: str, 
+        start_date: str, 
+        end_date: str,
+        grid: str = "{}"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Start an optimization and return its events: each combination's result as it finishes, then a summary"""
+        combinations = self._parameter_grid(strategy, grid)
+        try:
+            hist = await self._get_history(symbol, start=start_date, end=end_date)
+            
+            if hist.empty:
+                raise Exception("No historical data available")
+        except Exception as e:
+            raise Exception(f"Error optimizing strategy: {e}")
+        
+        return self._optimization_events(hist, self.strategies[strategy], combinations)
+    
+    async def _optimization_events(
+        self,
+        hist: BarFrame,
+        strategy_instance: Any,
+        combinations: List[Dict[str, int]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        results = [None] * len(combinations)
+        try:
+            async for index, result in sweep_executor.sweep(hist, strategy_instance, combinations):
+                results[index] = result
+                if result is not None:
+                    yield {"index": index, **result}
+        except Exception as e:
+            # Headers are already sent, so report the failure in the stream itself
+            yield {"error": f"Error optimizing strategy: {e}"}
+            return
+        
+        summary = summarize_grid(results, strategy_instance.parameter_ranges)
+        yield {
+            "done": True,
+            "combinations": len(combinations),
+            "best_parameters": summary["best_parameters"],
+            "best_sharpe": summary["best_sharpe"]
+        }
+    
+    def _parameter_grid(self, strategy: str, grid: str) -> List[Dict[str, int]]:
+        """Parameter combinations of a strategy, with ranges overridden by a JSON object such as {"short_period": [5, 10]}"""
+        if strategy not in self.strategies:
+            raise ValueError(f"Strategy '{strategy}' not found")
+        ranges = json.loads(grid) if grid else {}
+        if not isinstance(ranges, dict):
+            raise ValueError("grid must be a JSON object of parameter values")
+        combinations = self.strategies[strategy].parameter_grid(ranges)
+        sweep_executor.check_size(combinations)
+        return combinations
+    
     async def analyze_risk(
         self, 
         symbol: str, 
@@ -163,8 +233,7 @@ class StrategyService:
             params = json.loads(parameters) if parameters else {}
             
             # Get historical data
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(start=start_date, end=end_date)
+            hist = await self._get_history(symbol, start=start_date, end=end_date)
             
             if hist.empty:
                 raise Exception("No historical data available")
@@ -176,8 +245,9 @@ class StrategyService:
             
             results = strategy_instance.backtest(hist, params)
             
-            # Calculate risk metrics
-            risk_metrics = self._calculate_risk_metrics(results)
+            # Calculate risk metrics, with beta against the benchmark index
+            benchmark_returns = await self._get_benchmark_returns(hist, start_date, end_date)
+            risk_metrics = self._calculate_risk_metrics(results, benchmark_returns)
             
             return {
                 "symbol": symbol,
@@ -204,8 +274,7 @@ class StrategyService:
             params = json.loads(parameters) if parameters else {}
             
             # Get recent historical data
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="6mo")  # Get 6 months of data for indicators
+            hist = await self._get_history(symbol, period="6mo")  # Get 6 months of data for indicators
             
             if hist.empty:
                 raise Exception("No historical data available")
@@ -228,6 +297,40 @@ class StrategyService:
         except Exception as e:
             raise Exception(f"Error getting trading signals: {e}")
     
+    async def _get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> BarFrame:
+        """Load bars off the event loop, coalescing identical concurrent requests"""
+        hist = await upstream.run(
+            ("history", symbol.upper(), "1d", period, start, end),
+            bar_store.get_history, symbol, period=period, start=start, end=end
+        )
+        # Read-only views, so every caller and run shares the loaded bars without a copy;
+        # backtests accumulate cash and equity, so float columns are read in float64
+        return BarFrame.from_frame(hist)
+    
+    async def _get_benchmark_returns(
+        self,
+        hist: BarFrame,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """Benchmark daily returns on the trading days of hist (from its second bar), or None"""
+        try:
+            benchmark = await self._get_history(correlation_service.benchmark, start=start, end=end)
+        except Exception as e:
+            print(f"Error fetching benchmark history: {e}")
+            return None
+        if benchmark.empty:
+            return None
+        
+        _, matrices = align_bars({"strategy": hist.to_frame(), "benchmark": benchmark.to_frame()}, calendar="strategy")
+        return simple_returns(matrices["Close"][:, 1])[1:]
+    
     def _calculate_performance_metrics(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate performance metrics from backtest results"""
         try:
@@ -286,7 +389,11 @@ class StrategyService:
         except Exception as e:
             return {"error": f"Error calculating metrics: {e}"}
     
-    def _calculate_risk_metrics(self, results: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_risk_metrics(
+        self,
+        results: Dict[str, Any],
+        benchmark_returns: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """Calculate risk metrics from backtest results"""
         try:
             trades = results.get("trades", [])
@@ -304,10 +411,11 @@ class StrategyService:
             var_95 = np.percentile(daily_returns, 5) if daily_returns else 0
             var_99 = np.percentile(daily_returns, 1) if daily_returns else 0
             
-            # Calculate beta (assuming market return of 0.1 annually)
-            market_return = 0.1 / 252  # Daily market return
-            excess_returns = [r - market_return for r in daily_returns]
-            beta = np.cov(daily_returns, [market_return] * len(daily_returns))[0, 1] / np.var([market_return]) if len(daily_returns) > 1 else 0
+            # Calculate beta of the strategy's daily returns against the benchmark's
+            beta = None
+            if benchmark_returns is not None and len(benchmark_returns) == len(daily_returns):
+                beta = CorrelationEngine(daily_returns, benchmark_returns).betas()[0]
+                beta = float(beta) if np.isfinite(beta) else None
             
             return {
                 "var_95": var_95,
@@ -0,0 +1,185 @@
+import os
+import asyncio
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from services.indicator_cache import indicator_cache
+from utils.backtest_engine import evaluate_grid
+from utils.bar_frame import BarFrame
+from utils.indicator_engine import IndicatorEngine
+from utils.precision import compact
+
+# Bar columns shared with the workers, in row order
+BAR_COLUMNS = ("High", "Low", "Close", "Volume")
+
+
+class SweepExecutor:
+    """Runs strategy parameter sweeps on a pool of worker processes.
+
+    The bars of a sweep are put into one shared-memory block, so tasks carry
+    only the block's name and a chunk of parameter combinations. Each worker
+    reads the bars once per sweep and keeps one indicator engine for it, so
+    EMAs and SMAs shared by several chunks on the same worker are computed
+    once. Chunk results are yielded as they finish. Sweeps smaller than
+    SWEEP_POOL_MIN_CELLS bars x combinations (or SWEEP_MAX_WORKERS=1) run on
+    a thread instead: they finish inline in well under a second, less than
+    starting the workers and shipping the bars to them would cost. Set
+    SWEEP_PREWARM to start the workers with the server rather than on the
+    first large sweep.
+    """
+
+    def __init__(self):
+        # Unset or empty means one worker per CPU
+        self.max_workers = int(os.getenv("SWEEP_MAX_WORKERS") or os.cpu_count() or 1)
+        self.min_chunk = int(os.getenv("SWEEP_MIN_CHUNK", "16"))
+        self.max_combinations = int(os.getenv("SWEEP_MAX_COMBINATIONS", "100000"))
+        # Inline sweeps run at roughly 100-1500ns per bar and combination
+        self.pool_min_cells = int(os.getenv("SWEEP_POOL_MIN_CELLS", "2000000"))
+        self.prewarm = os.getenv("SWEEP_PREWARM", "").lower() in ("1", "true", "yes")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.sweeps = 0
+        self.combinations = 0
+
+    async def sweep(
+        self,
+        data: Union[BarFrame, pd.DataFrame],
+        strategy: Any,
+        grid: List[Dict[str, int]]
+    ) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Evaluate a strategy's parameter grid, yielding (grid position, result) as chunks finish"""
+        self.check_size(grid)
+        self.sweeps += 1
+
+        if self.max_workers <= 1 or len(grid) < 2 * self.min_chunk or len(data) * len(grid) < self.pool_min_cells:
+            results = await asyncio.to_thread(self._evaluate_inline, data, strategy, grid)
+            self.combinations += len(grid)
+            for index, result in enumerate(results):
+                yield index, result
+            return
+
+        bars = np.stack([np.asarray(data[col], dtype=np.float64) for col in BAR_COLUMNS])
+        block = shared_memory.SharedMemory(create=True, size=max(bars.nbytes, 1))
+        futures = []
+        try:
+            view = np.ndarray(bars.shape, dtype=np.float64, buffer=block.buf)
+            view[:] = bars
+            del view
+
+            # A few chunks per worker keeps every core busy until the end of the sweep
+            size = max(self.min_chunk, -(-len(grid) // (4 * self.max_workers)))
+            loop = asyncio.get_running_loop()
+            pool = self._get_pool()
+            futures = [
+                loop.run_in_executor(pool, _evaluate_chunk, block.name, bars.shape, strategy, start, grid[start:start + size])
+                for start in range(0, len(grid), size)
+            ]
+            for finished in asyncio.as_completed(futures):
+                start, results = await finished
+                self.combinations += len(results)
+                for offset, result in enumerate(results):
+                    yield start + offset, result
+        finally:
+            # Drop chunks not yet started (e.g. the client went away); running ones finish on their own
+            for future in futures:
+                future.cancel()
+            block.close()
+            block.unlink()
+
+    def check_size(self, grid: List[Dict[str, int]]):
+        """Reject grids above SWEEP_MAX_COMBINATIONS"""
+        if len(grid) > self.max_combinations:
+            raise ValueError(f"Parameter grid has {len(grid)} combinations; the limit is {self.max_combinations}")
+
+    def warm_up(self):
+        """Start the worker processes now when SWEEP_PREWARM is set, without waiting for them"""
+        if not self.prewarm or self.max_workers <= 1:
+            return
+        pool = self._get_pool()
+        # One task per worker makes the pool spawn every process and import the engines
+        for _ in range(self.max_workers):
+            pool.submit(_warm_up)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size and sweep counters"""
+        return {
+            "max_workers": self.max_workers,
+            "pool_min_cells": self.pool_min_cells,
+            "pool_started": self._pool is not None,
+            "sweeps": self.sweeps,
+            "combinations": self.combinations
+        }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned workers do not inherit the server's threads, locks or sockets
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _evaluate_inline(self, data: Union[BarFrame, pd.DataFrame], strategy: Any, grid: List[Dict[str, int]]) -> List[Optional[Dict[str, Any]]]:
+        series = indicator_cache.compute_specs(data, strategy.grid_specs(grid))
+        return evaluate_grid(strategy, data["Close"], series, grid)
+
+
+# Per worker process: an indicator engine for each recent sweep, by shared-memory block name
+_worker_sweeps: "OrderedDict[str, Tuple[IndicatorEngine, np.ndarray]]" = OrderedDict()
+_WORKER_SWEEPS = 4
+
+
+def _warm_up():
+    """Nothing to do: unpickling this function imports the sweep modules in the worker"""
+
+
+def _evaluate_chunk(
+    name: str,
+    shape: Tuple[int, int],
+    strategy: Any,
+    start: int,
+    grid: List[Dict[str, int]]
+) -> Tuple[int, List[Optional[Dict[str, Any]]]]:
+    engine, close = _sweep_engine(name, shape)
+    # Compact like the indicator cache, so results match the in-process optimizer exactly
+    series = {spec.name: compact(engine.compute_spec(spec)) for spec in strategy.grid_specs(grid)}
+    return start, evaluate_grid(strategy, close, series, grid)
+
+
+def _sweep_engine(name: str, shape: Tuple[int, int]) -> Tuple[IndicatorEngine, np.ndarray]:
+    entry = _worker_sweeps.get(name)
+    if entry is not None:
+        _worker_sweeps.move_to_end(name)
+        return entry
+
+    # Copy the bars out so the block can be closed at once
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        bars = np.ndarray(shape, dtype=np.float64, buffer=block.buf).copy()
+    finally:
+        block.close()
+
+    high, low, close, volume = bars
+    entry = _worker_sweeps[name] = (IndicatorEngine(high, low, close, volume), close)
+    while len(_worker_sweeps) > _WORKER_SWEEPS:
+        _worker_sweeps.popitem(last=False)
+    return entry
+
+
+# Global sweep executor instance
+sweep_executor = SweepExecutor()
@@ -0,0 +1,174 @@
+import os
+import csv
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Tuple
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _SymbolTable:
+    """Immutable search structures built from one load of the symbol master"""
+
+    def __init__(self, entries: List[Dict[str, str]]):
+        self.entries = entries
+        # Sorted (key, entry id) lists answer prefix queries with two bisects
+        self.tickers: List[Tuple[str, int]] = sorted(
+            (entry["symbol"].lower(), i) for i, entry in enumerate(entries)
+        )
+        self.words: List[Tuple[str, int]] = sorted(
+            (word, i) for i, entry in enumerate(entries)
+            for word in set(WORD_PATTERN.findall(entry["name"].lower()))
+        )
+        self.trigrams: Dict[str, List[int]] = defaultdict(list)
+        for i, entry in enumerate(entries):
+            for gram in _trigrams(entry["symbol"].lower()) | _trigrams(entry["name"].lower()):
+                self.trigrams[gram].append(i)
+        self.gram_counts = [
+            len(_trigrams(entry["symbol"].lower()) | _trigrams(entry["name"].lower()))
+            for entry in entries
+        ]
+
+    @staticmethod
+    def prefix_matches(keys: List[Tuple[str, int]], prefix: str, limit: int) -> List[Tuple[str, int]]:
+        # Every key in [prefix, prefix + max char) starts with prefix; keep the earliest entries
+        start = bisect_left(keys, (prefix, -1))
+        end = bisect_left(keys, (prefix + "\uffff", -1), start)
+        return heapq.nsmallest(limit, keys[start:end], key=lambda item: item[1])
+
+
+class SymbolIndex:
+    """In-memory ticker and company-name index loaded from a local symbol master.
+
+    The master is a CSV with symbol, name, type and exchange columns. Lookups
+    rank exact tickers first, then ticker prefixes, company-name prefixes and
+    finally fuzzy trigram matches, without any network calls; equal scores
+    keep the master's row order, so it lists popular symbols first. A background
+    thread reloads the file when it changes and swaps in the new table in one
+    assignment, so searches never wait on a reload.
+    """
+
+    def __init__(self):
+        self.path = os.getenv("SYMBOL_MASTER_PATH", "./data/symbols.csv")
+        self.reload_seconds = float(os.getenv("SYMBOL_MASTER_RELOAD_SECONDS", "300"))
+        self._table: Optional[_SymbolTable] = None
+        self._mtime: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get ranked symbol matches for a ticker or company-name query"""
+        table = self._table or self.reload()
+        query = query.strip().lower()
+        if table is None or not query:
+            return []
+
+        scores: Dict[int, float] = {}
+
+        def add(i: int, score: float):
+            if score > scores.get(i, 0):
+                scores[i] = score
+
+        # Ticker prefixes; shorter tickers rank closer to the exact match
+        for key, i in table.prefix_matches(table.tickers, query, limit * 4):
+            add(i, 1000.0 if key == query else 800.0 - (len(key) - len(query)))
+
+        # Company-name word prefixes; the leading word ranks higher
+        for word in WORD_PATTERN.findall(query)[:1]:
+            if len(word) < 2 and len(query) > 1:
+                # "s&p" would otherwise match every name with an S-word
+                break
+            for _, i in table.prefix_matches(table.words, word, limit * 4):
+                name = table.entries[i]["name"].lower()
+                if name == query:
+                    add(i, 700.0)
+                else:
+                    add(i, 600.0 if name.startswith(query) else 500.0)
+
+        # Fuzzy fallback for typos, only when the exact paths come up short
+        if len(scores) < limit and len(query) >= 3:
+            grams = _trigrams(query)
+            overlap: Dict[int, int] = defaultdict(int)
+            for gram in grams:
+                for i in table.trigrams.get(gram, ()):
+                    overlap[i] += 1
+            for i, shared in overlap.items():
+                # Share of the query's trigrams found in the entry, with Jaccard
+                # similarity breaking ties in favour of shorter names
+                coverage = shared / len(grams)
+                if coverage >= 0.5:
+                    jaccard = shared / (len(grams) + table.gram_counts[i] - shared)
+                    add(i, 300.0 * coverage + 10.0 * jaccard)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [dict(table.entries[i], score=round(score, 2)) for i, score in ranked[:limit]]
+
+    def reload(self, force: bool = False) -> Optional[_SymbolTable]:
+        """Rebuild the index if the master file changed (or always when force is set)"""
+        with self._load_lock:
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                if self._table is None:
+                    print(f"Symbol master not found at {self.path}")
+                return self._table
+
+            if force or mtime != self._mtime or self._table is None:
+                try:
+                    table = _SymbolTable(self._read(self.path))
+                    self._table = table
+                    self._mtime = mtime
+                except Exception as e:
+                    print(f"Error loading symbol master: {e}")
+            return self._table
+
+    def start_auto_reload(self):
+        """Start the background thread that picks up master file changes"""
+        if self._thread is not None or self.reload_seconds <= 0:
+            return
+        self._thread = threading.Thread(target=self._reload_loop, name="symbol-index-reload", daemon=True)
+        self._thread.start()
+
+    def stop_auto_reload(self):
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the loaded master size and source"""
+        table = self._table
+        return {
+            "path": self.path,
+            "symbols": len(table.entries) if table else 0,
+            "loaded": table is not None
+        }
+
+    def _reload_loop(self):
+        while not self._stop.wait(self.reload_seconds):
+            self.reload()
+
+    def _read(self, path: str) -> List[Dict[str, str]]:
+        entries = []
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                symbol = (row.get("symbol") or "").strip().upper()
+                if not symbol:
+                    continue
+                entries.append({
+                    "symbol": symbol,
+                    "name": (row.get("name") or symbol).strip(),
+                    "type": (row.get("type") or "stock").strip(),
+                    "exchange": (row.get("exchange") or "").strip()
+                })
+        return entries
+
+
+# Global symbol index instance
+symbol_index = SymbolIndex()
@@ -1,15 +1,26 @@
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 
+from services.indicator_cache import indicator_cache
+from utils.backtest_engine import crossover_signal, evaluate_grid, parameter_grid, simulate_signal, summarize_grid, trade_list
+from utils.bar_frame import BarFrame, as_bars
+from utils.indicator_engine import IndicatorSpec
+
 class MACDStrategy:
     def __init__(self):
         self.name = "MACD Strategy"
         self.description = "Buy when MACD line crosses above signal line, sell when it crosses below"
+        # Values optimize() tries by default, and how far the signal moves on a crossover
+        self.parameter_ranges = {
+            "fast_period": range(8, 17, 2),
+            "slow_period": range(20, 31, 2),
+            "signal_period": range(7, 12, 1)
+        }
+        self.signal_step = 2
     
-    def backtest(self, data: pd.DataFrame, parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
+    def backtest(self, data: Union[BarFrame, pd.DataFrame], parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
         """Run backtest for MACD strategy"""
         try:
             # Default parameters
@@ -17,95 +28,23 @@ class MACDStrategy:
             slow_period = parameters.get("slow_period", 26)
             signal_period = parameters.get("signal_period", 9)
             
-            # Calculate MACD
-            macd = ta.trend.MACD(data['Close'], window_fast=fast_period, window_slow=slow_period, window_sign=signal_period)
-            data['macd'] = macd.macd()
-            data['macd_signal'] = macd.macd_signal()
-            data['macd_histogram'] = macd.macd_diff()
-            
-            # Generate signals
-            data['signal'] = 0
-            data.loc[data['macd'] > data['macd_signal'], 'signal'] = 1  # Buy signal
-            data.loc[data['macd'] < data['macd_signal'], 'signal'] = -1  # Sell signal
-            
-            # Calculate position changes
-            data['position_change'] = data['signal'].diff()
+            # Calculate MACD (the bars are shared read-only, so series stay local)
+            bars = as_bars(data)
+            macd = indicator_cache.indicator(bars, "macd", fast=fast_period, slow=slow_period, signal=signal_period)
             
-            # Initialize variables
-            position = 0
-            cash = 10000  # Starting capital
-            shares = 0
-            trades = []
-            equity_curve = [cash]
+            # Generate signals: 1 while MACD is above its signal line, -1 while below
+            signal = crossover_signal(macd["macd"], macd["signal"])
             
-            # Simulate trading
-            for i in range(1, len(data)):
-                current_price = data['Close'].iloc[i]
-                current_date = data.index[i]
-                current_macd = data['macd'].iloc[i]
-                current_signal = data['macd_signal'].iloc[i]
-                
-                # Buy signal
-                if data['position_change'].iloc[i] == 2:  # Signal changed from -1 to 1
-                    if position == 0:  # Not currently holding
-                        shares = cash / current_price
-                        cash = 0
-                        position = 1
-                        trades.append({
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "action": "BUY",
-                            "price": current_price,
-                            "shares": shares,
-                            "value": shares * current_price,
-                            "pnl": 0,
-                            "macd": current_macd,
-                            "signal": current_signal
-                        })
-                
-                # Sell signal
-                elif data['position_change'].iloc[i] == -2:  # Signal changed from 1 to -1
-                    if position == 1:  # Currently holding
-                        cash = shares * current_price
-                        pnl = cash - trades[-1]["value"] if trades else 0
-                        trades.append({
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "action": "SELL",
-                            "price": current_price,
-                            "shares": shares,
-                            "value": cash,
-                            "pnl": pnl,
-                            "macd": current_macd,
-                            "signal": current_signal
-                        })
-                        shares = 0
-                        position = 0
-                
-                # Calculate current equity
-                current_equity = cash + (shares * current_price)
-                equity_curve.append(current_equity)
-            
-            # Close any remaining position at the end
-            if position == 1:
-                final_price = data['Close'].iloc[-1]
-                final_date = data.index[-1]
-                final_macd = data['macd'].iloc[-1]
-                final_signal = data['macd_signal'].iloc[-1]
-                cash = shares * final_price
-                pnl = cash - trades[-1]["value"] if trades else 0
-                trades.append({
-                    "date": final_date.strftime("%Y-%m-%d"),
-                    "action": "SELL",
-                    "price": final_price,
-                    "shares": shares,
-                    "value": cash,
-                    "pnl": pnl,
-                    "macd": final_macd,
-                    "signal": final_signal
-                })
+            # Simulate trading: buy when the signal flips from -1 to 1, sell when it flips back
+            run = simulate_signal(bars['Close'], signal, self.signal_step)
+            trades = trade_list(
+                bars.index, bars['Close'], run,
+                extras={"macd": macd["macd"], "signal": macd["signal"]}
+            )
             
             return {
                 "trades": trades,
-                "equity_curve": equity_curve,
+                "equity_curve": run.equity.tolist(),
                 "parameters": {
                     "fast_period": fast_period,
                     "slow_period": slow_period,
@@ -116,68 +55,44 @@ class MACDStrategy:
         except Exception as e:
             raise Exception(f"Error in MACD backtest: {e}")
     
-    def optimize(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def optimize(self, data: Union[BarFrame, pd.DataFrame], ranges: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Optimize MACD parameters"""
         try:
-            best_sharpe = -np.inf
-            best_params = {}
-            results = []
-            
-            # Test different parameter combinations
-            fast_periods = range(8, 17, 2)
-            slow_periods = range(20, 31, 2)
-            signal_periods = range(7, 12, 1)
-            
-            for fast_period in fast_periods:
-                for slow_period in slow_periods:
-                    for signal_period in signal_periods:
-                        if fast_period >= slow_period:
-                            continue
-                        
-                        # Run backtest with these parameters
-                        backtest_result = self.backtest(data, {
-                            "fast_period": fast_period,
-                            "slow_period": slow_period,
-                            "signal_period": signal_period
-                        })
-                        
-                        # Calculate Sharpe ratio
-                        equity_curve = backtest_result["equity_curve"]
-                        if len(equity_curve) > 1:
-                            returns = [(equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1] 
-                                     for i in range(1, len(equity_curve))]
-                            
-                            if returns:
-                                sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
-                                
-                                result = {
-                                    "fast_period": fast_period,
-                                    "slow_period": slow_period,
-                                    "signal_period": signal_period,
-                                    "sharpe_ratio": sharpe,
-                                    "total_return": (equity_curve[-1] - equity_curve[0]) / equity_curve[0] if equity_curve[0] > 0 else 0,
-                                    "num_trades": len(backtest_result["trades"])
-                                }
-                                results.append(result)
-                                
-                                if sharpe > best_sharpe:
-                                    best_sharpe = sharpe
-                                    best_params = {
-                                        "fast_period": fast_period,
-                                        "slow_period": slow_period,
-                                        "signal_period": signal_period
-                                    }
-            
-            return {
-                "best_parameters": best_params,
-                "best_sharpe": best_sharpe,
-                "all_results": results
-            }
+            bars = as_bars(data)
+            grid = self.parameter_grid(ranges)
+            series = indicator_cache.compute_specs(bars, self.grid_specs(grid))
+            results = evaluate_grid(self, bars['Close'], series, grid)
+            return summarize_grid(results, self.parameter_ranges)
             
         except Exception as e:
             raise Exception(f"Error optimizing MACD strategy: {e}")
     
-    def get_signals(self, data: pd.DataFrame, parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
+    def parameter_grid(self, ranges: Optional[Dict[str, Any]] = None) -> List[Dict[str, int]]:
+        """(fast, slow, signal) combinations to optimize over, from the default ranges unless overridden"""
+        grid = parameter_grid(self.parameter_ranges, ranges)
+        return [params for params in grid if params["fast_period"] < params["slow_period"]]
+    
+    def grid_specs(self, grid: List[Dict[str, int]]) -> List[IndicatorSpec]:
+        """MACD and signal lines per grid point; computed by one engine, each fast and slow EMA is shared"""
+        specs = []
+        for params in grid:
+            key = self._grid_key(params)
+            args = (("fast", params["fast_period"]), ("signal", params["signal_period"]), ("slow", params["slow_period"]))
+            specs.append(IndicatorSpec(f"macd_{key}", "macd", args, "macd"))
+            specs.append(IndicatorSpec(f"signal_{key}", "macd", args, "signal"))
+        return specs
+    
+    def grid_signals(self, series: Dict[str, np.ndarray], grid: List[Dict[str, int]]) -> np.ndarray:
+        """Crossover signals of grid points, one row each, from their precomputed MACD lines"""
+        keys = [self._grid_key(params) for params in grid]
+        macd = np.stack([series[f"macd_{key}"] for key in keys])
+        signal = np.stack([series[f"signal_{key}"] for key in keys])
+        return crossover_signal(macd, signal)
+    
+    def _grid_key(self, params: Dict[str, int]) -> str:
+        return f"{params['fast_period']}_{params['slow_period']}_{params['signal_period']}"
+    
+    def get_signals(self, data: Union[BarFrame, pd.DataFrame], parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
         """Get current trading signals"""
         try:
             # Default parameters
@@ -186,16 +101,14 @@ class MACDStrategy:
             signal_period = parameters.get("signal_period", 9)
             
             # Calculate MACD
-            macd = ta.trend.MACD(data['Close'], window_fast=fast_period, window_slow=slow_period, window_sign=signal_period)
-            data['macd'] = macd.macd()
-            data['macd_signal'] = macd.macd_signal()
-            data['macd_histogram'] = macd.macd_diff()
+            bars = as_bars(data)
+            macd = indicator_cache.indicator(bars, "macd", fast=fast_period, slow=slow_period, signal=signal_period)
             
             # Get current values
-            current_price = data['Close'].iloc[-1]
-            current_macd = data['macd'].iloc[-1]
-            current_signal = data['macd_signal'].iloc[-1]
-            current_histogram = data['macd_histogram'].iloc[-1]
+            current_price = bars['Close'][-1]
+            current_macd = macd["macd"][-1]
+            current_signal = macd["signal"][-1]
+            current_histogram = macd["histogram"][-1]
             
             # Determine signal
             if current_macd > current_signal:
@@ -1,98 +1,46 @@
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 
+from services.indicator_cache import indicator_cache
+from utils.backtest_engine import crossover_signal, evaluate_grid, parameter_grid, simulate_signal, summarize_grid, trade_list
+from utils.bar_frame import BarFrame, as_bars
+from utils.indicator_engine import IndicatorSpec
+
 class MovingAverageStrategy:
     def __init__(self):
         self.name = "Moving Average Crossover"
         self.description = "Buy when short MA crosses above long MA, sell when it crosses below"
+        # Values optimize() tries by default, and how far the signal moves on a crossover
+        self.parameter_ranges = {
+            "short_period": range(5, 51, 5),
+            "long_period": range(20, 201, 10)
+        }
+        self.signal_step = 2
     
-    def backtest(self, data: pd.DataFrame, parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
+    def backtest(self, data: Union[BarFrame, pd.DataFrame], parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
         """Run backtest for moving average crossover strategy"""
         try:
             # Default parameters
             short_period = parameters.get("short_period", 20)
             long_period = parameters.get("long_period", 50)
             
-            # Calculate moving averages
-            data['sma_short'] = ta.trend.sma_indicator(data['Close'], window=short_period)
-            data['sma_long'] = ta.trend.sma_indicator(data['Close'], window=long_period)
-            
-            # Generate signals
-            data['signal'] = 0
-            data.loc[data['sma_short'] > data['sma_long'], 'signal'] = 1  # Buy signal
-            data.loc[data['sma_short'] < data['sma_long'], 'signal'] = -1  # Sell signal
-            
-            # Calculate position changes
-            data['position_change'] = data['signal'].diff()
+            # Calculate moving averages (the bars are shared read-only, so series stay local)
+            bars = as_bars(data)
+            sma_short = indicator_cache.indicator(bars, "sma", window=short_period)
+            sma_long = indicator_cache.indicator(bars, "sma", window=long_period)
             
-            # Initialize variables
-            position = 0
-            cash = 10000  # Starting capital
-            shares = 0
-            trades = []
-            equity_curve = [cash]
+            # Generate signals: 1 while the short MA is above the long MA, -1 while below
+            signal = crossover_signal(sma_short, sma_long)
             
-            # Simulate trading
-            for i in range(1, len(data)):
-                current_price = data['Close'].iloc[i]
-                current_date = data.index[i]
-                
-                # Buy signal
-                if data['position_change'].iloc[i] == 2:  # Signal changed from -1 to 1
-                    if position == 0:  # Not currently holding
-                        shares = cash / current_price
-                        cash = 0
-                        position = 1
-                        trades.append({
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "action": "BUY",
-                            "price": current_price,
-                            "shares": shares,
-                            "value": shares * current_price,
-                            "pnl": 0
-                        })
-                
-                # Sell signal
-                elif data['position_change'].iloc[i] == -2:  # Signal changed from 1 to -1
-                    if position == 1:  # Currently holding
-                        cash = shares * current_price
-                        pnl = cash - trades[-1]["value"] if trades else 0
-                        trades.append({
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "action": "SELL",
-                            "price": current_price,
-                            "shares": shares,
-                            "value": cash,
-                            "pnl": pnl
-                        })
-                        shares = 0
-                        position = 0
-                
-                # Calculate current equity
-                current_equity = cash + (shares * current_price)
-                equity_curve.append(current_equity)
-            
-            # Close any remaining position at the end
-            if position == 1:
-                final_price = data['Close'].iloc[-1]
-                final_date = data.index[-1]
-                cash = shares * final_price
-                pnl = cash - trades[-1]["value"] if trades else 0
-                trades.append({
-                    "date": final_date.strftime("%Y-%m-%d"),
-                    "action": "SELL",
-                    "price": final_price,
-                    "shares": shares,
-                    "value": cash,
-                    "pnl": pnl
-                })
+            # Simulate trading: buy when the signal flips from -1 to 1, sell when it flips back
+            run = simulate_signal(bars['Close'], signal, self.signal_step)
+            trades = trade_list(bars.index, bars['Close'], run)
             
             return {
                 "trades": trades,
-                "equity_curve": equity_curve,
+                "equity_curve": run.equity.tolist(),
                 "parameters": {
                     "short_period": short_period,
                     "long_period": long_period
@@ -102,63 +50,35 @@ class MovingAverageStrategy:
         except Exception as e:
             raise Exception(f"Error in moving average backtest: {e}")
     
-    def optimize(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def optimize(self, data: Union[BarFrame, pd.DataFrame], ranges: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Optimize moving average parameters"""
         try:
-            best_sharpe = -np.inf
-            best_params = {}
-            results = []
-            
-            # Test different parameter combinations
-            short_periods = range(5, 51, 5)
-            long_periods = range(20, 201, 10)
-            
-            for short_period in short_periods:
-                for long_period in long_periods:
-                    if short_period >= long_period:
-                        continue
-                    
-                    # Run backtest with these parameters
-                    backtest_result = self.backtest(data, {
-                        "short_period": short_period,
-                        "long_period": long_period
-                    })
-                    
-                    # Calculate Sharpe ratio
-                    equity_curve = backtest_result["equity_curve"]
-                    if len(equity_curve) > 1:
-                        returns = [(equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1] 
-                                 for i in range(1, len(equity_curve))]
-                        
-                        if returns:
-                            sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
-                            
-                            result = {
-                                "short_period": short_period,
-                                "long_period": long_period,
-                                "sharpe_ratio": sharpe,
-                                "total_return": (equity_curve[-1] - equity_curve[0]) / equity_curve[0] if equity_curve[0] > 0 else 0,
-                                "num_trades": len(backtest_result["trades"])
-                            }
-                            results.append(result)
-                            
-                            if sharpe > best_sharpe:
-                                best_sharpe = sharpe
-                                best_params = {
-                                    "short_period": short_period,
-                                    "long_period": long_period
-                                }
-            
-            return {
-                "best_parameters": best_params,
-                "best_sharpe": best_sharpe,
-                "all_results": results
-            }
+            bars = as_bars(data)
+            grid = self.parameter_grid(ranges)
+            series = indicator_cache.compute_specs(bars, self.grid_specs(grid))
+            results = evaluate_grid(self, bars['Close'], series, grid)
+            return summarize_grid(results, self.parameter_ranges)
             
         except Exception as e:
             raise Exception(f"Error optimizing moving average strategy: {e}")
     
-    def get_signals(self, data: pd.DataFrame, parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
+    def parameter_grid(self, ranges: Optional[Dict[str, Any]] = None) -> List[Dict[str, int]]:
+        """(short, long) pairs to optimize over, from the default ranges unless overridden"""
+        grid = parameter_grid(self.parameter_ranges, ranges)
+        return [params for params in grid if params["short_period"] < params["long_period"]]
+    
+    def grid_specs(self, grid: List[Dict[str, int]]) -> List[IndicatorSpec]:
+        """Every distinct SMA a grid needs, so each is computed once"""
+        windows = sorted({params["short_period"] for params in grid} | {params["long_period"] for params in grid})
+        return [IndicatorSpec(f"sma_{window}", "sma", (("window", window),)) for window in windows]
+    
+    def grid_signals(self, series: Dict[str, np.ndarray], grid: List[Dict[str, int]]) -> np.ndarray:
+        """Crossover signals of grid points, one row each, from the grid's shared SMAs"""
+        short = np.stack([series[f"sma_{params['short_period']}"] for params in grid])
+        long = np.stack([series[f"sma_{params['long_period']}"] for params in grid])
+        return crossover_signal(short, long)
+    
+    def get_signals(self, data: Union[BarFrame, pd.DataFrame], parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
         """Get current trading signals"""
         try:
             # Default parameters
@@ -166,13 +86,14 @@ class MovingAverageStrategy:
             long_period = parameters.get("long_period", 50)
             
             # Calculate moving averages
-            data['sma_short'] = ta.trend.sma_indicator(data['Close'], window=short_period)
-            data['sma_long'] = ta.trend.sma_indicator(data['Close'], window=long_period)
+            bars = as_bars(data)
+            sma_short = indicator_cache.indicator(bars, "sma", window=short_period)
+            sma_long = indicator_cache.indicator(bars, "sma", window=long_period)
             
             # Get current values
-            current_price = data['Close'].iloc[-1]
-            current_sma_short = data['sma_short'].iloc[-1]
-            current_sma_long = data['sma_long'].iloc[-1]
+            current_price = bars['Close'][-1]
+            current_sma_short = sma_short[-1]
+            current_sma_long = sma_long[-1]
             
             # Determine signal
             if current_sma_short > current_sma_long:
@@ -1,15 +1,26 @@
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 
+from services.indicator_cache import indicator_cache
+from utils.backtest_engine import evaluate_grid, parameter_grid, simulate_signal, summarize_grid, trade_list
+from utils.bar_frame import BarFrame, as_bars
+from utils.indicator_engine import IndicatorSpec
+
 class RSIStrategy:
     def __init__(self):
         self.name = "RSI Strategy"
         self.description = "Buy when RSI is oversold (< 30), sell when overbought (> 70)"
+        # Values optimize() tries by default, and how far the signal moves on a trade
+        self.parameter_ranges = {
+            "rsi_period": range(10, 21, 2),
+            "oversold": range(20, 41, 5),
+            "overbought": range(60, 81, 5)
+        }
+        self.signal_step = 1
     
-    def backtest(self, data: pd.DataFrame, parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
+    def backtest(self, data: Union[BarFrame, pd.DataFrame], parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
         """Run backtest for RSI strategy"""
         try:
             # Default parameters
@@ -17,87 +28,23 @@ class RSIStrategy:
             oversold = parameters.get("oversold", 30)
             overbought = parameters.get("overbought", 70)
             
-            # Calculate RSI
-            data['rsi'] = ta.momentum.rsi(data['Close'], window=rsi_period)
-            
-            # Generate signals
-            data['signal'] = 0
-            data.loc[data['rsi'] < oversold, 'signal'] = 1  # Buy signal (oversold)
-            data.loc[data['rsi'] > overbought, 'signal'] = -1  # Sell signal (overbought)
-            
-            # Calculate position changes
-            data['position_change'] = data['signal'].diff()
+            # Calculate RSI (the bars are shared read-only, so series stay local)
+            bars = as_bars(data)
+            rsi = indicator_cache.indicator(bars, "rsi", window=rsi_period)
             
-            # Initialize variables
-            position = 0
-            cash = 10000  # Starting capital
-            shares = 0
-            trades = []
-            equity_curve = [cash]
+            # Generate signals: 1 while oversold, -1 while overbought
+            signal = self._signal(rsi, oversold, overbought)
             
-            # Simulate trading
-            for i in range(1, len(data)):
-                current_price = data['Close'].iloc[i]
-                current_date = data.index[i]
-                current_rsi = data['rsi'].iloc[i]
-                
-                # Buy signal (oversold)
-                if data['position_change'].iloc[i] == 1:  # Signal changed from 0 to 1
-                    if position == 0:  # Not currently holding
-                        shares = cash / current_price
-                        cash = 0
-                        position = 1
-                        trades.append({
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "action": "BUY",
-                            "price": current_price,
-                            "shares": shares,
-                            "value": shares * current_price,
-                            "pnl": 0,
-                            "rsi": current_rsi
-                        })
-                
-                # Sell signal (overbought)
-                elif data['position_change'].iloc[i] == -1:  # Signal changed from 0 to -1
-                    if position == 1:  # Currently holding
-                        cash = shares * current_price
-                        pnl = cash - trades[-1]["value"] if trades else 0
-                        trades.append({
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "action": "SELL",
-                            "price": current_price,
-                            "shares": shares,
-                            "value": cash,
-                            "pnl": pnl,
-                            "rsi": current_rsi
-                        })
-                        shares = 0
-                        position = 0
-                
-                # Calculate current equity
-                current_equity = cash + (shares * current_price)
-                equity_curve.append(current_equity)
-            
-            # Close any remaining position at the end
-            if position == 1:
-                final_price = data['Close'].iloc[-1]
-                final_date = data.index[-1]
-                final_rsi = data['rsi'].iloc[-1]
-                cash = shares * final_price
-                pnl = cash - trades[-1]["value"] if trades else 0
-                trades.append({
-                    "date": final_date.strftime("%Y-%m-%d"),
-                    "action": "SELL",
-                    "price": final_price,
-                    "shares": shares,
-                    "value": cash,
-                    "pnl": pnl,
-                    "rsi": final_rsi
-                })
+            # Simulate trading: buy when the signal steps up by one (into oversold or out of overbought), sell when it steps down
+            run = simulate_signal(bars['Close'], signal, self.signal_step)
+            trades = trade_list(
+                bars.index, bars['Close'], run,
+                extras={"rsi": rsi}
+            )
             
             return {
                 "trades": trades,
-                "equity_curve": equity_curve,
+                "equity_curve": run.equity.tolist(),
                 "parameters": {
                     "rsi_period": rsi_period,
                     "oversold": oversold,
@@ -108,68 +55,36 @@ class RSIStrategy:
         except Exception as e:
             raise Exception(f"Error in RSI backtest: {e}")
     
-    def optimize(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def optimize(self, data: Union[BarFrame, pd.DataFrame], ranges: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Optimize RSI parameters"""
         try:
-            best_sharpe = -np.inf
-            best_params = {}
-            results = []
-            
-            # Test different parameter combinations
-            rsi_periods = range(10, 21, 2)
-            oversold_levels = range(20, 41, 5)
-            overbought_levels = range(60, 81, 5)
-            
-            for rsi_period in rsi_periods:
-                for oversold in oversold_levels:
-                    for overbought in overbought_levels:
-                        if oversold >= overbought:
-                            continue
-                        
-                        # Run backtest with these parameters
-                        backtest_result = self.backtest(data, {
-                            "rsi_period": rsi_period,
-                            "oversold": oversold,
-                            "overbought": overbought
-                        })
-                        
-                        # Calculate Sharpe ratio
-                        equity_curve = backtest_result["equity_curve"]
-                        if len(equity_curve) > 1:
-                            returns = [(equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1] 
-                                     for i in range(1, len(equity_curve))]
-                            
-                            if returns:
-                                sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
-                                
-                                result = {
-                                    "rsi_period": rsi_period,
-                                    "oversold": oversold,
-                                    "overbought": overbought,
-                                    "sharpe_ratio": sharpe,
-                                    "total_return": (equity_curve[-1] - equity_curve[0]) / equity_curve[0] if equity_curve[0] > 0 else 0,
-                                    "num_trades": len(backtest_result["trades"])
-                                }
-                                results.append(result)
-                                
-                                if sharpe > best_sharpe:
-                                    best_sharpe = sharpe
-                                    best_params = {
-                                        "rsi_period": rsi_period,
-                                        "oversold": oversold,
-                                        "overbought": overbought
-                                    }
-            
-            return {
-                "best_parameters": best_params,
-                "best_sharpe": best_sharpe,
-                "all_results": results
-            }
+            bars = as_bars(data)
+            grid = self.parameter_grid(ranges)
+            series = indicator_cache.compute_specs(bars, self.grid_specs(grid))
+            results = evaluate_grid(self, bars['Close'], series, grid)
+            return summarize_grid(results, self.parameter_ranges)
             
         except Exception as e:
             raise Exception(f"Error optimizing RSI strategy: {e}")
     
-    def get_signals(self, data: pd.DataFrame, parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
+    def parameter_grid(self, ranges: Optional[Dict[str, Any]] = None) -> List[Dict[str, int]]:
+        """(period, oversold, overbought) combinations to optimize over, from the default ranges unless overridden"""
+        grid = parameter_grid(self.parameter_ranges, ranges)
+        return [params for params in grid if params["oversold"] < params["overbought"]]
+    
+    def grid_specs(self, grid: List[Dict[str, int]]) -> List[IndicatorSpec]:
+        """One RSI per distinct period, shared by every threshold pair"""
+        periods = sorted({params["rsi_period"] for params in grid})
+        return [IndicatorSpec(f"rsi_{period}", "rsi", (("window", period),)) for period in periods]
+    
+    def grid_signals(self, series: Dict[str, np.ndarray], grid: List[Dict[str, int]]) -> np.ndarray:
+        """Oversold/overbought signals of grid points, one row each, from the grid's shared RSI series"""
+        rsi = np.stack([series[f"rsi_{params['rsi_period']}"] for params in grid])
+        oversold = np.array([params["oversold"] for params in grid])[:, None]
+        overbought = np.array([params["overbought"] for params in grid])[:, None]
+        return self._signal(rsi, oversold, overbought)
+    
+    def get_signals(self, data: Union[BarFrame, pd.DataFrame], parameters: Dict[str, Any] = {}) -> Dict[str, Any]:
         """Get current trading signals"""
         try:
             # Default parameters
@@ -178,11 +93,12 @@ class RSIStrategy:
             overbought = parameters.get("overbought", 70)
             
             # Calculate RSI
-            data['rsi'] = ta.momentum.rsi(data['Close'], window=rsi_period)
+            bars = as_bars(data)
+            rsi = indicator_cache.indicator(bars, "rsi", window=rsi_period)
             
             # Get current values
-            current_price = data['Close'].iloc[-1]
-            current_rsi = data['rsi'].iloc[-1]
+            current_price = bars['Close'][-1]
+            current_rsi = rsi[-1]
             
             # Determine signal
             if current_rsi < oversold:
@@ -210,4 +126,12 @@ class RSIStrategy:
             }
             
         except Exception as e:
-            raise Exception(f"Error getting RSI signals: {e}") 
\ No newline at end of file
+            raise Exception(f"Error getting RSI signals: {e}")
+    
+    def _signal(self, rsi: Any, oversold: Any, overbought: Any) -> np.ndarray:
+        """1 where RSI is below the oversold level, -1 where it is above the overbought level, else 0 (levels broadcast against rsi)"""
+        rsi = np.asarray(rsi)
+        signal = np.zeros(rsi.shape, dtype=np.int8)
+        signal[rsi < oversold] = 1
+        signal[rsi > overbought] = -1
+        return signal
\ No newline at end of file
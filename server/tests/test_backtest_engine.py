@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.macd_strategy import MACDStrategy
+from strategies.moving_average import MovingAverageStrategy
+from strategies.rsi_strategy import RSIStrategy
+from utils.backtest_engine import (
+    INITIAL_CASH, evaluate_grid, grid_table, simulate, simulate_batch, simulate_signals
+)
+from utils.indicator_engine import IndicatorEngine
+
+
+def reference_backtest(close, buy, sell):
+    """The strategies' original bar-by-bar loop: all-in buys, full sells, an open position sold on the last bar"""
+    position = 0
+    cash = INITIAL_CASH
+    shares = 0
+    trades = []
+    equity = [cash]
+    for i in range(1, len(close)):
+        price = close[i]
+        if buy[i]:
+            if position == 0:
+                shares = cash / price
+                cash = 0
+                position = 1
+                trades.append({"bar": i, "shares": shares, "value": shares * price})
+        elif sell[i]:
+            if position == 1:
+                cash = shares * price
+                trades.append({"bar": i, "shares": shares, "value": cash})
+                shares = 0
+                position = 0
+        equity.append(cash + shares * price)
+    if position == 1:
+        cash = shares * close[-1]
+        trades.append({"bar": len(close) - 1, "shares": shares, "value": cash})
+    return trades, equity
+
+
+def reference_metrics(trades, equity):
+    """Sharpe ratio, total return and trade count as the original optimize() loops computed them"""
+    returns = [(equity[i] - equity[i - 1]) / equity[i - 1] for i in range(1, len(equity))]
+    sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
+    total_return = (equity[-1] - equity[0]) / equity[0] if equity[0] > 0 else 0
+    return sharpe, total_return, len(trades)
+
+
+def make_close(n: int, seed: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def random_flags(runs: int, n: int, seed: int = 9):
+    rng = np.random.default_rng(seed)
+    buy = rng.random((runs, n)) < 0.2
+    sell = rng.random((runs, n)) < 0.2
+    # Edge rows: never trade, flag every bar both ways, buy only, and sell before any buy
+    if runs >= 4 and n:
+        buy[0], sell[0] = False, False
+        buy[1], sell[1] = True, True
+        buy[2], sell[2] = True, False
+        buy[3], sell[3] = False, True
+    return buy, sell
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 5, 64, 500])
+def test_simulate_batch_matches_reference_loop(n):
+    close = make_close(n)
+    buy, sell = random_flags(12, n)
+    batch = simulate_batch(close, buy, sell)
+
+    assert batch.equity.shape == (12, max(n, 1))
+    for row in range(12):
+        trades, equity = reference_backtest(close, buy[row], sell[row])
+        count = batch.trades[row]
+        assert 2 * count == len(trades)
+        np.testing.assert_array_equal(batch.entries[row, :count], [trade["bar"] for trade in trades[::2]])
+        np.testing.assert_array_equal(batch.exits[row, :count], [trade["bar"] for trade in trades[1::2]])
+        np.testing.assert_array_equal(batch.shares[row, :count], [trade["shares"] for trade in trades[::2]])
+        np.testing.assert_array_equal(batch.proceeds[row, :count], [trade["value"] for trade in trades[1::2]])
+        np.testing.assert_array_equal(batch.equity[row], equity)
+
+        single = simulate(close, buy[row], sell[row])
+        np.testing.assert_array_equal(single.equity, equity)
+        np.testing.assert_array_equal(single.entries, batch.entries[row, :count])
+
+
+STRATEGIES = {
+    "moving_average": (MovingAverageStrategy(), {"short_period": [1, 2, 5], "long_period": [2, 3, 20]}),
+    "rsi": (RSIStrategy(), {"rsi_period": [2, 14], "oversold": [30, 45], "overbought": [55, 70]}),
+    "macd": (MACDStrategy(), None),
+}
+
+
+def grid_inputs(name: str, n: int):
+    strategy, ranges = STRATEGIES[name]
+    close = make_close(n, seed=n)
+    grid = strategy.parameter_grid(ranges)
+    engine = IndicatorEngine(None, None, close)
+    series = {spec.name: engine.compute_spec(spec) for spec in strategy.grid_specs(grid)}
+    return strategy, close, series, grid
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+@pytest.mark.parametrize("n", [2, 3, 40, 300])
+def test_grid_table_matches_per_combination_backtests(name, n):
+    strategy, close, series, grid = grid_inputs(name, n)
+    table = grid_table(strategy, close, series, grid)
+
+    for row, params in enumerate(grid):
+        signal = strategy.grid_signals(series, [params])[0].astype(float)
+        change = np.diff(signal, prepend=np.nan)
+        trades, equity = reference_backtest(close, change == strategy.signal_step, change == -strategy.signal_step)
+        sharpe, total_return, num_trades = reference_metrics(trades, equity)
+        for column in strategy.parameter_ranges:
+            assert table[column][row] == params[column]
+        np.testing.assert_allclose(table["sharpe_ratio"][row], sharpe, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(table["total_return"][row], total_return, rtol=1e-12, atol=1e-12)
+        assert table["num_trades"][row] == num_trades
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+@pytest.mark.parametrize("n", [2, 41, 300])
+def test_grid_table_chunks_do_not_change_results(name, n):
+    strategy, close, series, grid = grid_inputs(name, n)
+    whole = grid_table(strategy, close, series, grid, max_cells=n * len(grid))
+    # One row per chunk, chunks that do not divide the grid, and a last chunk of one row
+    for max_cells in (1, 7 * n, n * (len(grid) - 1), n * len(grid) + n - 1):
+        chunked = grid_table(strategy, close, series, grid, max_cells=max_cells)
+        assert chunked.keys() == whole.keys()
+        for column, values in whole.items():
+            np.testing.assert_array_equal(chunked[column], values, err_msg=f"{column} max_cells={max_cells}")
+
+
+@pytest.mark.parametrize("n", [0, 1])
+def test_too_few_bars_score_nothing(n):
+    strategy, close, series, grid = grid_inputs("moving_average", n)
+    table = grid_table(strategy, close, series, grid)
+    assert all(len(values) == 0 for values in table.values())
+    assert evaluate_grid(strategy, close, series, grid) == [None] * len(grid)
+
+
+def test_signals_on_a_single_bar_series():
+    batch = simulate_signals(make_close(1), np.ones((3, 1), dtype=np.int8), 2)
+    np.testing.assert_array_equal(batch.trades, [0, 0, 0])
+    np.testing.assert_array_equal(batch.equity, np.full((3, 1), float(INITIAL_CASH)))
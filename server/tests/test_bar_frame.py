@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.macd_strategy import MACDStrategy
+from strategies.moving_average import MovingAverageStrategy
+from strategies.rsi_strategy import RSIStrategy
+from utils.bar_frame import BarFrame, as_bars
+
+
+def make_frame(rows: int = 120) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    frame = pd.DataFrame({
+        "Open": close + rng.normal(0, 0.2, rows),
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": rng.integers(1, 1000, rows),
+    }, index=pd.bdate_range("2024-01-02", periods=rows, tz="America/New_York", name="Date"))
+    frame.attrs = {"symbol": "AAPL", "interval": "1d"}
+    return frame
+
+
+def test_columns_are_read_only_views_of_the_frame():
+    frame = make_frame()
+    source = {name: frame[name].to_numpy() for name in frame.columns}
+    bars = BarFrame.from_frame(frame)
+
+    assert bars.columns == list(frame.columns)
+    assert len(bars) == len(frame) and not bars.empty
+    assert bars.index is frame.index
+    for name in frame.columns:
+        assert np.shares_memory(bars[name], source[name])
+        assert not bars[name].flags.writeable
+        np.testing.assert_array_equal(bars[name], frame[name].to_numpy())
+
+    with pytest.raises(ValueError):
+        bars["Close"][0] = 0.0
+    with pytest.raises(ValueError):
+        bars["Volume"] += 1
+    np.testing.assert_array_equal(bars["Close"], frame["Close"].to_numpy())
+
+
+def test_float32_columns_are_widened():
+    frame = make_frame()
+    frame["Close"] = frame["Close"].astype(np.float32)
+    bars = BarFrame.from_frame(frame)
+    assert bars["Close"].dtype == np.float64
+    assert bars["Open"].dtype == np.float64
+    assert bars["Volume"].dtype == frame["Volume"].dtype
+    assert not bars["Close"].flags.writeable
+
+
+def test_wrapping_does_not_freeze_the_callers_arrays():
+    close = np.arange(5, dtype=np.float64)
+    bars = BarFrame(pd.RangeIndex(5), {"Close": close})
+    assert not bars["Close"].flags.writeable
+    close[0] = 10.0
+    assert close.flags.writeable
+
+
+def test_instances_are_immutable():
+    bars = BarFrame.from_frame(make_frame())
+    with pytest.raises(AttributeError):
+        bars.index = pd.RangeIndex(len(bars))
+    with pytest.raises(AttributeError):
+        bars.extra = 1
+    with pytest.raises(TypeError):
+        bars.attrs["symbol"] = "MSFT"
+    with pytest.raises(TypeError):
+        bars["Signal"] = np.zeros(len(bars))
+    assert bars.attrs["symbol"] == "AAPL"
+    assert "Close" in bars and "Signal" not in bars
+
+
+def test_mismatched_column_length():
+    with pytest.raises(ValueError):
+        BarFrame(pd.RangeIndex(3), {"Close": np.arange(4.0)})
+
+
+def test_to_frame_round_trips():
+    frame = make_frame()
+    bars = BarFrame.from_frame(frame)
+    round_trip = bars.to_frame()
+    pd.testing.assert_frame_equal(round_trip, frame)
+    assert round_trip.attrs == frame.attrs
+    assert as_bars(bars) is bars
+    assert as_bars(frame).fingerprint() == bars.fingerprint()
+
+
+def test_fingerprint():
+    frame = make_frame()
+    bars = BarFrame.from_frame(frame)
+    fingerprint = bars.fingerprint()
+    assert fingerprint == bars.fingerprint() == BarFrame.from_frame(frame.copy()).fingerprint()
+    # attrs and non-OHLCV columns are not part of the key
+    assert BarFrame.from_frame(frame.assign(Extra=1.0)).fingerprint() == fingerprint
+
+    changed = frame.copy()
+    changed.iloc[-1, changed.columns.get_loc("Close")] += 0.01
+    assert BarFrame.from_frame(changed).fingerprint() != fingerprint
+    shifted = frame.copy()
+    shifted.index = shifted.index + pd.Timedelta(days=1)
+    assert BarFrame.from_frame(shifted).fingerprint() != fingerprint
+    # The same instants in another unit hash the same
+    frame_us = frame.copy()
+    frame_us.index = frame_us.index.as_unit("us")
+    assert BarFrame.from_frame(frame_us).fingerprint() == fingerprint
+
+
+def test_empty():
+    bars = BarFrame.from_frame(make_frame().iloc[:0])
+    assert bars.empty and len(bars) == 0
+    assert BarFrame(pd.RangeIndex(3), {}).empty
+
+
+@pytest.mark.parametrize("strategy", [MovingAverageStrategy(), RSIStrategy(), MACDStrategy()])
+def test_strategies_run_on_shared_read_only_bars(strategy):
+    frame = make_frame(300)
+    bars = BarFrame.from_frame(frame)
+    fingerprint = bars.fingerprint()
+
+    first = strategy.backtest(bars)
+    signals = strategy.get_signals(bars)
+    assert strategy.backtest(bars) == first
+    assert first == strategy.backtest(frame)
+    assert signals is not None
+    # Nothing was written into the shared arrays
+    pd.testing.assert_frame_equal(bars.to_frame(), frame)
+    assert BarFrame.from_frame(bars.to_frame()).fingerprint() == fingerprint
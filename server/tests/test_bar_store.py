@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from providers.base import MarketDataProvider, slice_bars
+from services.bar_store import BarStore
+from services.provider_service import provider_router
+
+TZ = "America/New_York"
+
+
+class RecordedProvider(MarketDataProvider):
+    """Serves a fixed daily history and records every request"""
+
+    name = "recorded"
+
+    def __init__(self):
+        now = pd.Timestamp.now(tz=TZ).normalize()
+        dates = pd.bdate_range(now - pd.DateOffset(years=3), now, tz=TZ, name="Date").as_unit("ns")
+        close = 100 + np.arange(len(dates), dtype=np.float64)
+        self.bars = pd.DataFrame(
+            {"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.arange(len(dates)) + 100},
+            index=dates
+        )
+        self.calls = []
+
+    def get_history(self, symbol, period=None, interval="1d", start=None, end=None):
+        self.calls.append({"period": period, "start": start, "end": end})
+        return slice_bars(self.bars, period, start, end)
+
+    def get_quote(self, symbol):
+        return None
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    provider = RecordedProvider()
+    monkeypatch.setattr(provider_router, "providers", [provider])
+    monkeypatch.setattr(provider_router, "_health", {provider.name: {
+        "calls": 0, "failures": 0, "consecutive_failures": 0, "open_until": 0.0, "avg_latency": None
+    }})
+    bar_store = BarStore()
+    bar_store.root = str(tmp_path)
+    bar_store.refresh_seconds = 3600
+    return bar_store, provider
+
+
+def assert_bars_equal(actual, expected):
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_freq=False, check_names=False)
+
+
+def test_repeat_requests_are_served_from_disk(store, tmp_path):
+    bar_store, provider = store
+    first = bar_store.get_history("AAPL", period="1mo")
+    assert len(provider.calls) == 1
+    assert_bars_equal(first, slice_bars(provider.bars, "1mo"))
+
+    again = bar_store.get_history("AAPL", period="1mo")
+    assert len(provider.calls) == 1
+    assert_bars_equal(again, first)
+
+    # A new store on the same directory reads what the first one wrote
+    reopened = BarStore()
+    reopened.root = str(tmp_path)
+    assert_bars_equal(reopened.get_history("AAPL", period="1mo"), first)
+    assert len(provider.calls) == 1
+
+
+def test_wider_periods_fetch_only_the_head_gap(store):
+    bar_store, provider = store
+    bar_store.get_history("AAPL", period="1mo")
+    stored_from = slice_bars(provider.bars, "1mo").index[0]
+
+    year = bar_store.get_history("AAPL", period="1y")
+    assert len(provider.calls) == 2
+    head = provider.calls[-1]
+    assert head["period"] is None
+    assert pd.Timestamp(head["end"]) == stored_from
+    assert pd.Timestamp(head["start"]) <= slice_bars(provider.bars, "1y").index[0]
+    assert_bars_equal(year, slice_bars(provider.bars, "1y"))
+
+    # Narrower periods inside the stored range cost nothing
+    assert_bars_equal(bar_store.get_history("AAPL", period="6mo"), slice_bars(provider.bars, "6mo"))
+    assert len(provider.calls) == 2
+
+    everything = bar_store.get_history("AAPL", period="max")
+    assert provider.calls[-1]["period"] == "max"
+    assert_bars_equal(everything, provider.bars)
+
+
+def test_stale_tail_fetches_only_new_bars(store):
+    bar_store, provider = store
+    bar_store.get_history("AAPL", period="3mo")
+    last = provider.bars.index[-1]
+
+    # A corrected last bar and a new one arrive upstream
+    next_day = last + pd.offsets.BDay(1)
+    provider.bars.loc[last, "Close"] = -1.0
+    provider.bars.loc[next_day] = [1.0, 2.0, 0.5, 1.5, 7]
+    bar_store.refresh_seconds = 0
+
+    bars = bar_store.get_history("AAPL", period="3mo", end=(next_day + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))
+    tail = provider.calls[-1]
+    assert len(provider.calls) == 2
+    assert pd.Timestamp(tail["start"]) == last
+    assert bars.index[-1] == next_day
+    assert bars.loc[last, "Close"] == -1.0
+    assert bars["Volume"].iloc[-1] == 7
+
+
+def test_unknown_symbols_store_nothing(store, tmp_path):
+    bar_store, provider = store
+    provider.bars = provider.bars.iloc[:0]
+    assert bar_store.get_history("NOPE", period="1mo").empty
+    assert not any(tmp_path.rglob("meta.json"))
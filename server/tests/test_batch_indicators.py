@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from utils.indicator_engine import IndicatorEngine, indicator_specs
+from utils.indicators import align_bars, calculate_batch_indicators
+
+
+def make_bars(dates: pd.DatetimeIndex, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    return pd.DataFrame({
+        "Open": close,
+        "High": close * (1 + rng.uniform(0, 0.02, len(dates))),
+        "Low": close * (1 - rng.uniform(0, 0.02, len(dates))),
+        "Close": close,
+        "Volume": rng.integers(1_000, 100_000, len(dates)).astype(float)
+    }, index=dates)
+
+
+def single(frame: pd.DataFrame):
+    engine = IndicatorEngine(frame["High"].to_numpy(), frame["Low"].to_numpy(), frame["Close"].to_numpy(), frame["Volume"].to_numpy())
+    return engine.compute_specs(indicator_specs())
+
+
+def test_mixed_calendars_match_single_symbol_results():
+    days = pd.date_range("2023-01-01", periods=300, freq="D")
+    weekdays = days[days.dayofweek < 5]
+    holiday = weekdays.delete(120)
+    frames = {
+        "STOCK": make_bars(weekdays, 1),
+        "CRYPTO": make_bars(days, 2),
+        "HALTED": make_bars(holiday, 3),
+        "STOCK2": make_bars(weekdays, 4)
+    }
+
+    dates, matrices = align_bars(frames)
+    batch = calculate_batch_indicators(matrices["Close"], matrices["High"], matrices["Low"], matrices["Volume"])
+
+    for column, (symbol, frame) in enumerate(frames.items()):
+        rows = dates.get_indexer(frame.index)
+        traded = np.zeros(len(dates), dtype=bool)
+        traded[rows] = True
+        for name, values in single(frame).items():
+            np.testing.assert_allclose(batch[name][rows, column], values, rtol=1e-12, atol=1e-9, equal_nan=True, err_msg=f"{symbol} {name}")
+            assert np.isnan(batch[name][~traded, column]).all(), f"{symbol} {name}"
+
+
+def test_shared_calendar_runs_as_one_matrix():
+    dates = pd.bdate_range("2023-01-02", periods=120)
+    frames = {"A": make_bars(dates, 5), "B": make_bars(dates, 6)}
+
+    _, matrices = align_bars(frames)
+    batch = calculate_batch_indicators(matrices["Close"], matrices["High"], matrices["Low"], matrices["Volume"], ["sma", "rsi"])
+
+    for column, frame in enumerate(frames.values()):
+        expected = IndicatorEngine(close=frame["Close"].to_numpy()).compute_specs(indicator_specs(["sma", "rsi"]))
+        for name, values in expected.items():
+            np.testing.assert_array_equal(batch[name][:, column], values)
@@ -0,0 +1,124 @@
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.correlation_engine import CorrelationEngine, simple_returns
+
+RTOL = 1e-10
+ATOL = 1e-12
+
+
+@pytest.fixture
+def universe():
+    """Correlated daily returns for a few symbols with gaps, late listings and a flat series"""
+    rng = np.random.default_rng(7)
+    rows = 260
+    market = rng.normal(0.0004, 0.01, rows)
+    loadings = np.array([0.8, 1.2, -0.5, 0.0, 1.0, 2.0])
+    returns = market[:, None] * loadings + rng.normal(0, 0.008, (rows, len(loadings)))
+    returns[rng.random(returns.shape) < 0.08] = np.nan
+    returns[:120, 1] = np.nan          # listed late
+    returns[:, 3] = 0.0025             # no variance
+    returns[:-1, 5] = np.nan           # a single observation
+    market[rng.random(rows) < 0.05] = np.nan
+    columns = ["AAA", "BBB", "CCC", "FLAT", "DDD", "ONE"]
+    return pd.DataFrame(returns, columns=columns), pd.Series(market, name="SPY")
+
+
+def test_correlation_matches_pandas(universe):
+    returns, _ = universe
+    engine = CorrelationEngine(returns.to_numpy())
+    np.testing.assert_allclose(engine.correlation(), returns.corr().to_numpy(), rtol=RTOL, atol=ATOL)
+
+
+def test_covariance_matches_pandas(universe):
+    returns, _ = universe
+    engine = CorrelationEngine(returns.to_numpy())
+    np.testing.assert_allclose(engine.covariance(), returns.cov().to_numpy(), rtol=RTOL, atol=ATOL)
+
+
+def test_betas_match_pairwise_cov_over_var(universe):
+    returns, benchmark = universe
+    engine = CorrelationEngine(returns.to_numpy(), benchmark.to_numpy())
+    expected = []
+    for column in returns:
+        both = returns[column].notna() & benchmark.notna()
+        if both.sum() < 2:
+            expected.append(np.nan)
+            continue
+        expected.append(returns[column][both].cov(benchmark[both]) / benchmark[both].var())
+    np.testing.assert_allclose(engine.betas(), expected, rtol=RTOL, atol=ATOL)
+    assert engine.betas()[3] == pytest.approx(0.0, abs=ATOL)
+    assert np.isnan(engine.betas()[5])
+
+
+@pytest.mark.parametrize("window", [2, 20, 60, 260])
+def test_rolling_betas_match_pandas(universe, window):
+    returns, benchmark = universe
+    engine = CorrelationEngine(returns.to_numpy(), benchmark.to_numpy())
+    expected = {}
+    for column in returns:
+        both = returns[column].notna() & benchmark.notna()
+        x = returns[column].where(both)
+        y = benchmark.where(both)
+        expected[column] = x.rolling(window).cov(y) / y.rolling(window).var()
+    expected = pd.DataFrame(expected).replace([np.inf, -np.inf], np.nan)
+    np.testing.assert_allclose(engine.rolling_betas(window), expected.to_numpy(), rtol=1e-8, atol=1e-10)
+
+
+def test_rolling_betas_longer_than_the_data(universe):
+    returns, benchmark = universe
+    engine = CorrelationEngine(returns.to_numpy()[:10], benchmark.to_numpy()[:10])
+    betas = engine.rolling_betas(20)
+    assert betas.shape == (10, returns.shape[1])
+    assert np.isnan(betas).all()
+
+
+def test_single_series_and_benchmark_shape():
+    series = np.array([0.01, -0.02, np.nan, 0.03, 0.015])
+    engine = CorrelationEngine(series)
+    assert engine.correlation().shape == (1, 1)
+    assert engine.correlation()[0, 0] == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        CorrelationEngine(series, np.zeros(4))
+
+
+def exact_correlation(a, b):
+    a = [Fraction(value) for value in a]
+    b = [Fraction(value) for value in b]
+    mean_a = sum(a) / len(a)
+    mean_b = sum(b) / len(b)
+    sum_ab = sum((x - mean_a) * (y - mean_b) for x, y in zip(a, b))
+    sum_aa = sum((x - mean_a) ** 2 for x in a)
+    sum_bb = sum((y - mean_b) ** 2 for y in b)
+    return float(sum_ab) / np.sqrt(float(sum_aa) * float(sum_bb))
+
+
+def test_large_offsets_stay_accurate():
+    # Centring keeps full precision where pandas' running moments drift
+    rng = np.random.default_rng(3)
+    prices = 1e6 + rng.normal(0, 1e-3, (300, 3))
+    correlation = CorrelationEngine(prices).correlation()
+    for i, j in [(0, 1), (0, 2), (1, 2)]:
+        assert correlation[i, j] == pytest.approx(exact_correlation(prices[:, i], prices[:, j]), rel=1e-12)
+
+
+def test_flat_series_have_no_correlation_or_beta():
+    rng = np.random.default_rng(5)
+    returns = np.column_stack([rng.normal(0, 0.01, 50), np.full(50, 0.1)])
+    returns[::7, 0] = np.nan
+    assert np.isnan(CorrelationEngine(returns).correlation()[0, 1])
+    assert CorrelationEngine(returns).covariance()[1, 1] == pytest.approx(0.0, abs=1e-30)
+
+    engine = CorrelationEngine(returns, np.full(50, 0.1))
+    assert np.isnan(engine.betas()).all()
+    assert np.isnan(engine.rolling_betas(10)).all()
+
+
+def test_simple_returns_match_pct_change():
+    prices = pd.DataFrame({"a": [100.0, 101.0, np.nan, 99.0, 0.0, 5.0], "b": [10.0, 10.5, 10.25, 11.0, 11.0, 12.0]})
+    expected = prices / prices.shift(1) - 1
+    np.testing.assert_allclose(simple_returns(prices), expected.to_numpy(), rtol=1e-15)
+    assert np.isnan(simple_returns(prices)[0]).all()
@@ -0,0 +1,170 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from routes import market_data
+from utils import encoding
+from utils.encoding import ARROW, JSON, MSGPACK, encode_response, json_safe, negotiate
+
+
+@pytest.fixture
+def all_encodings(monkeypatch):
+    """Pretend both optional encoders are installed so negotiation can be tested anywhere"""
+    monkeypatch.setattr(encoding, "available_encodings", lambda: {JSON: True, MSGPACK: True, ARROW: True})
+
+
+def payload():
+    return {
+        "symbol": "AAPL",
+        "dates": np.array(["2024-01-02", "2024-01-03", "2024-01-04"], dtype=object),
+        "close": np.array([101.5, np.nan, 103.25]),
+        "volume": np.array([10, 20, 30], dtype=np.int64),
+        "indicators": {"rsi": np.array([np.inf, 55.0, 60.0]), "window": 14},
+    }
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON),
+    ("", JSON),
+    ("*/*", JSON),
+    ("application/*", JSON),
+    ("application/json", JSON),
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack", MSGPACK),
+    ("application/vnd.msgpack", MSGPACK),
+    ("application/vnd.apache.arrow.stream", ARROW),
+    ("Application/MsgPack", MSGPACK),
+    ("application/json;q=0.5, application/msgpack", MSGPACK),
+    ("application/msgpack;q=0.2, application/vnd.apache.arrow.stream;q=0.9", ARROW),
+    ("application/msgpack, application/vnd.apache.arrow.stream", MSGPACK),
+    ("text/html, application/msgpack;q=0.1", MSGPACK),
+    ("application/msgpack;q=0, */*;q=0.1", JSON),
+    ("application/msgpack;q=oops, application/json;q=0.1", JSON),
+])
+def test_negotiate(all_encodings, accept, expected):
+    assert negotiate(accept) == expected
+
+
+@pytest.mark.parametrize("accept", ["text/html", "application/json;q=0", "application/xml, text/csv;q=0.5"])
+def test_negotiate_refuses_unsupported_types(all_encodings, accept):
+    with pytest.raises(HTTPException) as error:
+        negotiate(accept)
+    assert error.value.status_code == 406
+
+
+def test_negotiate_skips_encoders_that_are_not_installed(monkeypatch):
+    monkeypatch.setattr(encoding, "msgpack", None)
+    monkeypatch.setattr(encoding, "pa", None)
+    assert negotiate("application/msgpack, application/json;q=0.5") == JSON
+    with pytest.raises(HTTPException) as error:
+        negotiate("application/vnd.apache.arrow.stream")
+    assert error.value.status_code == 406
+    assert error.value.detail == "Supported encodings: application/json"
+
+
+def test_json_response():
+    response = encode_response(payload())
+    assert response.media_type == JSON
+    assert json.loads(response.body) == {
+        "symbol": "AAPL",
+        "dates": ["2024-01-02", "2024-01-03", "2024-01-04"],
+        "close": [101.5, None, 103.25],
+        "volume": [10, 20, 30],
+        "indicators": {"rsi": [None, 55.0, 60.0], "window": 14},
+    }
+
+
+def test_json_safe_scalars():
+    assert json_safe(np.float64(np.nan)) is None
+    assert json_safe(float("-inf")) is None
+    assert json_safe(np.int32(7)) == 7 and type(json_safe(np.int32(7))) is int
+    assert json_safe((np.float32(1.5), [np.array([1, 2])])) == [1.5, [[1, 2]]]
+
+
+def unpack_arrays(value):
+    """Decode the {"dtype", "shape", "data"} buffers written by to_msgpack"""
+    if isinstance(value, dict):
+        if set(value) == {"dtype", "shape", "data"}:
+            return np.frombuffer(value["data"], dtype=np.dtype(value["dtype"])).reshape(value["shape"])
+        return {key: unpack_arrays(item) for key, item in value.items()}
+    return value
+
+
+def test_msgpack_response_round_trips():
+    msgpack = pytest.importorskip("msgpack")
+    response = encode_response(payload(), MSGPACK)
+    assert response.media_type == MSGPACK
+
+    decoded = unpack_arrays(msgpack.unpackb(response.body, raw=False))
+    original = payload()
+    assert decoded["symbol"] == "AAPL"
+    assert decoded["dates"] == original["dates"].tolist()
+    np.testing.assert_array_equal(decoded["close"], original["close"])
+    assert decoded["close"].dtype == np.float64
+    np.testing.assert_array_equal(decoded["volume"], original["volume"])
+    assert decoded["volume"].dtype == np.int64
+    np.testing.assert_array_equal(decoded["indicators"]["rsi"], original["indicators"]["rsi"])
+    assert decoded["indicators"]["window"] == 14
+
+
+def test_msgpack_keeps_array_shape_and_rejects_unknown_types():
+    msgpack = pytest.importorskip("msgpack")
+    matrix = np.arange(6, dtype=np.float32).reshape(2, 3)[:, ::2]
+    decoded = unpack_arrays(msgpack.unpackb(encoding.to_msgpack({"m": matrix}), raw=False))
+    np.testing.assert_array_equal(decoded["m"], matrix)
+
+    with pytest.raises(TypeError):
+        encoding.to_msgpack({"value": object()})
+
+
+def test_arrow_response_round_trips():
+    pa = pytest.importorskip("pyarrow")
+    response = encode_response(payload(), ARROW)
+    assert response.media_type == ARROW
+
+    table = pa.ipc.open_stream(response.body).read_all()
+    assert table.column_names == ["dates", "close", "volume", "indicators.rsi"]
+    assert table.column("dates").to_pylist() == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    np.testing.assert_array_equal(table.column("close").to_numpy(), payload()["close"])
+    assert table.schema.field("volume").type == pa.int64()
+    np.testing.assert_array_equal(table.column("indicators.rsi").to_numpy(), payload()["indicators"]["rsi"])
+    metadata = json.loads(table.schema.metadata[b"metadata"])
+    assert metadata == {"symbol": "AAPL", "indicators": {"window": 14}}
+
+
+def test_arrow_needs_equal_length_series():
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        encoding.to_arrow({"a": np.arange(3), "b": np.arange(4)})
+
+
+def test_historical_route_negotiates_from_the_accept_header(monkeypatch):
+    requested = []
+
+    async def get_historical_data(symbol, period, interval, format):
+        requested.append(format)
+        return {"symbol": symbol, "dates": payload()["dates"], "close": payload()["close"]}
+
+    monkeypatch.setattr(market_data.market_service, "get_historical_data", get_historical_data)
+    app = FastAPI()
+    app.include_router(market_data.router)
+    client = TestClient(app)
+
+    response = client.get("/historical/AAPL", headers={"Accept": "text/csv"})
+    assert response.status_code == 406
+
+    response = client.get("/historical/AAPL", headers={"Accept": "application/json"})
+    assert response.headers["content-type"] == JSON
+    assert response.json()["close"] == [101.5, None, 103.25]
+    assert requested == ["rows"]
+
+    if encoding.msgpack is not None:
+        response = client.get("/historical/AAPL", headers={"Accept": "application/msgpack"})
+        assert response.headers["content-type"] == MSGPACK
+        decoded = unpack_arrays(encoding.msgpack.unpackb(response.content, raw=False))
+        np.testing.assert_array_equal(decoded["close"], payload()["close"])
+        # Binary encodings always carry whole columns
+        assert requested == ["rows", "columnar"]
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from services.indicator_cache import IndicatorCache
+from utils.indicators import calculate_technical_indicators
+
+
+def make_frame(n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    frame = pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.98, "Close": close, "Volume": rng.integers(1, 10 ** 6, n)},
+        index=pd.date_range("2023-01-02", periods=n, freq="B")
+    )
+    frame.attrs.update(symbol="TEST", interval="1d")
+    return frame
+
+
+def test_technical_indicators_read_through_the_cache():
+    cache = IndicatorCache()
+    data = make_frame()
+    first = cache.technical_indicators(data)
+    misses = cache.misses
+    second = cache.technical_indicators(data)
+
+    assert cache.misses == misses
+    assert cache.hits == len(first)
+    for name, values in second.items():
+        np.testing.assert_array_equal(values, first[name], err_msg=name)
+    assert first.keys() == calculate_technical_indicators(data).keys()
+    for name, values in calculate_technical_indicators(data).items():
+        np.testing.assert_allclose(first[name], values, rtol=1e-6, equal_nan=True, err_msg=name)
+
+
+def test_new_bars_are_not_served_stale_results():
+    cache = IndicatorCache()
+    data = make_frame()
+    before = cache.technical_indicators(data)
+    changed = data.copy()
+    changed.iloc[-1, changed.columns.get_loc("Close")] *= 1.5
+    after = cache.technical_indicators(changed)
+    assert after["sma_20"][-1] != before["sma_20"][-1]
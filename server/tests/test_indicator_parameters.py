@@ -0,0 +1,39 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from routes.market_data import IndicatorParameters, router
+from utils.indicator_engine import indicator_specs
+
+
+def test_windows_accept_a_scalar_or_a_list():
+    assert IndicatorParameters(sma_window=10).sma_window == [10]
+    assert IndicatorParameters(ema_window=[26, 12, 26]).ema_window == [12, 26]
+    names = [spec.name for spec in indicator_specs(["sma"], IndicatorParameters(sma_window=10).model_dump())]
+    assert names == ["sma_10"]
+
+
+def test_scalar_windows_reach_the_engine_as_lists():
+    assert [spec.name for spec in indicator_specs(["ema"], {"ema_window": 9})] == ["ema_9"]
+
+
+@pytest.mark.parametrize("parameters", [
+    {"rsi_window": 0},
+    {"sma_window": 0},
+    {"sma_window": [10, 5000]},
+    {"bb_std": -1},
+    {"fib_window": 10 ** 9},
+    {"unknown_window": 5},
+])
+def test_invalid_parameters_are_rejected(parameters):
+    with pytest.raises(ValidationError):
+        IndicatorParameters(**parameters)
+
+
+def test_batch_route_returns_422_for_invalid_parameters():
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    response = client.post("/indicators/batch", json={"symbols": ["AAPL"], "parameters": {"rsi_window": 0}})
+    assert response.status_code == 422
@@ -0,0 +1,134 @@
+import pandas as pd
+import pytest
+
+from providers.base import MarketDataProvider, empty_bars
+from services import provider_service
+from services.provider_service import ProviderRouter
+
+
+def bars():
+    index = pd.date_range("2024-01-02", periods=3, freq="D", tz="UTC")
+    return pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Volume": 10}, index=index)
+
+
+class FakeProvider(MarketDataProvider):
+    def __init__(self, name, fail=False, empty=False, symbols=None):
+        self.name = name
+        self.fail = fail
+        self.empty = empty
+        self.symbols = symbols
+        self.calls = 0
+
+    def supports(self, symbol, interval="1d"):
+        return self.symbols is None or symbol in self.symbols
+
+    def get_history(self, symbol, period=None, interval="1d", start=None, end=None):
+        self.calls += 1
+        if self.fail:
+            raise Exception(f"{self.name} is down")
+        frame = empty_bars() if self.empty else bars()
+        frame.attrs["source"] = self.name
+        return frame
+
+    def get_quote(self, symbol):
+        self.calls += 1
+        if self.fail:
+            raise Exception(f"{self.name} is down")
+        return None if self.empty else {"name": symbol, "price": 1.5, "source": self.name}
+
+
+def make_router(monkeypatch, *providers, threshold=2, cooldown=60.0):
+    monkeypatch.setenv("MARKET_DATA_PROVIDERS", "")
+    monkeypatch.setenv("PROVIDER_FAILURE_THRESHOLD", str(threshold))
+    monkeypatch.setenv("PROVIDER_COOLDOWN_SECONDS", str(cooldown))
+    router = ProviderRouter()
+    router.providers = list(providers)
+    router._health = {
+        provider.name: {"calls": 0, "failures": 0, "consecutive_failures": 0, "open_until": 0.0, "avg_latency": None}
+        for provider in providers
+    }
+    return router
+
+
+def test_base_provider_is_abstract():
+    with pytest.raises(TypeError):
+        MarketDataProvider()
+
+
+def test_fails_over_to_the_next_provider(monkeypatch):
+    primary, backup = FakeProvider("primary", fail=True), FakeProvider("backup")
+    router = make_router(monkeypatch, primary, backup)
+    assert router.get_history("AAPL").attrs["source"] == "backup"
+    assert router.get_quote("AAPL")["source"] == "backup"
+
+
+def test_empty_answers_fall_through_without_counting_as_failures(monkeypatch):
+    primary, backup = FakeProvider("primary", empty=True), FakeProvider("backup")
+    router = make_router(monkeypatch, primary, backup)
+    assert router.get_history("AAPL").attrs["source"] == "backup"
+    stats = router.get_stats()["primary"]
+    assert stats["failures"] == 0 and not stats["circuit_open"]
+
+
+def test_unsupported_symbols_skip_the_provider(monkeypatch):
+    crypto, stocks = FakeProvider("crypto", symbols={"BTC-USD"}), FakeProvider("stocks")
+    router = make_router(monkeypatch, crypto, stocks)
+    assert router.get_history("AAPL").attrs["source"] == "stocks"
+    assert crypto.calls == 0
+    assert router.get_history("BTC-USD").attrs["source"] == "crypto"
+
+
+def test_every_provider_failing_raises(monkeypatch):
+    router = make_router(monkeypatch, FakeProvider("a", fail=True), FakeProvider("b", fail=True))
+    with pytest.raises(Exception, match="a: a is down; b: b is down"):
+        router.get_history("AAPL")
+
+
+def test_nobody_having_data_returns_empty_bars(monkeypatch):
+    router = make_router(monkeypatch, FakeProvider("a", empty=True))
+    assert router.get_history("AAPL").empty
+    assert router.get_quote("AAPL") is None
+
+
+def test_circuit_opens_after_repeated_failures_and_closes_after_cooldown(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(provider_service.time, "monotonic", lambda: clock[0])
+    flaky, backup = FakeProvider("flaky", fail=True), FakeProvider("backup")
+    router = make_router(monkeypatch, flaky, backup, threshold=2, cooldown=30.0)
+
+    router.get_history("AAPL")
+    router.get_history("AAPL")
+    assert flaky.calls == 2
+    assert router.get_stats()["flaky"]["circuit_open"]
+
+    # While open the provider is skipped entirely
+    router.get_history("AAPL")
+    assert flaky.calls == 2
+
+    # After the cooldown it is tried again, and a success resets its failure streak
+    clock[0] += 31
+    flaky.fail = False
+    assert router.get_history("AAPL").attrs["source"] == "flaky"
+    assert router.get_stats()["flaky"]["consecutive_failures"] == 0
+
+
+def test_slow_answers_count_as_failures(monkeypatch):
+    clock = [0.0]
+
+    def slow_tick():
+        clock[0] += 3.0
+        return clock[0]
+
+    monkeypatch.setattr(provider_service.time, "monotonic", slow_tick)
+    slow = FakeProvider("slow")
+    router = make_router(monkeypatch, slow, FakeProvider("backup"), threshold=1)
+    router.slow_seconds = 2.0
+    assert router.get_history("AAPL").attrs["source"] == "slow"
+    assert router.get_stats()["slow"]["failures"] == 1
+
+
+def test_circuit_open_everywhere_still_tries_providers(monkeypatch):
+    only = FakeProvider("only")
+    router = make_router(monkeypatch, only)
+    router._health["only"]["open_until"] = float("inf")
+    assert router.get_history("AAPL").attrs["source"] == "only"
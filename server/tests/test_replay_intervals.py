@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from providers.replay_provider import ReplayProvider
+from routes import market_data
+from services import bar_store as bar_store_module
+from services.bar_store import BarStore
+from services.provider_service import provider_router
+
+
+@pytest.fixture
+def replay_only(tmp_path, monkeypatch):
+    """A provider chain with just the replay provider, recording AAPL daily bars"""
+    replay = ReplayProvider()
+    replay.root = str(tmp_path / "replay")
+    dates = pd.bdate_range("2024-01-03", "2024-03-28")
+    close = np.linspace(100, 120, len(dates))
+    frame = pd.DataFrame(
+        {"Open": close - 1, "High": close + 2, "Low": close - 2, "Close": close, "Volume": np.arange(len(dates)) + 1},
+        index=dates
+    )
+    replay.record("AAPL", "1d", frame)
+
+    monkeypatch.setattr(provider_router, "providers", [replay])
+    monkeypatch.setattr(provider_router, "_health", {replay.name: {
+        "calls": 0, "failures": 0, "consecutive_failures": 0, "open_until": 0.0, "avg_latency": None
+    }})
+    store = BarStore()
+    store.root = str(tmp_path / "bars")
+    monkeypatch.setattr(bar_store_module, "bar_store", store)
+    monkeypatch.setattr("services.market_service.bar_store", store)
+    return store, replay.get_history("AAPL", period="max")
+
+
+def test_weekly_bars_are_derived_from_recorded_daily_bars(replay_only):
+    store, daily = replay_only
+    weekly = store.get_history("AAPL", period="max", interval="1wk")
+
+    # 2024-01-03 is a Wednesday, so that first week is partial and dropped
+    assert weekly.index[0] == pd.Timestamp("2024-01-08", tz=daily.index.tz)
+    week = daily.loc["2024-01-08":"2024-01-12"]
+    first = weekly.iloc[0]
+    assert first["Open"] == week["Open"].iloc[0]
+    assert first["High"] == week["High"].max()
+    assert first["Low"] == week["Low"].min()
+    assert first["Close"] == week["Close"].iloc[-1]
+    assert first["Volume"] == week["Volume"].sum()
+    assert weekly["Close"].iloc[-1] == daily["Close"].iloc[-1]
+
+
+def test_historical_route(replay_only):
+    app = FastAPI()
+    app.include_router(market_data.router)
+    client = TestClient(app)
+
+    response = client.get("/historical/AAPL", params={"period": "max", "interval": "1wk"})
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 12
+
+    response = client.get("/historical/NOPE", params={"interval": "1wk"})
+    assert response.status_code == 404
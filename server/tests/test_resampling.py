@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.resampling import bucket_starts, resample_bars, resample_sources, session_origin
+
+AGGREGATION = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def random_bars(index: pd.DatetimeIndex, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, len(index)))
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.05, len(index)),
+        "High": close + rng.uniform(0, 0.2, len(index)),
+        "Low": close - rng.uniform(0, 0.2, len(index)),
+        "Close": close,
+        "Volume": rng.integers(0, 1000, len(index)),
+    }, index=index.rename("Date"))
+
+
+def minute_bars(tz="America/New_York") -> pd.DataFrame:
+    """9:30-16:00 sessions across the March 2024 DST change, with a half day and missing minutes"""
+    sessions = []
+    for day in pd.bdate_range("2024-03-07", "2024-03-13"):
+        close = "13:00" if day.day == 8 else "15:59"
+        sessions.append(pd.date_range(f"{day.date()} 09:30", f"{day.date()} {close}", freq="1min"))
+    index = sessions[0].append(sessions[1:])
+    index = index.delete(np.arange(40, len(index), 97))
+    return random_bars(index.tz_localize(tz))
+
+
+def reference(frame: pd.DataFrame, rule: str, **kwargs) -> pd.DataFrame:
+    """pandas resample on wall-clock time, keeping only bins that have bars"""
+    wall = frame.tz_localize(None) if frame.index.tz is not None else frame
+    return wall.resample(rule, label="left", closed="left", **kwargs).agg(AGGREGATION).dropna(subset=["Open"])
+
+
+def assert_matches(bars: pd.DataFrame, expected: pd.DataFrame):
+    wall = bars.tz_localize(None) if bars.index.tz is not None else bars
+    np.testing.assert_array_equal(wall.index.asi8, expected.index.as_unit("ns").asi8)
+    for column in AGGREGATION:
+        np.testing.assert_array_equal(wall[column].to_numpy(dtype=np.float64), expected[column].to_numpy(dtype=np.float64), err_msg=column)
+
+
+@pytest.mark.parametrize("interval, rule", [
+    ("5m", "5min"), ("15m", "15min"), ("30m", "30min"), ("60m", "60min"), ("90m", "90min"), ("1h", "60min"),
+])
+def test_intraday_bars_are_aligned_to_the_session_open(interval, rule):
+    frame = minute_bars()
+    assert session_origin(frame.index) == (9 * 60 + 30) * 60 * 10 ** 9
+    bars = resample_bars(frame, interval)
+    assert_matches(bars, reference(frame, rule, origin=pd.Timestamp("2024-03-07 09:30")))
+    # Labels stay in exchange time on both sides of the DST change
+    assert set(bars.index.strftime("%H:%M")) <= set(pd.date_range("09:30", "16:00", freq=rule).strftime("%H:%M"))
+    assert str(bars.index.tz) == "America/New_York"
+
+
+def test_daily_bars_from_minutes():
+    frame = minute_bars()
+    bars = resample_bars(frame, "1d")
+    assert_matches(bars, reference(frame, "1D"))
+    assert list(bars.index.strftime("%Y-%m-%d %H:%M")) == [f"2024-03-{day:02d} 00:00" for day in (7, 8, 11, 12, 13)]
+
+
+@pytest.mark.parametrize("interval, rule", [("1wk", None), ("1mo", "MS"), ("3mo", "QS-JAN")])
+def test_calendar_bars_from_daily(interval, rule):
+    frame = random_bars(pd.bdate_range("2023-01-03", "2024-06-28", tz="America/New_York").drop(pd.to_datetime(["2023-07-04", "2023-12-25"]).tz_localize("America/New_York")))
+    if interval == "1wk":
+        # Weeks run Monday to Sunday and are labelled by their Monday
+        wall = frame.tz_localize(None)
+        expected = wall.groupby(wall.index.to_period("W-SUN").start_time).agg(AGGREGATION)
+    else:
+        expected = reference(frame, rule)
+    assert_matches(resample_bars(frame, interval), expected)
+
+
+def test_missing_values_are_skipped():
+    index = pd.date_range("2024-01-02 09:30", periods=6, freq="1min", tz="UTC")
+    frame = random_bars(index)
+    frame.loc[index[1], "High"] = np.nan
+    frame["Volume"] = frame["Volume"].astype(float)
+    frame.loc[index[2], "Volume"] = np.nan
+    bars = resample_bars(frame, "5m")
+    assert bars["High"].iloc[0] == frame["High"].iloc[:5].max()
+    assert bars["Volume"].iloc[0] == frame["Volume"].iloc[:5].sum()
+    assert bars["Volume"].dtype == np.int64
+
+
+def test_empty_frame_and_sources():
+    empty = random_bars(pd.DatetimeIndex([], tz="UTC"))
+    assert resample_bars(empty, "1h").empty
+    assert resample_sources("1h") == ["30m", "15m", "5m", "2m", "1m"]
+    assert resample_sources("1wk") == ["1d"]
+    assert resample_sources("1m") == []
+    with pytest.raises(ValueError):
+        bucket_starts(empty.index, "7x")
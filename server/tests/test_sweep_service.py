@@ -0,0 +1,51 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from services.strategy_service import StrategyService
+from services.sweep_service import SweepExecutor
+
+
+def make_frame(n: int = 750, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": 1e6},
+        index=pd.date_range("2020-01-01", periods=n, freq="B")
+    )
+
+
+def run(executor, data, strategy, grid):
+    async def collect():
+        results = [None] * len(grid)
+        async for index, result in executor.sweep(data, strategy, grid):
+            results[index] = result
+        return results
+    return asyncio.run(collect())
+
+
+def test_default_grids_run_inline():
+    executor = SweepExecutor()
+    executor.max_workers = 4
+    data = make_frame()
+    for strategy in StrategyService().strategies.values():
+        run(executor, data, strategy, strategy.parameter_grid({}))
+    assert not executor.get_stats()["pool_started"]
+
+
+def test_pooled_sweep_matches_inline():
+    strategy = StrategyService().strategies["moving_average"]
+    data = make_frame()
+    grid = strategy.parameter_grid({})
+
+    inline = SweepExecutor()
+    inline.max_workers = 1
+    pooled = SweepExecutor()
+    pooled.max_workers = 2
+    pooled.pool_min_cells = 0
+    try:
+        assert run(pooled, data, strategy, grid) == run(inline, data, strategy, grid)
+        assert pooled.get_stats()["pool_started"]
+    finally:
+        pooled.shutdown()
@@ -0,0 +1,33 @@
+import asyncio
+
+from services.market_service import MarketService
+from services.symbol_index import SymbolIndex
+
+
+def search(query):
+    return [match["symbol"] for match in SymbolIndex().search(query)]
+
+
+def test_master_covers_listed_us_stocks():
+    assert len(SymbolIndex().reload().entries) > 5000
+
+
+def test_ranking():
+    assert search("aapl")[0] == "AAPL"
+    assert search("apple")[0] == "AAPL"
+    assert search("micro")[0] == "MSFT"
+    assert search("berkshire")[:2] == ["BRK-B", "BRK-A"]
+    assert search("s&p")[0] == "^GSPC"
+    assert "BTC-USD" in search("bitcoin")
+    # Typos fall back to trigram matches
+    assert "NVDA" in search("nvidai")
+
+
+def test_unknown_queries_stay_offline(monkeypatch):
+    service = MarketService()
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("search must not fetch quotes")
+
+    monkeypatch.setattr(service, "_get_quote_data", fail)
+    assert asyncio.run(service.search_symbols("zzqqxx")) == []
@@ -0,0 +1,267 @@
+import os
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+# Starting capital of every strategy backtest
+INITIAL_CASH = 10000
+
+# Largest (runs x bars) matrix simulated at once by grid_table; about 60 bytes of scratch memory per cell
+BATCH_MAX_CELLS = int(os.getenv("BACKTEST_BATCH_MAX_CELLS", "1000000"))
+
+
+class BacktestRun(NamedTuple):
+    """Fills and equity of a long-only, all-in backtest.
+
+    ``entries`` and ``exits`` are bar positions of the buys and sells, paired
+    by trade; a position still open on the last bar is sold there, so both
+    always have the same length. ``equity`` has one value per bar, starting
+    with the initial cash (the closing sale is not part of the curve).
+    """
+    entries: np.ndarray
+    exits: np.ndarray
+    shares: np.ndarray
+    proceeds: np.ndarray
+    equity: np.ndarray
+
+
+class BatchRun(NamedTuple):
+    """Many backtests over the same bars, one row per run.
+
+    Trade columns (``entries``, ``exits``, ``shares``, ``proceeds``) are
+    padded to the busiest run; only the first ``trades[row]`` of a row are
+    real. ``equity`` is shaped (runs, bars) and ``holding`` flags the bars
+    each run ends holding.
+    """
+    entries: np.ndarray
+    exits: np.ndarray
+    shares: np.ndarray
+    proceeds: np.ndarray
+    trades: np.ndarray
+    holding: np.ndarray
+    equity: np.ndarray
+
+
+def simulate(close: Any, buy: Any, sell: Any, initial_cash: float = INITIAL_CASH) -> BacktestRun:
+    """Trade every bar's close on buy/sell flags: buy with all cash when flat, sell everything when holding"""
+    batch = simulate_batch(close, np.asarray(buy, dtype=bool)[None], np.asarray(sell, dtype=bool)[None], initial_cash)
+    trades = batch.trades[0]
+    return BacktestRun(
+        batch.entries[0, :trades], batch.exits[0, :trades],
+        batch.shares[0, :trades], batch.proceeds[0, :trades], batch.equity[0]
+    )
+
+
+def simulate_batch(close: Any, buy: Any, sell: Any, initial_cash: float = INITIAL_CASH) -> BatchRun:
+    """Run one backtest per row of (runs, bars) buy/sell flags over the same closes.
+
+    The first bar never trades and a buy wins when both flags are set, as in
+    the strategies' original bar-by-bar loops. Positions and equity are built
+    for every run and bar at once; only the trade legs are stepped, one trade
+    number at a time across all runs, in the same float arithmetic as a
+    single backtest, so each row matches its 1D result exactly.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+    runs, n = buy.shape
+    if n == 0:
+        empty = np.zeros((runs, 0))
+        return BatchRun(
+            empty.astype(np.intp), empty.astype(np.intp), empty, empty,
+            np.zeros(runs, dtype=np.intp), np.zeros((runs, 0), dtype=bool), np.full((runs, 1), float(initial_cash))
+        )
+
+    # The position after any flagged bar matches its flag (a buy while holding
+    # or a sell while flat changes nothing), so it is the last flag so far.
+    # Keying flagged bars as 2 * bar + is_buy, a running maximum finds that
+    # flag and its low bit is the position; every run starts flat
+    bars = 2 * np.arange(n, dtype=np.int32)
+    keys = np.where(sell, bars, 0)
+    np.copyto(keys, bars + 1, where=buy)
+    keys[:, 0] = 0
+    np.maximum.accumulate(keys, axis=1, out=keys)
+    holding = (keys & 1).astype(bool)
+    del keys
+
+    previous = np.zeros_like(holding)
+    previous[:, 1:] = holding[:, :-1]
+    entered = holding & ~previous
+    exited = previous & ~holding
+    del previous
+
+    # Bar of each run's k-th entry and exit; an open position is sold on the last bar
+    trades = entered.sum(axis=1)
+    width = int(trades.max())
+    entries = np.full((runs, width), n - 1)
+    exits = np.full((runs, width), n - 1)
+    for flags, bars in ((entered, entries), (exited, exits)):
+        rows, cols = np.nonzero(flags)
+        counts = flags.sum(axis=1)
+        ordinal = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        bars[rows, ordinal] = cols
+    del exited
+
+    shares = np.zeros((runs, width))
+    proceeds = np.zeros((runs, width))
+    cash = np.full(runs, float(initial_cash))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for trade in range(width):
+            shares[:, trade] = cash / close[entries[:, trade]]
+            proceeds[:, trade] = shares[:, trade] * close[exits[:, trade]]
+            cash = np.where(trade < trades, proceeds[:, trade], cash)
+
+    # After k entries a run holds the k-th trade's shares, or, when flat, the
+    # cash from its k-th sale (the initial cash for k = 0); interleaving the
+    # two per k lets one lookup serve every bar
+    levels = np.empty((runs, 2 * width + 2))
+    levels[:, 0] = initial_cash
+    levels[:, 1] = 0.0
+    levels[:, 2::2] = proceeds
+    levels[:, 3::2] = shares
+    position = np.cumsum(entered, axis=1, dtype=np.int32)
+    position *= 2
+    position += holding
+    level = np.take_along_axis(levels, position, axis=1)
+    del position, entered
+
+    equity = np.where(holding, 0.0, level) + np.where(holding, level, 0.0) * close
+    equity[:, 0] = initial_cash
+    return BatchRun(entries, exits, shares, proceeds, trades, holding, equity)
+
+
+def crossover_signal(fast: Any, slow: Any) -> np.ndarray:
+    """1 where the fast line is above the slow one, -1 where it is below, 0 otherwise (including warm-up)"""
+    fast = np.asarray(fast)
+    slow = np.asarray(slow)
+    return np.where(fast > slow, 1, np.where(fast < slow, -1, 0)).astype(np.int8)
+
+
+def simulate_signal(close: Any, signal: Any, step: int, initial_cash: float = INITIAL_CASH) -> BacktestRun:
+    """Simulate a -1/0/1 signal: buy when it rises by ``step`` from one bar to the next, sell when it falls by ``step``"""
+    signal = np.asarray(signal, dtype=np.int8)
+    change = np.diff(signal, prepend=signal[:1])
+    return simulate(close, change == step, change == -step, initial_cash)
+
+
+def simulate_signals(close: Any, signals: Any, step: int, initial_cash: float = INITIAL_CASH) -> BatchRun:
+    """simulate_signal for a (runs, bars) matrix of signals"""
+    signals = np.asarray(signals, dtype=np.int8)
+    change = np.diff(signals, axis=1, prepend=signals[:, :1])
+    return simulate_batch(close, change == step, change == -step, initial_cash)
+
+
+def batch_metrics(run: BatchRun) -> Dict[str, np.ndarray]:
+    """Sharpe ratio, total return and trade count of every run, as the optimizers rank them; needs two bars"""
+    equity = run.equity
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(equity, axis=1) / equity[:, :-1]
+        std = np.std(returns, axis=1)
+        sharpe = np.where(std > 0, np.mean(returns, axis=1) / std * np.sqrt(252), 0.0)
+        total_return = np.where(equity[:, 0] > 0, (equity[:, -1] - equity[:, 0]) / equity[:, 0], 0.0)
+    return {
+        "sharpe_ratio": sharpe,
+        "total_return": total_return,
+        "num_trades": 2 * run.trades
+    }
+
+
+def parameter_grid(ranges: Dict[str, Iterable[int]], overrides: Optional[Dict[str, Any]] = None) -> List[Dict[str, int]]:
+    """Every combination of parameter values, the first parameter varying slowest; overrides replace default ranges"""
+    overrides = overrides or {}
+    unknown = [name for name in overrides if name not in ranges]
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+
+    values = []
+    for name, default in ranges.items():
+        choices = overrides.get(name, default)
+        choices = [choices] if isinstance(choices, int) else list(choices)
+        if not choices or not all(isinstance(value, int) and not isinstance(value, bool) and value > 0 for value in choices):
+            raise ValueError(f"{name} must be a positive integer or a list of them")
+        values.append(choices)
+    return [dict(zip(ranges, combination)) for combination in itertools.product(*values)]
+
+
+def grid_table(
+    strategy: Any,
+    close: Any,
+    series: Dict[str, np.ndarray],
+    grid: List[Dict[str, int]],
+    max_cells: int = BATCH_MAX_CELLS
+) -> Dict[str, np.ndarray]:
+    """Metrics of every grid point of a strategy as columns: each parameter, then the batch_metrics.
+
+    Grid points are simulated together as (points, bars) matrices, in chunks
+    of at most ``max_cells`` cells to bound memory. With fewer than two bars
+    nothing can be scored and the table is empty.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if len(close) < 2:
+        grid = []
+    table = {name: np.array([params[name] for params in grid], dtype=np.int64) for name in strategy.parameter_ranges}
+
+    chunks = []
+    rows = max(1, max_cells // max(len(close), 1))
+    for start in range(0, len(grid), rows):
+        chunk = grid[start:start + rows]
+        chunks.append(batch_metrics(simulate_signals(close, strategy.grid_signals(series, chunk), strategy.signal_step)))
+    for name, dtype in (("sharpe_ratio", np.float64), ("total_return", np.float64), ("num_trades", np.int64)):
+        table[name] = np.concatenate([chunk[name] for chunk in chunks]).astype(dtype) if chunks else np.empty(0, dtype)
+    return table
+
+
+def evaluate_grid(strategy: Any, close: Any, series: Dict[str, np.ndarray], grid: List[Dict[str, int]]) -> List[Optional[Dict[str, Any]]]:
+    """Score each grid point of a strategy against precomputed indicator series (None when there are too few bars)"""
+    table = grid_table(strategy, close, series, grid)
+    if len(grid) and not len(table["num_trades"]):
+        return [None] * len(grid)
+    columns = {name: values.tolist() for name, values in table.items()}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def summarize_grid(results: List[Optional[Dict[str, Any]]], names: Iterable[str]) -> Dict[str, Any]:
+    """Optimization result: the first grid point with the highest Sharpe ratio, and every scored point"""
+    names = list(names)
+    best_sharpe = -np.inf
+    best_params = {}
+    all_results = [result for result in results if result is not None]
+    for result in all_results:
+        if result["sharpe_ratio"] > best_sharpe:
+            best_sharpe = result["sharpe_ratio"]
+            best_params = {name: result[name] for name in names}
+    return {
+        "best_parameters": best_params,
+        "best_sharpe": best_sharpe,
+        "all_results": all_results
+    }
+
+
+def trade_list(
+    dates: pd.DatetimeIndex,
+    close: Any,
+    run: BacktestRun,
+    extras: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Trade records of a run in fill order; ``extras`` maps field names to per-bar values to report with each fill"""
+    close = np.asarray(close, dtype=np.float64)
+    extras = {name: np.asarray(values) for name, values in (extras or {}).items()}
+    labels = dates[np.concatenate((run.entries, run.exits))].strftime("%Y-%m-%d")
+    count = len(run.entries)
+
+    trades = []
+    for trade, (entry, exit_bar) in enumerate(zip(run.entries, run.exits)):
+        shares = run.shares[trade]
+        value = shares * close[entry]
+        pnl = run.proceeds[trade] - value
+        trades.append(_record(labels[trade], "BUY", close[entry], shares, value, 0, extras, entry))
+        trades.append(_record(labels[count + trade], "SELL", close[exit_bar], shares, run.proceeds[trade], pnl, extras, exit_bar))
+    return trades
+
+
+def _record(date, action, price, shares, value, pnl, extras, bar) -> Dict[str, Any]:
+    record = {"date": date, "action": action, "price": price, "shares": shares, "value": value, "pnl": pnl}
+    for name, values in extras.items():
+        record[name] = values[bar]
+    return record
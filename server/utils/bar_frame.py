@@ -0,0 +1,91 @@
+import hashlib
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Columns hashed into a bar fingerprint
+FINGERPRINT_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class BarFrame:
+    """Read-only bars: a DatetimeIndex plus one NumPy array per column.
+
+    Columns are views of the source frame flagged read-only (float columns in
+    float64, converted only when stored as float32), so building one costs no
+    copy and one instance can be shared across threads, strategies and runs.
+    Strategies keep indicator and signal series in their own arrays instead
+    of adding columns. The fingerprint the indicator cache keys on is
+    computed once per instance.
+    """
+
+    __slots__ = ("index", "attrs", "_columns", "_fingerprint")
+
+    def __init__(self, index: pd.Index, columns: Dict[str, np.ndarray], attrs: Optional[Mapping[str, Any]] = None):
+        frozen = {}
+        for name, values in columns.items():
+            values = np.asarray(values).view()
+            if len(values) != len(index):
+                raise ValueError(f"Column {name} has {len(values)} rows, the index {len(index)}")
+            values.flags.writeable = False
+            frozen[name] = values
+        object.__setattr__(self, "index", index)
+        object.__setattr__(self, "attrs", MappingProxyType(dict(attrs or {})))
+        object.__setattr__(self, "_columns", frozen)
+        object.__setattr__(self, "_fingerprint", None)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "BarFrame":
+        """Wrap a DataFrame's columns without copying them"""
+        columns = {}
+        for name in frame.columns:
+            values = frame[name].to_numpy()
+            columns[name] = values.astype(np.float64, copy=False) if values.dtype.kind == "f" else values
+        return cls(frame.index, columns, frame.attrs)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("BarFrame is read-only")
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._columns[column]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.index) == 0 or not self._columns
+
+    def to_frame(self) -> pd.DataFrame:
+        """A DataFrame over the same (read-only) arrays, for pandas-based helpers"""
+        frame = pd.DataFrame(self._columns, index=self.index, copy=False)
+        frame.attrs.update(self.attrs)
+        return frame
+
+    def fingerprint(self) -> str:
+        """Hash of the timestamps and OHLCV values, computed on first use"""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            if isinstance(self.index, pd.DatetimeIndex):
+                digest.update(np.ascontiguousarray(self.index.as_unit("ns").asi8).tobytes())
+            else:
+                digest.update(np.ascontiguousarray(self.index.to_numpy()).tobytes())
+            for col in FINGERPRINT_COLUMNS:
+                if col in self._columns:
+                    digest.update(col.encode())
+                    digest.update(np.ascontiguousarray(self._columns[col], dtype=np.float64).tobytes())
+            object.__setattr__(self, "_fingerprint", digest.hexdigest())
+        return self._fingerprint
+
+
+def as_bars(data: Union[BarFrame, pd.DataFrame]) -> BarFrame:
+    """A BarFrame as-is, or a DataFrame wrapped as one"""
+    return data if isinstance(data, BarFrame) else BarFrame.from_frame(data)
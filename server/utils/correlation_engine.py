@@ -0,0 +1,115 @@
+import numpy as np
+from typing import Any, Optional
+
+
+def simple_returns(prices: Any) -> np.ndarray:
+    """Period-over-period returns of a price series or (time x symbols) matrix; the first row is NaN"""
+    prices = np.asarray(prices, dtype=np.float64)
+    returns = np.full_like(prices, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = prices[1:] / prices[:-1] - 1
+    return returns
+
+
+class CorrelationEngine:
+    """Covariance, correlation and betas for a (time x symbols) returns matrix.
+
+    Missing returns (NaN) are handled pairwise, as pandas does: each pair of
+    symbols, and each symbol against the benchmark, uses only the rows where
+    both are observed. Every statistic comes from a few masked matrix products
+    (or, for rolling betas, cumulative sums), so the cost does not depend on
+    looping over symbols or windows in Python. Columns are centred on their
+    own mean first, which keeps the moment sums well conditioned.
+    """
+
+    # A variance this small next to its sum of squares is rounding left over
+    # from a constant series, which has no correlation or beta
+    CANCELLATION = 1e-12
+
+    def __init__(self, returns: Any, benchmark: Optional[Any] = None):
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.ndim == 1:
+            returns = returns[:, None]
+        self._observed = ~np.isnan(returns)
+        self._values = self._centred(returns, self._observed)
+
+        self._benchmark_observed = None
+        self._benchmark = None
+        if benchmark is not None:
+            benchmark = np.asarray(benchmark, dtype=np.float64)
+            if benchmark.shape != returns.shape[:1]:
+                raise ValueError(f"benchmark must have {returns.shape[0]} rows")
+            self._benchmark_observed = ~np.isnan(benchmark)
+            self._benchmark = self._centred(benchmark[:, None], self._benchmark_observed[:, None])[:, 0]
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance matrix (ddof=1) over pairwise-complete rows"""
+        count, sum_x, sum_y, sum_xy, _, _ = self._pairwise_moments()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = (sum_xy - sum_x * sum_y / count) / (count - 1)
+        covariance[count < 2] = np.nan
+        return covariance
+
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation matrix over pairwise-complete rows"""
+        count, sum_x, sum_y, sum_xy, sum_xx, sum_yy = self._pairwise_moments()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var_x = sum_xx - sum_x * sum_x / count
+            var_y = sum_yy - sum_y * sum_y / count
+            correlation = (sum_xy - sum_x * sum_y / count) / np.sqrt(var_x * var_y)
+        flat = (var_x <= sum_xx * self.CANCELLATION) | (var_y <= sum_yy * self.CANCELLATION)
+        correlation[flat | (count < 2)] = np.nan
+        return np.clip(correlation, -1.0, 1.0)
+
+    def betas(self) -> np.ndarray:
+        """Beta of every symbol against the benchmark over pairwise-complete rows"""
+        both = self._observed & self._benchmark_observed[:, None]
+        x = np.where(both, self._values, 0.0)
+        y = np.where(both, self._benchmark[:, None], 0.0)
+        count = both.sum(axis=0)
+        return self._beta(count, x.sum(axis=0), y.sum(axis=0), (x * y).sum(axis=0), (y * y).sum(axis=0))
+
+    def rolling_betas(self, window: int) -> np.ndarray:
+        """Beta over each trailing window, shaped like the returns; needs window complete pairs"""
+        both = self._observed & self._benchmark_observed[:, None]
+        x = np.where(both, self._values, 0.0)
+        y = np.where(both, self._benchmark[:, None], 0.0)
+        sums = [self._window_sums(values, window) for values in (both.astype(np.float64), x, y, x * y, y * y)]
+
+        betas = np.full(x.shape, np.nan)
+        if len(x) >= window:
+            count, sum_x, sum_y, sum_xy, sum_yy = sums
+            beta = self._beta(count, sum_x, sum_y, sum_xy, sum_yy)
+            beta[count < window] = np.nan
+            betas[window - 1:] = beta
+        return betas
+
+    def _pairwise_moments(self):
+        mask = self._observed.astype(np.float64)
+        x = self._values
+        count = mask.T @ mask
+        sum_x = x.T @ mask
+        sum_y = mask.T @ x
+        sum_xy = x.T @ x
+        sum_xx = (x * x).T @ mask
+        sum_yy = mask.T @ (x * x)
+        return count, sum_x, sum_y, sum_xy, sum_xx, sum_yy
+
+    def _beta(self, count, sum_x, sum_y, sum_xy, sum_yy) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var_y = sum_yy - sum_y * sum_y / count
+            beta = (sum_xy - sum_x * sum_y / count) / var_y
+        beta = np.where(np.isfinite(beta), beta, np.nan)
+        beta[(var_y <= sum_yy * self.CANCELLATION) | (count < 2)] = np.nan
+        return beta
+
+    def _window_sums(self, values: np.ndarray, window: int) -> np.ndarray:
+        cumulative = np.zeros((len(values) + 1,) + values.shape[1:])
+        np.cumsum(values, axis=0, out=cumulative[1:])
+        return cumulative[window:] - cumulative[:-window] if len(values) >= window else cumulative[:0]
+
+    def _centred(self, values: np.ndarray, observed: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            counts = observed.sum(axis=0)
+            means = np.where(counts > 0, np.where(observed, values, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+        return np.where(observed, values - means, 0.0)
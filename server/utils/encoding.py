@@ -0,0 +1,144 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import msgpack
+except ImportError:
+    # MessagePack responses are only offered when msgpack is installed
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    # Arrow responses are only offered when pyarrow is installed
+    pa = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Accepted media types and the encoding each one selects
+MEDIA_TYPES = {
+    JSON: JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    ARROW: ARROW,
+}
+
+
+def available_encodings() -> Dict[str, bool]:
+    """Which response encodings this server can produce"""
+    return {JSON: True, MSGPACK: msgpack is not None, ARROW: pa is not None}
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response encoding from an Accept header (JSON when absent)"""
+    if not accept:
+        return JSON
+
+    available = available_encodings()
+    ranges = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((-quality, position, media_type.strip().lower()))
+
+    for negative_quality, _, media_type in sorted(ranges):
+        encoding = MEDIA_TYPES.get(media_type)
+        if negative_quality < 0 and encoding and available[encoding]:
+            return encoding
+
+    supported = ", ".join(encoding for encoding, ok in available.items() if ok)
+    raise HTTPException(status_code=406, detail=f"Supported encodings: {supported}")
+
+
+def encode_response(payload: Dict[str, Any], encoding: str = JSON) -> Response:
+    """Serialize a payload whose series are NumPy arrays in the negotiated encoding"""
+    if encoding == MSGPACK:
+        return Response(to_msgpack(payload), media_type=MSGPACK)
+    if encoding == ARROW:
+        return Response(to_arrow(payload), media_type=ARROW)
+    return JSONResponse(json_safe(payload))
+
+
+def json_safe(value: Any) -> Any:
+    """Convert arrays and NumPy scalars to JSON types; NaN and inf become None"""
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f":
+            return np.where(np.isfinite(value), value, None).tolist()
+        return json_safe(value.tolist()) if value.dtype == object else value.tolist()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def to_msgpack(payload: Dict[str, Any]) -> bytes:
+    """MessagePack with numeric arrays as {"dtype", "shape", "data"} raw buffers"""
+    return msgpack.packb(payload, default=_msgpack_default, use_bin_type=True)
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in "biuf":
+            return {
+                "dtype": value.dtype.str,
+                "shape": list(value.shape),
+                "data": np.ascontiguousarray(value).tobytes()
+            }
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def to_arrow(payload: Dict[str, Any]) -> bytes:
+    """Arrow IPC stream: one column per array (dotted path), the rest as schema metadata"""
+    columns, rest = _split_columns(payload)
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("Arrow encoding needs all series to have the same length")
+
+    table = pa.table({name: pa.array(column) for name, column in columns.items()})
+    table = table.replace_schema_metadata({"metadata": json.dumps(json_safe(rest))})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _split_columns(payload: Dict[str, Any], prefix: str = "") -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    columns = {}
+    rest = {}
+    for key, value in payload.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, np.ndarray) and value.ndim == 1:
+            columns[name] = value
+        elif isinstance(value, dict):
+            nested_columns, nested_rest = _split_columns(value, f"{name}.")
+            columns.update(nested_columns)
+            if nested_rest or not nested_columns:
+                rest[key] = nested_rest
+        else:
+            rest[key] = value
+    return columns, rest
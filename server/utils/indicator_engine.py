@@ -0,0 +1,522 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Any
+
+# Indicators the engine can produce, in response order
+INDICATOR_NAMES = [
+    "sma_20", "sma_50", "ema_12", "ema_26", "rsi",
+    "macd", "macd_signal", "macd_histogram",
+    "bb_upper", "bb_middle", "bb_lower",
+    "stoch_k", "stoch_d", "volume_sma", "atr", "williams_r", "cci",
+    "adx", "plus_di", "minus_di", "obv", "vwap",
+    "ichimoku_conversion", "ichimoku_base", "ichimoku_a", "ichimoku_b",
+    "kc_upper", "kc_middle", "kc_lower", "psar", "psar_up", "psar_down",
+]
+
+# Retracement levels between a window's low (0) and high (1), labelled as in calculate_fibonacci_levels
+FIBONACCI_LEVELS = {"0.0": 0.0, "0.236": 0.236, "0.382": 0.382, "0.500": 0.5, "0.618": 0.618, "0.786": 0.786, "1.0": 1.0}
+
+
+class IndicatorEngine:
+    """Computes technical indicators over aligned OHLCV arrays in one pass.
+
+    Inputs are 1D arrays (one series) or 2D arrays shaped (time, symbols).
+    Every intermediate -- moving averages, EMAs, rolling highs and lows, true
+    range -- is computed once and shared, so EMA12/EMA26 feed both the EMA
+    outputs and MACD, SMA20 is also the Bollinger middle band, and the 14-bar
+    high/low window serves both the stochastic and Williams %R. Definitions
+    follow the ``ta`` library with its default windows, so results match it.
+    The exceptions: ADX follows Wilder (ta's version lags a bar and reports 0
+    on the latest one) and Ichimoku span B waits for its full window. In 2D
+    input each column warms up from its own first bar, so symbols with a
+    shorter history line up with their 1D results.
+    """
+
+    def __init__(
+        self,
+        high: Any = None,
+        low: Any = None,
+        close: Any = None,
+        volume: Any = None
+    ):
+        self._one_dimensional = np.ndim(close) == 1
+        self._inputs = {
+            "high": self._frame(high),
+            "low": self._frame(low),
+            "close": self._frame(close),
+            "volume": self._frame(volume),
+        }
+        self._memo: Dict[Any, pd.DataFrame] = {}
+
+    @classmethod
+    def from_frame(cls, data: Any) -> "IndicatorEngine":
+        """Build an engine from an OHLCV DataFrame or BarFrame"""
+        columns = {col: np.asarray(data[col], dtype=np.float64) for col in ("High", "Low", "Close", "Volume") if col in data}
+        return cls(columns.get("High"), columns.get("Low"), columns.get("Close"), columns.get("Volume"))
+
+    def compute(self, names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Compute the named indicators with default parameters (all of them by default)"""
+        names = INDICATOR_NAMES if names is None else list(names)
+        unknown = [name for name in names if name not in DEFAULT_SPECS]
+        if unknown:
+            raise ValueError(f"Unknown indicators: {', '.join(unknown)}")
+        return self.compute_specs([DEFAULT_SPECS[name] for name in names])
+
+    def compute_specs(self, specs: Iterable["IndicatorSpec"]) -> Dict[str, np.ndarray]:
+        """Compute output series described by IndicatorSpecs"""
+        return {spec.name: self.compute_spec(spec) for spec in specs}
+
+    def indicator(self, method: str, **params) -> Any:
+        """One parameterized indicator (e.g. "sma", window=20) as an array, or a dict of arrays for multi-line ones"""
+        result = getattr(self, method)(**params)
+        if isinstance(result, dict):
+            return {name: self._output(frame) for name, frame in result.items()}
+        return self._output(result)
+
+    def compute_spec(self, spec: "IndicatorSpec") -> np.ndarray:
+        result = getattr(self, spec.method)(**dict(spec.params))
+        if spec.field is not None:
+            result = result[spec.field]
+        return self._output(result)
+
+    # Shared building blocks
+
+    def series(self, name: str) -> pd.DataFrame:
+        values = self._inputs[name]
+        if values is None:
+            raise ValueError(f"{name} prices are required")
+        return values
+
+    def sma(self, window: int, source: str = "close") -> pd.DataFrame:
+        return self._cached(("sma", source, window), lambda: self.series(source).rolling(window, min_periods=window).mean())
+
+    def ema(self, window: int, source: str = "close") -> pd.DataFrame:
+        return self._cached(("ema", source, window), lambda: self.series(source).ewm(span=window, min_periods=window, adjust=False).mean())
+
+    def rolling_std(self, window: int) -> pd.DataFrame:
+        return self._cached(("std", window), lambda: self.series("close").rolling(window, min_periods=window).std(ddof=0))
+
+    def highest_high(self, window: int) -> pd.DataFrame:
+        return self._cached(("hh", window), lambda: self.series("high").rolling(window, min_periods=window).max())
+
+    def lowest_low(self, window: int) -> pd.DataFrame:
+        return self._cached(("ll", window), lambda: self.series("low").rolling(window, min_periods=window).min())
+
+    def true_range(self) -> pd.DataFrame:
+        def compute():
+            high, low = self.series("high"), self.series("low")
+            prev_close = self.series("close").shift(1)
+            ranges = np.stack([
+                (high - low).to_numpy(),
+                (high - prev_close).abs().to_numpy(),
+                (low - prev_close).abs().to_numpy(),
+            ])
+            # The first bar has no previous close, so its range is high - low
+            return pd.DataFrame(np.fmax.reduce(ranges, axis=0), index=high.index, columns=high.columns)
+        return self._cached(("tr",), compute)
+
+    def typical_price(self) -> pd.DataFrame:
+        return self._cached(("tp",), lambda: (self.series("high") + self.series("low") + self.series("close")) / 3.0)
+
+    def directional_movement(self) -> Dict[str, pd.DataFrame]:
+        def compute():
+            high, low = self.series("high"), self.series("low")
+            up = np.diff(high.to_numpy(), axis=0, prepend=np.nan)
+            down = -np.diff(low.to_numpy(), axis=0, prepend=np.nan)
+            # Undefined (NaN) on a bar without a previous bar
+            moved = ~(np.isnan(up) | np.isnan(down))
+            plus = np.where(moved, np.where((up > down) & (up > 0), up, 0.0), np.nan)
+            minus = np.where(moved, np.where((down > up) & (down > 0), down, 0.0), np.nan)
+            return {
+                "plus": pd.DataFrame(plus, index=high.index, columns=high.columns),
+                "minus": pd.DataFrame(minus, index=high.index, columns=high.columns),
+            }
+        return self._cached(("dm",), compute)
+
+    def returns(self) -> pd.DataFrame:
+        return self._cached(("returns",), lambda: self.series("close").pct_change(fill_method=None))
+
+    # Indicators
+
+    def rsi(self, window: int = 14) -> pd.DataFrame:
+        def compute():
+            close = self.series("close")
+            diff = close.diff(1)
+            # A bar's first close counts as a zero move; bars without a close are skipped
+            up = diff.where(diff > 0, 0.0).where(close.notna())
+            down = -diff.where(diff < 0, 0.0).where(close.notna())
+            avg_up = up.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            avg_down = down.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.where(avg_down == 0, 100, 100 - (100 / (1 + avg_up / avg_down)))
+            return pd.DataFrame(values, index=diff.index, columns=diff.columns)
+        return self._cached(("rsi", window), compute)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.DataFrame]:
+        def compute():
+            line = self.ema(fast) - self.ema(slow)
+            signal_line = line.ewm(span=signal, min_periods=signal, adjust=False).mean()
+            return {"macd": line, "signal": signal_line, "histogram": line - signal_line}
+        return self._cached(("macd", fast, slow, signal), compute)
+
+    def bollinger(self, window: int = 20, deviations: float = 2.0) -> Dict[str, pd.DataFrame]:
+        def compute():
+            middle = self.sma(window)
+            band = deviations * self.rolling_std(window)
+            return {"upper": middle + band, "middle": middle, "lower": middle - band}
+        return self._cached(("bb", window, deviations), compute)
+
+    def stochastic(self, window: int = 14, smooth: int = 3) -> Dict[str, pd.DataFrame]:
+        def compute():
+            lowest = self.lowest_low(window)
+            k = 100 * (self.series("close") - lowest) / (self.highest_high(window) - lowest)
+            return {"k": k, "d": k.rolling(smooth, min_periods=smooth).mean()}
+        return self._cached(("stoch", window, smooth), compute)
+
+    def atr(self, window: int = 14) -> pd.DataFrame:
+        # Wilder smoothing seeded with the mean of the first window, 0 before that
+        return self._cached(("atr", window), lambda: self._wilder(self.true_range(), window).fillna(0.0))
+
+    def williams_r(self, window: int = 14) -> pd.DataFrame:
+        def compute():
+            highest = self.highest_high(window)
+            return -100 * (highest - self.series("close")) / (highest - self.lowest_low(window))
+        return self._cached(("wr", window), compute)
+
+    def cci(self, window: int = 20, constant: float = 0.015) -> pd.DataFrame:
+        def compute():
+            tp = self.typical_price()
+            mean = tp.rolling(window, min_periods=window).mean()
+            values, means = tp.to_numpy(), mean.to_numpy()
+            # Mean absolute deviation around each window's own mean, one shift at a time
+            deviation = np.zeros_like(values)
+            for lag in range(min(window, len(values))):
+                shifted = np.full_like(values, np.nan)
+                shifted[lag:] = values[:len(values) - lag]
+                deviation += np.abs(shifted - means)
+            deviation /= window
+            return (tp - mean) / (constant * pd.DataFrame(deviation, index=tp.index, columns=tp.columns))
+        return self._cached(("cci", window, constant), compute)
+
+    def adx(self, window: int = 14) -> Dict[str, pd.DataFrame]:
+        def compute():
+            # Directional movement starts at the second bar, which has a previous close
+            plus, minus = (values.iloc[1:] for values in self.directional_movement().values())
+            smoothed_tr = self._wilder(self.true_range().iloc[1:].where(plus.notna()), window)
+            plus_di = 100 * self._wilder(plus, window) / smoothed_tr
+            minus_di = 100 * self._wilder(minus, window) / smoothed_tr
+            dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+            adx = self._wilder(dx.iloc[window - 1:], window)
+            index = self.series("close").index
+            return {
+                "adx": adx.reindex(index),
+                "plus_di": plus_di.reindex(index),
+                "minus_di": minus_di.reindex(index),
+            }
+        return self._cached(("adx", window), compute)
+
+    def obv(self) -> pd.DataFrame:
+        def compute():
+            close, volume = self.series("close"), self.series("volume")
+            return volume.where(~(close < close.shift(1)), -volume).cumsum()
+        return self._cached(("obv",), compute)
+
+    def vwap(self, window: int = 14) -> pd.DataFrame:
+        def compute():
+            volume = self.series("volume")
+            price_volume = (self.typical_price() * volume).rolling(window, min_periods=window).sum()
+            return price_volume / volume.rolling(window, min_periods=window).sum()
+        return self._cached(("vwap", window), compute)
+
+    def ichimoku(self, conversion: int = 9, base: int = 26, span_b: int = 52) -> Dict[str, pd.DataFrame]:
+        def compute():
+            conversion_line = (self.highest_high(conversion) + self.lowest_low(conversion)) / 2
+            base_line = (self.highest_high(base) + self.lowest_low(base)) / 2
+            return {
+                "conversion": conversion_line,
+                "base": base_line,
+                "a": (conversion_line + base_line) / 2,
+                "b": (self.highest_high(span_b) + self.lowest_low(span_b)) / 2,
+            }
+        return self._cached(("ichimoku", conversion, base, span_b), compute)
+
+    def keltner(self, window: int = 20, atr_window: int = 10, multiplier: float = 2.0) -> Dict[str, pd.DataFrame]:
+        def compute():
+            middle = self.ema(window)
+            band = multiplier * self.atr(atr_window)
+            return {"upper": middle + band, "middle": middle, "lower": middle - band}
+        return self._cached(("keltner", window, atr_window, multiplier), compute)
+
+    def psar(self, step: float = 0.02, max_step: float = 0.2) -> Dict[str, pd.DataFrame]:
+        def compute():
+            high, low, close = (self.series(name).to_numpy() for name in ("high", "low", "close"))
+            values = {field: np.full(close.shape, np.nan) for field in ("psar", "up", "down")}
+            for col in range(close.shape[1]):
+                # Each symbol runs over its own bars, so calendar gaps do not break the recursion
+                rows = np.flatnonzero(~(np.isnan(high[:, col]) | np.isnan(low[:, col]) | np.isnan(close[:, col])))
+                psar, up, down = _parabolic_sar(
+                    high[rows, col].tolist(), low[rows, col].tolist(), close[rows, col].tolist(), step, max_step
+                )
+                values["psar"][rows, col] = psar
+                values["up"][rows, col] = up
+                values["down"][rows, col] = down
+            index, columns = self.series("close").index, self.series("close").columns
+            return {field: pd.DataFrame(array, index=index, columns=columns) for field, array in values.items()}
+        return self._cached(("psar", step, max_step), compute)
+
+    def channel(self, window: int = 20) -> Dict[str, pd.DataFrame]:
+        # Rolling max/min use a monotonic deque, so the whole series is O(n)
+        return {"support": self.lowest_low(window), "resistance": self.highest_high(window)}
+
+    def fibonacci(self, window: int = 50) -> Dict[str, pd.DataFrame]:
+        def compute():
+            low = self.lowest_low(window)
+            high = self.highest_high(window)
+            levels = {label: low + ratio * (high - low) for label, ratio in FIBONACCI_LEVELS.items()}
+            # The ends are the low and high themselves, not low + ratio * spread rounded
+            levels.update({"0.0": low, "1.0": high})
+            return levels
+        return self._cached(("fib", window), compute)
+
+    def volatility(self, window: int = 20, periods_per_year: int = 252) -> pd.DataFrame:
+        return self._cached(
+            ("vol", window, periods_per_year),
+            lambda: self.returns().rolling(window, min_periods=window).std() * np.sqrt(periods_per_year)
+        )
+
+    def _wilder(self, values: pd.DataFrame, window: int) -> pd.DataFrame:
+        """Wilder smoothing seeded with the mean of the first window values; NaN before that"""
+        array = values.to_numpy()
+        smoothed = np.full(array.shape, np.nan)
+        # Columns are seeded from their own first value, in groups that start on the same row
+        first = (~np.isnan(array)).argmax(axis=0) if array.size else []
+        for start in np.unique(first):
+            columns = np.flatnonzero(first == start)
+            part = array[start:, columns]
+            if len(part) < window:
+                continue
+            seeded = part[window - 1:].copy()
+            seeded[0] = pd.DataFrame(part[:window]).mean().to_numpy()
+            smoothed[start + window - 1:, columns] = pd.DataFrame(seeded).ewm(alpha=1 / window, adjust=False).mean().to_numpy()
+        return pd.DataFrame(smoothed, index=values.index, columns=values.columns)
+
+    def _cached(self, key: Any, compute: Callable[[], Any]) -> Any:
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def _frame(self, values: Any) -> Optional[pd.DataFrame]:
+        if values is None:
+            return None
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        return pd.DataFrame(values)
+
+    def _output(self, frame: pd.DataFrame) -> np.ndarray:
+        values = frame.to_numpy()
+        return values[:, 0] if self._one_dimensional else values
+
+
+def _parabolic_sar(
+    high: List[float],
+    low: List[float],
+    close: List[float],
+    step: float,
+    max_step: float
+) -> Tuple[List[float], List[float], List[float]]:
+    """Parabolic SAR for one series, bar for bar as in ta (the first two bars are the close)"""
+    nan = float("nan")
+    psar = list(close)
+    psar_up = [nan] * len(close)
+    psar_down = [nan] * len(close)
+    if not close:
+        return psar, psar_up, psar_down
+
+    up_trend = True
+    acceleration = step
+    trend_high = high[0]
+    trend_low = low[0]
+    for i in range(2, len(close)):
+        reversal = False
+        if up_trend:
+            value = psar[i - 1] + acceleration * (trend_high - psar[i - 1])
+            if low[i] < value:
+                reversal = True
+                value = trend_high
+                trend_low = low[i]
+                acceleration = step
+            else:
+                if high[i] > trend_high:
+                    trend_high = high[i]
+                    acceleration = min(acceleration + step, max_step)
+                if low[i - 2] < value:
+                    value = low[i - 2]
+                elif low[i - 1] < value:
+                    value = low[i - 1]
+        else:
+            value = psar[i - 1] - acceleration * (psar[i - 1] - trend_low)
+            if high[i] > value:
+                reversal = True
+                value = trend_low
+                trend_high = high[i]
+                acceleration = step
+            else:
+                if low[i] < trend_low:
+                    trend_low = low[i]
+                    acceleration = min(acceleration + step, max_step)
+                if high[i - 2] > value:
+                    value = high[i - 2]
+                elif high[i - 1] > value:
+                    value = high[i - 1]
+
+        up_trend = up_trend != reversal
+        psar[i] = value
+        if up_trend:
+            psar_up[i] = value
+        else:
+            psar_down[i] = value
+    return psar, psar_up, psar_down
+
+
+class IndicatorSpec(NamedTuple):
+    """One output series: the engine method, its parameters and, for multi-line results, the line"""
+    name: str
+    method: str
+    params: Tuple[Tuple[str, Any], ...] = ()
+    field: Optional[str] = None
+
+
+# Parameters used when a request does not set them
+DEFAULT_PARAMETERS: Dict[str, Any] = {
+    "sma_window": [20, 50],
+    "ema_window": [12, 26],
+    "rsi_window": 14,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+    "bb_window": 20,
+    "bb_std": 2.0,
+    "stoch_window": 14,
+    "stoch_smooth": 3,
+    "volume_sma_window": 20,
+    "atr_window": 14,
+    "williams_window": 14,
+    "cci_window": 20,
+    "adx_window": 14,
+    "vwap_window": 14,
+    "ichimoku_conversion": 9,
+    "ichimoku_base": 26,
+    "ichimoku_span_b": 52,
+    "keltner_window": 20,
+    "keltner_atr_window": 10,
+    "keltner_multiplier": 2.0,
+    "psar_step": 0.02,
+    "psar_max_step": 0.2,
+    "channel_window": 20,
+    "fib_window": 50,
+    "volatility_window": 20,
+}
+
+# Indicator group -> the output series it produces for a set of parameters
+INDICATOR_GROUPS: Dict[str, Callable[[Dict[str, Any]], List[IndicatorSpec]]] = {
+    "sma": lambda p: [IndicatorSpec(f"sma_{w}", "sma", (("window", w),)) for w in p["sma_window"]],
+    "ema": lambda p: [IndicatorSpec(f"ema_{w}", "ema", (("window", w),)) for w in p["ema_window"]],
+    "rsi": lambda p: [IndicatorSpec("rsi", "rsi", (("window", p["rsi_window"]),))],
+    "macd": lambda p: [
+        IndicatorSpec(name, "macd", (("fast", p["macd_fast"]), ("signal", p["macd_signal"]), ("slow", p["macd_slow"])), field)
+        for name, field in (("macd", "macd"), ("macd_signal", "signal"), ("macd_histogram", "histogram"))
+    ],
+    "bollinger": lambda p: [
+        IndicatorSpec(f"bb_{field}", "bollinger", (("deviations", p["bb_std"]), ("window", p["bb_window"])), field)
+        for field in ("upper", "middle", "lower")
+    ],
+    "stochastic": lambda p: [
+        IndicatorSpec(f"stoch_{field}", "stochastic", (("smooth", p["stoch_smooth"]), ("window", p["stoch_window"])), field)
+        for field in ("k", "d")
+    ],
+    "volume_sma": lambda p: [IndicatorSpec("volume_sma", "sma", (("source", "volume"), ("window", p["volume_sma_window"])))],
+    "atr": lambda p: [IndicatorSpec("atr", "atr", (("window", p["atr_window"]),))],
+    "williams_r": lambda p: [IndicatorSpec("williams_r", "williams_r", (("window", p["williams_window"]),))],
+    "cci": lambda p: [IndicatorSpec("cci", "cci", (("window", p["cci_window"]),))],
+    "adx": lambda p: [
+        IndicatorSpec(field, "adx", (("window", p["adx_window"]),), field)
+        for field in ("adx", "plus_di", "minus_di")
+    ],
+    "obv": lambda p: [IndicatorSpec("obv", "obv")],
+    "vwap": lambda p: [IndicatorSpec("vwap", "vwap", (("window", p["vwap_window"]),))],
+    "ichimoku": lambda p: [
+        IndicatorSpec(
+            f"ichimoku_{field}", "ichimoku",
+            (("base", p["ichimoku_base"]), ("conversion", p["ichimoku_conversion"]), ("span_b", p["ichimoku_span_b"])),
+            field
+        )
+        for field in ("conversion", "base", "a", "b")
+    ],
+    "keltner": lambda p: [
+        IndicatorSpec(
+            f"kc_{field}", "keltner",
+            (("atr_window", p["keltner_atr_window"]), ("multiplier", p["keltner_multiplier"]), ("window", p["keltner_window"])),
+            field
+        )
+        for field in ("upper", "middle", "lower")
+    ],
+    "psar": lambda p: [
+        IndicatorSpec(name, "psar", (("max_step", p["psar_max_step"]), ("step", p["psar_step"])), field)
+        for name, field in (("psar", "psar"), ("psar_up", "up"), ("psar_down", "down"))
+    ],
+    "channel": lambda p: [
+        IndicatorSpec(field, "channel", (("window", p["channel_window"]),), field)
+        for field in ("support", "resistance")
+    ],
+    "fibonacci": lambda p: [
+        IndicatorSpec(f"fib_{ratio * 1000:.0f}", "fibonacci", (("window", p["fib_window"]),), label)
+        for label, ratio in FIBONACCI_LEVELS.items()
+    ],
+    "volatility": lambda p: [IndicatorSpec("volatility", "volatility", (("window", p["volatility_window"]),))],
+}
+
+# Groups returned when a request does not name any
+DEFAULT_GROUPS = [
+    "sma", "ema", "rsi", "macd", "bollinger", "stochastic", "volume_sma", "atr", "williams_r", "cci",
+    "adx", "obv", "vwap", "ichimoku", "keltner", "psar",
+]
+
+GROUP_ALIASES = {
+    "bb": "bollinger", "stoch": "stochastic", "williams": "williams_r",
+    "support_resistance": "channel", "fib": "fibonacci", "dmi": "adx", "kc": "keltner",
+}
+
+
+def indicator_specs(groups: Optional[Iterable[str]] = None, parameters: Optional[Dict[str, Any]] = None) -> List[IndicatorSpec]:
+    """Expand indicator groups and parameter overrides into output series"""
+    params = dict(DEFAULT_PARAMETERS)
+    params.update({key: value for key, value in (parameters or {}).items() if value is not None})
+    unknown_params = [key for key in params if key not in DEFAULT_PARAMETERS]
+    if unknown_params:
+        raise ValueError(f"Unknown indicator parameters: {', '.join(unknown_params)}")
+    for key in ("sma_window", "ema_window"):
+        if not isinstance(params[key], (list, tuple)):
+            params[key] = [params[key]]
+
+    selected = []
+    for group in (DEFAULT_GROUPS if groups is None else groups):
+        group = GROUP_ALIASES.get(group.strip().lower(), group.strip().lower())
+        if group not in INDICATOR_GROUPS:
+            raise ValueError(f"Unknown indicator: {group}")
+        if group not in selected:
+            selected.append(group)
+
+    specs = []
+    for group in selected:
+        specs.extend(INDICATOR_GROUPS[group](params))
+    return specs
+
+
+# Output name -> series with the default parameters
+DEFAULT_SPECS: Dict[str, IndicatorSpec] = {spec.name: spec for spec in indicator_specs(INDICATOR_GROUPS)}
+
+
+def compute_indicators(data: pd.DataFrame, names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """Compute indicators for an OHLCV DataFrame with one shared engine"""
+    return IndicatorEngine.from_frame(data).compute(names)
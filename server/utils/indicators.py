@@ -1,56 +1,87 @@
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, List, Any
+from typing import Dict, List, Optional, Tuple, Any
+
+from utils.indicator_engine import IndicatorEngine, indicator_specs
+from utils.correlation_engine import CorrelationEngine
 
 def calculate_technical_indicators(data: pd.DataFrame) -> Dict[str, List[float]]:
-    """Calculate all technical indicators for a dataset"""
+    """Calculate all technical indicators for a dataset (uncached; see IndicatorCache.technical_indicators)"""
     indicators = {}
     
     try:
-        # Moving averages
-        indicators['sma_20'] = ta.trend.sma_indicator(data['Close'], window=20).tolist()
-        indicators['sma_50'] = ta.trend.sma_indicator(data['Close'], window=50).tolist()
-        indicators['ema_12'] = ta.trend.ema_indicator(data['Close'], window=12).tolist()
-        indicators['ema_26'] = ta.trend.ema_indicator(data['Close'], window=26).tolist()
-        
-        # RSI
-        indicators['rsi'] = ta.momentum.rsi(data['Close'], window=14).tolist()
-        
-        # MACD
-        macd = ta.trend.MACD(data['Close'])
-        indicators['macd'] = macd.macd().tolist()
-        indicators['macd_signal'] = macd.macd_signal().tolist()
-        indicators['macd_histogram'] = macd.macd_diff().tolist()
-        
-        # Bollinger Bands
-        bb = ta.volatility.BollingerBands(data['Close'])
-        indicators['bb_upper'] = bb.bollinger_hband().tolist()
-        indicators['bb_middle'] = bb.bollinger_mavg().tolist()
-        indicators['bb_lower'] = bb.bollinger_lband().tolist()
-        
-        # Stochastic
-        stoch = ta.momentum.StochasticOscillator(data['High'], data['Low'], data['Close'])
-        indicators['stoch_k'] = stoch.stoch().tolist()
-        indicators['stoch_d'] = stoch.stoch_signal().tolist()
-        
-        # Volume indicators
-        indicators['volume_sma'] = ta.volume.volume_sma(data['Close'], data['Volume']).tolist()
-        
-        # ATR (Average True Range)
-        indicators['atr'] = ta.volatility.average_true_range(data['High'], data['Low'], data['Close']).tolist()
-        
-        # Williams %R
-        indicators['williams_r'] = ta.momentum.williams_r(data['High'], data['Low'], data['Close']).tolist()
-        
-        # CCI (Commodity Channel Index)
-        indicators['cci'] = ta.trend.cci(data['High'], data['Low'], data['Close']).tolist()
+        # One shared pass over the OHLCV arrays
+        for name, values in IndicatorEngine.from_frame(data).compute().items():
+            indicators[name] = values.tolist()
         
     except Exception as e:
         print(f"Error calculating indicators: {e}")
     
     return indicators
 
+def calculate_batch_indicators(
+    close: np.ndarray,
+    high: Optional[np.ndarray] = None,
+    low: Optional[np.ndarray] = None,
+    volume: Optional[np.ndarray] = None,
+    indicators: Optional[List[str]] = None,
+    parameters: Optional[Dict[str, Any]] = None
+) -> Dict[str, np.ndarray]:
+    """Calculate indicators for every column of aligned (time x symbol) matrices at once"""
+    close = np.asarray(close, dtype=np.float64)
+    for name, values in (("high", high), ("low", low), ("volume", volume)):
+        if values is not None and np.shape(values) != close.shape:
+            raise ValueError(f"{name} must have the same shape as close {close.shape}")
+    
+    specs = indicator_specs(indicators, parameters)
+    if close.ndim != 2:
+        return IndicatorEngine(high, low, close, volume).compute_specs(specs)
+
+    # Rolling windows must only see the bars a symbol actually traded, so
+    # symbols are grouped by the rows where they have a close; each kernel then
+    # runs column-wise over a group's compressed matrix in one call, and the
+    # results go back onto the full dates (NaN where a symbol did not trade)
+    observed = ~np.isnan(close)
+    groups: Dict[bytes, List[int]] = {}
+    for column in range(close.shape[1]):
+        groups.setdefault(observed[:, column].tobytes(), []).append(column)
+
+    results = {}
+    for columns in groups.values():
+        rows = np.flatnonzero(observed[:, columns[0]])
+        cells = np.ix_(rows, columns)
+        inputs = [None if values is None else np.asarray(values, dtype=np.float64)[cells] for values in (high, low, close, volume)]
+        for name, values in IndicatorEngine(*inputs).compute_specs(specs).items():
+            if name not in results:
+                results[name] = np.full(close.shape, np.nan)
+            results[name][cells] = values
+    return results
+
+def align_bars(
+    frames: Dict[str, pd.DataFrame],
+    calendar: Optional[str] = None
+) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+    """Align per-symbol OHLCV frames as (time x symbol) matrices on their combined dates, or one symbol's dates"""
+    # Compare bars by exchange-local time so US stocks and UTC crypto line up by day
+    frames = {
+        symbol: frame.tz_localize(None) if isinstance(frame.index, pd.DatetimeIndex) and frame.index.tz is not None else frame
+        for symbol, frame in frames.items()
+    }
+    if calendar is not None:
+        dates = frames[calendar].index
+    else:
+        dates = pd.DatetimeIndex([])
+        for frame in frames.values():
+            dates = dates.union(frame.index)
+    
+    # Symbols missing a date (different trading calendars) get NaN there
+    matrices = {}
+    for col in ("Open", "High", "Low", "Close", "Volume"):
+        matrices[col] = np.column_stack([
+            frame[col].reindex(dates).to_numpy(dtype=np.float64) for frame in frames.values()
+        ]) if frames else np.empty((0, 0))
+    return dates, matrices
+
 def calculate_support_resistance(data: pd.DataFrame, window: int = 20) -> Dict[str, float]:
     """Calculate support and resistance levels"""
     try:
@@ -70,6 +101,10 @@ def calculate_support_resistance(data: pd.DataFrame, window: int = 20) -> Dict[s
         print(f"Error calculating support/resistance: {e}")
         return {}
 
+def calculate_support_resistance_series(data: pd.DataFrame, window: int = 20) -> Dict[str, np.ndarray]:
+    """Calculate rolling support (lowest low) and resistance (highest high) for every bar"""
+    return IndicatorEngine.from_frame(data).indicator("channel", window=window)
+
 def calculate_fibonacci_levels(data: pd.DataFrame) -> Dict[str, float]:
     """Calculate Fibonacci retracement levels"""
     try:
@@ -92,6 +127,15 @@ def calculate_fibonacci_levels(data: pd.DataFrame) -> Dict[str, float]:
         print(f"Error calculating Fibonacci levels: {e}")
         return {}
 
+def calculate_fibonacci_series(data: pd.DataFrame, window: int = 50) -> Dict[str, np.ndarray]:
+    """Calculate Fibonacci retracement levels over a rolling lookback for every bar.
+
+    Levels carry the same keys as calculate_fibonacci_levels, but each bar
+    only looks back ``window`` bars where that function spans the whole
+    frame; with window=len(data) the last values are the same.
+    """
+    return IndicatorEngine.from_frame(data).indicator("fibonacci", window=window)
+
 def calculate_volatility(data: pd.DataFrame, window: int = 20) -> float:
     """Calculate historical volatility"""
     try:
@@ -102,28 +146,23 @@ def calculate_volatility(data: pd.DataFrame, window: int = 20) -> float:
         print(f"Error calculating volatility: {e}")
         return 0.0
 
+def calculate_volatility_series(data: pd.DataFrame, window: int = 20) -> np.ndarray:
+    """Calculate rolling annualized volatility for every bar"""
+    return IndicatorEngine.from_frame(data).indicator("volatility", window=window)
+
 def calculate_beta(data: pd.DataFrame, market_data: pd.DataFrame) -> float:
     """Calculate beta relative to market"""
     try:
         stock_returns = data['Close'].pct_change()
         market_returns = market_data['Close'].pct_change()
         
-        # Remove NaN values
-        stock_returns = stock_returns.dropna()
-        market_returns = market_returns.dropna()
-        
-        # Align the data
+        # Align the data; NaN returns are skipped pairwise by the engine
         common_index = stock_returns.index.intersection(market_returns.index)
-        stock_returns = stock_returns[common_index]
-        market_returns = market_returns[common_index]
-        
-        if len(stock_returns) > 1:
-            covariance = np.cov(stock_returns, market_returns)[0, 1]
-            market_variance = np.var(market_returns)
-            beta = covariance / market_variance if market_variance > 0 else 0
-            return beta
-        else:
-            return 0.0
+        beta = CorrelationEngine(
+            stock_returns[common_index].to_numpy(dtype=np.float64),
+            market_returns[common_index].to_numpy(dtype=np.float64)
+        ).betas()[0]
+        return float(beta) if np.isfinite(beta) else 0.0
     except Exception as e:
         print(f"Error calculating beta: {e}")
         return 0.0
@@ -0,0 +1,16 @@
+import os
+
+import numpy as np
+
+# Float dtype of stored bars and cached series; float32 (compact mode) halves their memory
+STORAGE_FLOAT = np.dtype(os.getenv("CACHE_FLOAT_DTYPE", "float64"))
+if STORAGE_FLOAT not in (np.dtype(np.float32), np.dtype(np.float64)):
+    raise ValueError(f"CACHE_FLOAT_DTYPE must be float32 or float64, not {STORAGE_FLOAT}")
+
+
+def compact(values: np.ndarray) -> np.ndarray:
+    """Cast a float array to the storage dtype; other arrays (e.g. int64 volume) are left as-is"""
+    if values.dtype.kind == "f":
+        return values.astype(STORAGE_FLOAT, copy=False)
+    return values
+
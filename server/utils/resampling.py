@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+from providers.base import BAR_COLUMNS
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86400 * NS_PER_SECOND
+
+# Bar length in seconds for the intraday intervals
+INTRADAY_SECONDS = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800,
+    "60m": 3600, "90m": 5400, "1h": 3600,
+}
+
+# Calendar intervals built from daily bars
+CALENDAR_INTERVALS = ["1wk", "1mo", "3mo"]
+
+# Intraday intervals that split a trading day evenly, usable for daily bars
+DAILY_SOURCES = ["60m", "1h", "30m", "15m", "5m", "2m", "1m"]
+
+
+def resample_sources(interval: str) -> List[str]:
+    """Finer intervals that can be aggregated into this one, coarsest first"""
+    if interval in INTRADAY_SECONDS:
+        seconds = INTRADAY_SECONDS[interval]
+        candidates = [
+            source for source, length in INTRADAY_SECONDS.items()
+            if length < seconds and seconds % length == 0
+        ]
+        return sorted(candidates, key=lambda source: -INTRADAY_SECONDS[source])
+    if interval == "1d":
+        return list(DAILY_SOURCES)
+    if interval in CALENDAR_INTERVALS:
+        return ["1d"]
+    return []
+
+
+def session_origin(index: pd.DatetimeIndex) -> int:
+    """Most common time of day of each session's first bar, in nanoseconds after midnight"""
+    if len(index) == 0:
+        return 0
+    wall = _wall_ns(index)
+    days = wall // NS_PER_DAY
+    first = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    offsets, counts = np.unique(wall[first] - days[first] * NS_PER_DAY, return_counts=True)
+    return int(offsets[np.argmax(counts)])
+
+
+def bucket_starts(index: pd.DatetimeIndex, interval: str, origin: Optional[int] = None) -> np.ndarray:
+    """Wall-clock start (ns) of the target bar each timestamp falls into.
+
+    Intraday bars are aligned to the session open rather than to midnight, so
+    hourly bars of a 9:30 session run 9:30-10:30. Weeks start on Monday,
+    months and quarters on their first calendar day.
+    """
+    wall = _wall_ns(index)
+    days = wall // NS_PER_DAY * NS_PER_DAY
+
+    if interval in INTRADAY_SECONDS:
+        if origin is None:
+            origin = session_origin(index)
+        length = INTRADAY_SECONDS[interval] * NS_PER_SECOND
+        buckets = days + origin + (wall - days - origin) // length * length
+        # Pre-session bars never belong to a bar that started the previous day
+        return np.maximum(buckets, days)
+
+    if interval == "1d":
+        return days
+
+    if interval == "1wk":
+        # 1970-01-01 was a Thursday
+        weekday = (days // NS_PER_DAY + 3) % 7
+        return days - weekday * NS_PER_DAY
+
+    if interval in ("1mo", "3mo"):
+        months = days.astype("datetime64[ns]").astype("datetime64[M]")
+        if interval == "3mo":
+            month_numbers = months.astype(np.int64)
+            months = (month_numbers - month_numbers % 3).astype("datetime64[M]")
+        return months.astype("datetime64[ns]").astype(np.int64)
+
+    raise ValueError(f"Cannot resample to interval {interval}")
+
+
+def resample_bars(frame: pd.DataFrame, interval: str, origin: Optional[int] = None) -> pd.DataFrame:
+    """Aggregate OHLCV bars into a coarser interval.
+
+    Open is the first bar's open, high the maximum high, low the minimum low,
+    close the last bar's close and volume the sum. Bars must be sorted by time;
+    each output bar is labelled with its start in the frame's timezone.
+    """
+    if frame.empty:
+        return frame[BAR_COLUMNS].copy()
+
+    buckets = bucket_starts(frame.index, interval, origin)
+    # Sorted input means each bucket is one contiguous run of rows
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    open_ = frame["Open"].to_numpy(dtype=np.float64)
+    high = frame["High"].to_numpy(dtype=np.float64)
+    low = frame["Low"].to_numpy(dtype=np.float64)
+    close = frame["Close"].to_numpy(dtype=np.float64)
+    volume = frame["Volume"].to_numpy(dtype=np.float64)
+
+    index = pd.DatetimeIndex(buckets[starts].astype("datetime64[ns]"), name=frame.index.name)
+    if frame.index.tz is not None:
+        index = index.tz_localize(frame.index.tz, ambiguous=True, nonexistent="shift_forward")
+
+    return pd.DataFrame({
+        "Open": open_[starts],
+        "High": np.fmax.reduceat(high, starts),
+        "Low": np.fmin.reduceat(low, starts),
+        "Close": close[ends],
+        "Volume": np.add.reduceat(np.nan_to_num(volume), starts).astype(np.int64),
+    }, index=index)
+
+
+def _wall_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Timestamps as wall-clock nanoseconds in their own timezone"""
+    index = index.as_unit("ns")
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.asi8
@@ -0,0 +1,396 @@
+import math
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+def _is_nan(value: float) -> bool:
+    return value != value
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Float division with NumPy semantics for a zero denominator"""
+    if denominator == 0:
+        if numerator == 0 or _is_nan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+class IncrementalIndicator:
+    """Base class for indicators updated one bar at a time.
+
+    Each subclass keeps just enough state to produce the next value in O(1)
+    (rolling sums amortized over a periodic rescan of their window), and
+    reproduces the batch engine in utils/indicator_engine.py bar for bar to
+    within rounding: values are NaN (ATR: 0) until the same warm-up the batch
+    version needs.
+    State round-trips through to_dict/from_dict so it can be persisted and
+    restored between processes.
+    """
+
+    kind = "base"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the full state"""
+        state = {key: (list(value) if isinstance(value, deque) else value) for key, value in self.__dict__.items()}
+        for key, value in state.items():
+            if isinstance(value, IncrementalIndicator):
+                state[key] = value.to_dict()
+        return {"type": self.kind, "state": state}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IncrementalIndicator":
+        """Restore an indicator saved with to_dict"""
+        indicator_cls = INDICATOR_TYPES[data["type"]]
+        indicator = indicator_cls.__new__(indicator_cls)
+        for key, value in data["state"].items():
+            if isinstance(value, dict) and "type" in value and "state" in value:
+                value = IncrementalIndicator.from_dict(value)
+            elif isinstance(value, list):
+                value = deque((tuple(item) if isinstance(item, list) else item for item in value))
+            setattr(indicator, key, value)
+        return indicator
+
+
+class EWMState(IncrementalIndicator):
+    """Exponentially weighted mean, step for step the same as pandas ewm(adjust=False)"""
+
+    kind = "ewm"
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.weighted = math.nan
+        self.old_weight = 1.0
+        self.observations = 0
+
+    @classmethod
+    def from_span(cls, span: int, min_periods: Optional[int] = None) -> "EWMState":
+        return cls(2.0 / (span + 1.0), span if min_periods is None else min_periods)
+
+    def update(self, value: float) -> float:
+        observed = not _is_nan(value)
+        self.observations += observed
+
+        if not _is_nan(self.weighted):
+            # Missing values still decay the old weight, as with ignore_na=False
+            self.old_weight *= 1.0 - self.alpha
+            if observed:
+                if self.weighted != value:
+                    self.weighted = (self.old_weight * self.weighted + self.alpha * value) / (self.old_weight + self.alpha)
+                self.old_weight = 1.0
+        elif observed:
+            self.weighted = value
+
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.weighted if self.observations >= self.min_periods else math.nan
+
+
+class SMAState(IncrementalIndicator):
+    """Simple moving average over the last window values.
+
+    Keeps a compensated running sum and rebuilds it exactly from the window
+    once every window updates, so rounding cannot build up however long the
+    stream runs while each update stays O(1) amortized.
+    """
+
+    kind = "sma"
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self._recompute()
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._add(self.values.popleft(), -1)
+        self._add(value, 1)
+        self.updates += 1
+        if self.updates >= self.window:
+            self._recompute()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.valid < max(self.window, 1):
+            return math.nan
+        return self.total / self.valid
+
+    def _recompute(self):
+        valid = [value for value in self.values if not _is_nan(value)]
+        self.valid = len(valid)
+        self.total = math.fsum(valid)
+        self.compensation = 0.0
+        self.updates = 0
+
+    def _add(self, value: float, sign: int):
+        if _is_nan(value):
+            return
+        self.valid += sign
+        y = sign * value - self.compensation
+        t = self.total + y
+        self.compensation = (t - self.total) - y
+        self.total = t
+
+
+class VarianceState(IncrementalIndicator):
+    """Population variance (ddof=0) over the last window values.
+
+    Welford updates as values enter and leave the window; the window is
+    rescanned once every window updates, and early whenever an update
+    cancels most of the sum of squared deviations, so the result stays
+    accurate to rounding at O(1) amortized cost.
+    """
+
+    kind = "variance"
+
+    # Rescan when an update leaves less than this fraction of the sum of squares
+    CANCELLATION = 1e-8
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self._recompute()
+
+    def update(self, value: float) -> float:
+        previous = self.squares
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._add(value)
+        self.updates += 1
+        if self.updates >= self.window or self.squares < previous * self.CANCELLATION:
+            self._recompute()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.valid < max(self.window, 1):
+            return math.nan
+        return max(self.squares, 0.0) / self.valid
+
+    def _recompute(self):
+        valid = [value for value in self.values if not _is_nan(value)]
+        self.valid = len(valid)
+        self.mean = math.fsum(valid) / self.valid if valid else 0.0
+        self.squares = math.fsum((value - self.mean) ** 2 for value in valid)
+        self.updates = 0
+
+    def _add(self, value: float):
+        if _is_nan(value):
+            return
+        self.valid += 1
+        delta = value - self.mean
+        self.mean += delta / self.valid
+        self.squares += delta * (value - self.mean)
+
+    def _remove(self, value: float):
+        if _is_nan(value):
+            return
+        self.valid -= 1
+        if self.valid == 0:
+            self.mean = self.squares = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / self.valid
+        self.squares -= delta * (value - self.mean)
+
+
+class EMAState(IncrementalIndicator):
+    """Exponential moving average of closes"""
+
+    kind = "ema"
+
+    def __init__(self, window: int):
+        self.window = window
+        self.ewm = EWMState.from_span(window)
+
+    def update(self, close: float) -> float:
+        return self.ewm.update(close)
+
+    @property
+    def value(self) -> float:
+        return self.ewm.value
+
+
+class RSIState(IncrementalIndicator):
+    """Relative Strength Index with Wilder smoothing"""
+
+    kind = "rsi"
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.prev_close = math.nan
+        self.avg_up = EWMState(1.0 / window, window)
+        self.avg_down = EWMState(1.0 / window, window)
+
+    def update(self, close: float) -> float:
+        # The first bar has no change and counts as a zero move, as in the batch version
+        diff = close - self.prev_close
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        self.prev_close = close
+        self.avg_up.update(up)
+        self.avg_down.update(down)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        avg_down = self.avg_down.value
+        if avg_down == 0:
+            return 100.0
+        return 100 - (100 / (1 + _divide(self.avg_up.value, avg_down)))
+
+
+class MACDState(IncrementalIndicator):
+    """MACD line, signal line and histogram"""
+
+    kind = "macd"
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EWMState.from_span(fast)
+        self.slow = EWMState.from_span(slow)
+        self.signal = EWMState.from_span(signal)
+        self.line = math.nan
+
+    def update(self, close: float) -> Dict[str, float]:
+        self.line = self.fast.update(close) - self.slow.update(close)
+        self.signal.update(self.line)
+        return self.value
+
+    @property
+    def value(self) -> Dict[str, float]:
+        signal = self.signal.value
+        return {"macd": self.line, "signal": signal, "histogram": self.line - signal}
+
+
+class BollingerState(IncrementalIndicator):
+    """Bollinger Bands around a simple moving average"""
+
+    kind = "bollinger"
+
+    def __init__(self, window: int = 20, deviations: float = 2.0):
+        self.deviations = deviations
+        self.middle = SMAState(window)
+        self.variance = VarianceState(window)
+
+    def update(self, close: float) -> Dict[str, float]:
+        self.middle.update(close)
+        self.variance.update(close)
+        return self.value
+
+    @property
+    def value(self) -> Dict[str, float]:
+        middle = self.middle.value
+        variance = self.variance.value
+        band = self.deviations * math.sqrt(variance)
+        return {"upper": middle + band, "middle": middle, "lower": middle - band}
+
+
+class ATRState(IncrementalIndicator):
+    """Average True Range: the mean of the first window, then Wilder smoothing"""
+
+    kind = "atr"
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.prev_close = math.nan
+        self.bars = 0
+        self.warmup = deque()
+        self.ewm = EWMState(1.0 / window)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        ranges = [high - low, abs(high - self.prev_close), abs(low - self.prev_close)]
+        ranges = [value for value in ranges if not _is_nan(value)]
+        true_range = max(ranges) if ranges else math.nan
+        self.prev_close = close
+        self.bars += 1
+
+        if self.bars < self.window:
+            self.warmup.append(true_range)
+        elif self.bars == self.window:
+            self.warmup.append(true_range)
+            valid = [value for value in self.warmup if not _is_nan(value)]
+            self.ewm.update(sum(valid) / len(valid) if valid else math.nan)
+            self.warmup.clear()
+        else:
+            self.ewm.update(true_range)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.ewm.value if self.bars >= self.window else 0.0
+
+
+class RollingExtremeState(IncrementalIndicator):
+    """Rolling maximum or minimum with a monotonic deque, O(1) amortized per bar"""
+
+    kind = "extreme"
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.index = 0
+        self.candidates = deque()
+        self.observed = deque()
+        self.valid = 0
+
+    def update(self, value: float) -> float:
+        observed = not _is_nan(value)
+        self.observed.append(observed)
+        self.valid += observed
+        if len(self.observed) > self.window:
+            self.valid -= self.observed.popleft()
+
+        if observed:
+            while self.candidates and (
+                self.candidates[-1][1] <= value if self.maximum else self.candidates[-1][1] >= value
+            ):
+                self.candidates.pop()
+            self.candidates.append((self.index, value))
+        while self.candidates and self.candidates[0][0] <= self.index - self.window:
+            self.candidates.popleft()
+        self.index += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.valid < self.window or not self.candidates:
+            return math.nan
+        return self.candidates[0][1]
+
+
+class StochasticState(IncrementalIndicator):
+    """Stochastic oscillator %K and its moving average %D"""
+
+    kind = "stochastic"
+
+    def __init__(self, window: int = 14, smooth: int = 3):
+        self.highest = RollingExtremeState(window, maximum=True)
+        self.lowest = RollingExtremeState(window, maximum=False)
+        self.d = SMAState(smooth)
+        self.k = math.nan
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        self.k = _divide(100 * (close - lowest), highest - lowest)
+        self.d.update(self.k)
+        return self.value
+
+    @property
+    def value(self) -> Dict[str, float]:
+        return {"k": self.k, "d": self.d.value}
+
+
+INDICATOR_TYPES = {
+    indicator_cls.kind: indicator_cls
+    for indicator_cls in (
+        EWMState, SMAState, VarianceState, EMAState, RSIState, MACDState,
+        BollingerState, ATRState, RollingExtremeState, StochasticState,
+    )
+}